@@ -0,0 +1,70 @@
+""" Benchmark for the startup time of the CLI. Runs the CLI with
+    `-X importtime` and compares the import time with importing
+    the complete `unipy` package. """
+
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+SOURCE = Path(__file__).resolve().parent.parent / 'src'
+
+
+def import_times(arguments: list[str]) -> tuple[float, dict[str, int]]:
+    """ Function to run Python with `-X importtime` and collect
+        the import times
+
+        Parameters
+        ----------
+        arguments : list[str]
+            The arguments for Python, after `-X importtime`
+
+        Returns
+        -------
+        tuple[float, dict[str, int]]
+            The wall time in milliseconds and the cumulative
+            import time in microseconds for each top-level module
+    """
+    start = perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', *arguments],
+        cwd=SOURCE, capture_output=True, text=True)
+    wall_time = (perf_counter() - start) * 1000
+
+    modules: dict[str, int] = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+    return wall_time, modules
+
+
+def report(title: str, arguments: list[str]) -> None:
+    """ Function to print the import times for a command
+
+        Parameters
+        ----------
+        title : str
+            The title for the report
+
+        arguments : list[str]
+            The arguments for Python
+
+        Returns
+        -------
+        None
+    """
+    wall_time, modules = import_times(arguments)
+    own = {name: time for name, time in modules.items()
+           if name not in ('site', 'encodings', 'encodings.utf_8')}
+    print(f'{title}: {wall_time:.1f} ms wall, '
+          f'{sum(own.values()) / 1000:.1f} ms imports')
+    for name, time in sorted(own.items(), key=lambda item: -item[1])[:5]:
+        print(f'    {time / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    report('unipy_cli --help', ['cli.py', '--help'])
+    report('import unipy', ['-c', 'import unipy'])
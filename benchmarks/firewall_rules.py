@@ -0,0 +1,124 @@
+""" Benchmark for merging the predefined and configured firewall
+    rules in `get_firewall_rules`. Compares the previous list-based
+    assembly, which checks every predefined rule against a list of
+    configured names and sorts every chain, with the index-based
+    merge of `NetworkFirewallChains`.
+
+    Usage: python benchmarks/firewall_rules.py [max_rules] """
+
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from unipy.networkfirewall import (NetworkFirewallChain, NetworkFirewallChains,  # noqa: E402
+                                   NetworkFirewallRule)
+
+CHAINS = ('WAN_IN', 'WAN_OUT', 'WAN_LOCAL', 'LAN_IN', 'LAN_OUT', 'LAN_LOCAL',
+          'GUEST_IN', 'GUEST_OUT')
+
+
+def generated_rules(rules: int) -> tuple[dict, list]:
+    """ Function to generate predefined chains and configured rules.
+        Half of the rules are predefined, half are configured, and
+        a tenth of the configured rules replace a predefined rule.
+
+        Parameters
+        ----------
+        rules : int
+            The total number of rules
+
+        Returns
+        -------
+        tuple[dict, list]
+            The chains like in the system configuration, and the
+            configured rules
+    """
+    generator = random.Random(0)
+    chains: dict = {name: {'default-action': 'drop', 'rule': dict()} for name in CHAINS}
+    predefined = list()
+    for index in range(rules // 2):
+        chain = CHAINS[index % len(CHAINS)]
+        chain_index = 3000 + index
+        chains[chain]['rule'][str(chain_index)] = {
+            'description': f'predefined {index}', 'action': 'accept'}
+        predefined.append((chain, chain_index))
+
+    configured = list()
+    for index in range(rules - rules // 2):
+        if index % 10 == 0 and predefined:
+            chain, chain_index = generator.choice(predefined)
+        else:
+            chain = CHAINS[index % len(CHAINS)]
+            chain_index = 2000 + generator.randrange(100000)
+        configured.append(NetworkFirewallRule({
+            'ruleset': chain, 'rule_index': chain_index, 'name': f'configured {index}'}))
+    return chains, configured
+
+
+def list_based(all_rules: dict, configured: list) -> dict:
+    """ Function with the previous assembly of the chains """
+    configured_names = [
+        f'{rule.chain}_{rule.chain_index}' for rule in configured]
+    chains: dict = dict()
+    for chain, rules in all_rules.items():
+        chain_object = NetworkFirewallChain(rules)
+        chain_object.name = chain
+        if 'rule' in rules.keys():
+            chain_object.rules = list()
+            for rule, details in rules['rule'].items():
+                if f'{chain}_{rule}' not in configured_names:
+                    rule_object = NetworkFirewallRule()
+                    rule_object.name = details['description']
+                    rule_object.enabled = True
+                    rule_object.chain = chain
+                    rule_object.chain_index = int(rule)
+                    rule_object.action = details['action']
+                    rule_object.is_predefined = True
+                    chain_object.rules.append(rule_object)
+        chains[chain] = chain_object
+    for configured_rule in configured:
+        if chains[configured_rule.chain].rules is None:
+            chains[configured_rule.chain].rules = list()
+        chains[configured_rule.chain].rules.append(configured_rule)
+    for chain, chain_object in chains.items():
+        if chain_object.rules:
+            chain_object.rules.sort(key=lambda rule: rule.chain_index)
+    return chains
+
+
+def timed(function, *args) -> tuple[float, object]:
+    """ Function to get the best duration of three runs """
+    best = float('inf')
+    for _ in range(3):
+        start = perf_counter()
+        result = function(*args)
+        best = min(best, perf_counter() - start)
+    return best, result
+
+
+if __name__ == '__main__':
+    max_rules = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sizes = [size for size in (100, 1000, 2500, 5000, 10000, 20000) if size <= max_rules]
+
+    print(f'{"rules":>7} {"list-based ms":>14} {"merge ms":>10} {"speedup":>8} {"add ms":>8}')
+    for size in sizes:
+        chains, configured = generated_rules(size)
+        old_duration, old = timed(list_based, chains, configured)
+        new_duration, new = timed(NetworkFirewallChains.merge, chains, configured)
+
+        # Both must give the same order of rules
+        for name, chain in old.items():
+            assert [rule.chain_index for rule in chain.rules or ()] == \
+                [rule.chain_index for rule in new[name].rules or ()], name
+
+        # Adding one configured rule to the merged chains
+        rule = NetworkFirewallRule({'ruleset': CHAINS[0], 'rule_index': 2500, 'name': 'added'})
+        start = perf_counter()
+        new.add_rule(rule)
+        add_duration = perf_counter() - start
+
+        print(f'{size:>7} {old_duration * 1000:>14.2f} {new_duration * 1000:>10.2f} '
+              f'{old_duration / new_duration:>7.1f}x {add_duration * 1000:>8.3f}')
@@ -0,0 +1,100 @@
+""" Benchmark for the memory used by a large client inventory, with
+    and without interning of the fields that are configured with
+    `intern=True`.
+
+    Usage: python benchmarks/interning_memory.py [clients] """
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from unipy.networkclient import NetworkActiveClient  # noqa: E402
+
+
+def generated_payload(clients: int) -> bytes:
+    """ Function to generate a payload that looks like the response
+        for `clients/active`
+
+        Parameters
+        ----------
+        clients : int
+            The number of clients in the payload
+
+        Returns
+        -------
+        bytes
+            The payload
+    """
+    generator = random.Random(0)
+    data = list()
+    for index in range(clients):
+        data.append({
+            'id': f'{index:024x}',
+            'mac': ':'.join(f'{generator.randrange(256):02x}' for _ in range(6)),
+            'hostname': f'host-{index}',
+            'status': 'online',
+            'type': generator.choice(['WIRED', 'WIRELESS']),
+            'site_id': '5f3d1c2b4a5e6f7a8b9c0d1e',
+            'network_id': f'60a0b0c0d0e0f0a0b0c0d0e{generator.randrange(4)}',
+            'network_name': generator.choice(['Default', 'IoT', 'Guests', 'Lab']),
+            'is_wired': False,
+            'uptime': generator.randrange(86400)
+        })
+    return json.dumps(data).encode()
+
+
+def measure(content: bytes, interning: bool) -> int:
+    """ Function to measure the memory for the objects created from
+        a payload
+
+        Parameters
+        ----------
+        content : bytes
+            The payload
+
+        interning : bool
+            If False, interning is disabled for all fields
+
+        Returns
+        -------
+        int
+            The number of bytes allocated for the objects
+    """
+    fields = [field for field in NetworkActiveClient.get_fields().values()
+              if field.intern]
+    for field in fields:
+        field.intern = interning
+
+    # The converters are created once per class; create them again
+    # with the changed fields
+    if '_object_converters' in vars(NetworkActiveClient):
+        del NetworkActiveClient._object_converters
+
+    gc.collect()
+    tracemalloc.start()
+    objects = [NetworkActiveClient(item) for item in json.loads(content)]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for field in fields:
+        field.intern = True
+    del NetworkActiveClient._object_converters
+    del objects
+    return size
+
+
+if __name__ == '__main__':
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    content = generated_payload(clients)
+    without_interning = measure(content, False)
+    with_interning = measure(content, True)
+    print(f'{clients} clients')
+    print(f'    without interning: {without_interning / 1024 / 1024:8.1f} MB')
+    print(f'    with interning:    {with_interning / 1024 / 1024:8.1f} MB '
+          f'({(1 - with_interning / without_interning) * 100:.1f}% less)')
@@ -0,0 +1,105 @@
+""" Benchmark for the JSON decoders for API responses. Uses the
+    recorded payloads given as arguments, or a generated
+    `stat/device`-like payload when no payloads are given.
+
+    Usage: python benchmarks/json_decoders.py [payload.json ...] """
+
+import json
+import random
+import sys
+from pathlib import Path
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from unipy.networkdevice import NetworkDevice  # noqa: E402
+from unipy.unipydecoder import DECODERS  # noqa: E402
+
+
+def generated_payload(devices: int = 500) -> bytes:
+    """ Function to generate a payload that looks like the response
+        for `stat/device`
+
+        Parameters
+        ----------
+        devices : int = 500
+            The number of devices in the payload
+
+        Returns
+        -------
+        bytes
+            The payload
+    """
+    generator = random.Random(0)
+    data = list()
+    for index in range(devices):
+        data.append({
+            '_id': f'{index:024x}',
+            'mac': ':'.join(f'{generator.randrange(256):02x}' for _ in range(6)),
+            'type': generator.choice(['uap', 'usw', 'ugw']),
+            'model': generator.choice(['U7PG2', 'US16P150', 'UGW3']),
+            'version': '6.5.28.14491',
+            'adopted': True,
+            'cfgversion': f'{generator.getrandbits(64):016x}',
+            'tx_bytes': generator.getrandbits(40),
+            'rx_bytes': generator.getrandbits(40),
+            'uptime': generator.randrange(10 ** 7),
+            'port_table': [{'port_idx': port, 'name': f'Port {port}',
+                            'speed': 1000, 'up': True,
+                            'tx_bytes': generator.getrandbits(40)}
+                           for port in range(24)],
+            'stat': {'sw': {f'counter_{counter}': generator.random()
+                            for counter in range(50)}}
+        })
+    return json.dumps({'meta': {'rc': 'ok'}, 'data': data}).encode()
+
+
+def benchmark(name: str, content: bytes, number: int = 5) -> None:
+    """ Function to time all installed decoders for a payload
+
+        Parameters
+        ----------
+        name : str
+            The name of the payload
+
+        content : bytes
+            The payload
+
+        number : int = 5
+            The number of decodes per measurement
+
+        Returns
+        -------
+        None
+    """
+    print(f'{name} ({len(content) / 1024 / 1024:.1f} MB)')
+    for decoder_name, decoder_type in DECODERS.items():
+        try:
+            decoder = decoder_type()
+        except ImportError:
+            print(f'    {decoder_name:10} not installed')
+            continue
+
+        timings = repeat(lambda: decoder.decode(content),
+                         number=number, repeat=3)
+        decode_time = min(timings) / number * 1000
+
+        def to_objects() -> list:
+            data = decoder.decode(content)
+            if isinstance(data, dict):
+                data = data['data']
+            return NetworkDevice.from_api_list(data)
+
+        timings = repeat(to_objects, number=1, repeat=3)
+        objects_time = min(timings) * 1000
+
+        print(f'    {decoder_name:10} {decode_time:8.2f} ms decode  '
+              f'{objects_time:8.2f} ms to objects')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            benchmark(path, Path(path).read_bytes())
+    else:
+        benchmark('generated stat/device', generated_payload())
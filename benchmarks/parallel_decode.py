@@ -0,0 +1,79 @@
+""" Benchmark for converting a large `clients/history` payload to
+    objects with a pool of worker processes. Reports the rows per
+    second for each number of workers, and for the default, which
+    only uses workers above `MIN_PARALLEL_SIZE`.
+
+    Usage: python benchmarks/parallel_decode.py [rows] """
+
+import json
+import os
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from unipy.networkclient import NetworkInactiveClient  # noqa: E402
+from unipy.unipyparallel import MIN_PARALLEL_SIZE, decode_parallel  # noqa: E402
+
+
+def generated_payload(rows: int) -> bytes:
+    """ Function to generate a payload that looks like the response
+        for `clients/history`
+
+        Parameters
+        ----------
+        rows : int
+            The number of clients in the payload
+
+        Returns
+        -------
+        bytes
+            The payload
+    """
+    generator = random.Random(0)
+    data = list()
+    for index in range(rows):
+        data.append({
+            'id': f'{index:024x}',
+            'mac': ':'.join(f'{generator.randrange(256):02x}' for _ in range(6)),
+            'hostname': f'host-{index}',
+            'display_name': f'Client {index}',
+            'blocked': generator.random() < 0.01,
+            'first_seen': 1650000000 + generator.randrange(10 ** 7),
+            'last_seen': 1660000000 + generator.randrange(10 ** 7),
+            'ip': f'10.0.{index // 256 % 256}.{index % 256}',
+            'status': 'offline',
+            'type': 'WIRELESS',
+            'is_wired': False,
+            'unifi_device': False,
+            'use_fixedip': False
+        })
+    return json.dumps(data).encode()
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    content = generated_payload(rows)
+    print(f'{len(content) / 1024 / 1024:.1f} MB, {os.cpu_count()} CPUs')
+
+    start = perf_counter()
+    objects = NetworkInactiveClient.from_api_list(json.loads(content))
+    baseline = perf_counter() - start
+    print(f'{"serial":>17}: {rows / baseline:12,.0f} rows/s')
+
+    # The default only uses workers for documents above the
+    # threshold; the others force the workers
+    runs = [(None, MIN_PARALLEL_SIZE)] + [
+        (workers, 0) for workers in sorted({2, 4, os.cpu_count() or 1}) if workers > 1]
+    for workers, min_size in runs:
+        for columnar in (False, True):
+            start = perf_counter()
+            decode_parallel(content, NetworkInactiveClient, workers=workers,
+                            columnar=columnar, min_size=min_size)
+            duration = perf_counter() - start
+            mode = 'columns' if columnar else 'objects'
+            label = f'{workers} workers' if workers else 'default'
+            print(f'{label:>9} {mode:>7}: {rows / duration:12,.0f} rows/s '
+                  f'({baseline / duration:.2f}x)')
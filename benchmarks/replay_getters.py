@@ -0,0 +1,73 @@
+""" Benchmark for the getters of `UnipyNetwork` against a recorded
+    archive. Without a archive, the traffic with the local
+    stand-in is recorded first. Use a archive recorded from a real
+    console to benchmark with production-shaped data.
+
+    Usage: python benchmarks/replay_getters.py [archive] [rounds]
+
+    Set `UNIPY_PROFILE=1` to print the phases of the getters, or
+    `UNIPY_PROFILE=trace.json` to write a Chrome trace. """
+
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from unipy.unipyconnection import UnipyConnection  # noqa: E402
+from unipy.unipynetwork import UnipyNetwork  # noqa: E402
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer  # noqa: E402
+from unipy.unipytransport import UnipyRecordingTransport, UnipyReplayTransport  # noqa: E402
+
+# The getters to benchmark
+GETTERS = ('get_devices', 'get_active_clients', 'get_inactive_clients',
+           'get_firewall_groups', 'get_firewall_configured_rules',
+           'get_ssids', 'get_sites')
+
+
+def record(path: Path) -> None:
+    """ Function to record the getters against the stand-in
+
+        Parameters
+        ----------
+        path : Path
+            The file for the archive
+
+        Returns
+        -------
+        None
+    """
+    config = UnipyStandInConfig(active_clients=2000, inactive_clients=10000)
+    with UnipyStandInServer(config) as standin:
+        connection = UnipyConnection(
+            standin.server, 'admin', 'password', verify=False,
+            transport=UnipyRecordingTransport(path))
+        network = UnipyNetwork(connection)
+        for getter in GETTERS:
+            getattr(network, getter)()
+
+
+if __name__ == '__main__':
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tempdir = None
+    if len(sys.argv) > 1 and sys.argv[1]:
+        archive = Path(sys.argv[1])
+    else:
+        tempdir = tempfile.TemporaryDirectory()
+        archive = Path(tempdir.name) / 'standin.ndjson.gz'
+        record(archive)
+        print(f'Recorded {archive.stat().st_size:,} bytes from the stand-in')
+
+    connection = UnipyConnection(
+        'replay', 'admin', 'password', transport=UnipyReplayTransport(archive))
+    network = UnipyNetwork(connection)
+    for getter in GETTERS:
+        start = perf_counter()
+        for _ in range(rounds):
+            items = getattr(network, getter)()
+        duration = (perf_counter() - start) / rounds
+        print(f'{getter:>30}: {len(items):>6} items in {duration * 1000:8.2f} ms')
+
+    if tempdir:
+        tempdir.cleanup()
@@ -1,8 +1,320 @@
-""" Module that contains the CLI scripts for the application """
+""" Module that contains the CLI scripts for the application. The
+    `unipy` package is only imported when a command needs it, so
+    the CLI starts fast. When the daemon is running, the commands
+    are executed by the daemon, which keeps a logged in connection
+    and caches the results. """
 
-from urllib import request
-from unipy import Unipy
-from argparse import ArgumentParser
+import json
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from typing import Any, Optional
+
+# Default columns for the output of the commands
+COLUMNS = {
+    'devices': ['name', 'type', 'model', 'mac_address', 'ipv4_address',
+                'version', 'state', 'upgradable'],
+    'clients': ['display_name', 'hostname', 'mac_address', 'ipv4_address',
+                'wired', 'blocked'],
+    'firewall': ['chain', 'chain_index', 'name', 'action', 'enabled',
+                 'is_predefined'],
+    'ssids': ['name', 'enabled', 'security', 'wpa_mode', 'wpa_enc']
+}
+
+
+def default_socket_path() -> str:
+    """ Function to get the default path for the socket of the
+        daemon
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+            The path for the socket
+    """
+    directory = os.environ.get('XDG_RUNTIME_DIR', '/tmp')
+    return os.path.join(directory, f'unipy-{os.getuid()}.sock')
+
+
+def credentials(args: Namespace) -> dict:
+    """ Function to get the server and credentials from the
+        arguments, to send with a request to the daemon. The
+        password is sent as a hash. Values that are not given are
+        left out.
+
+        Parameters
+        ----------
+        args : Namespace
+            The parsed arguments
+
+        Returns
+        -------
+        dict
+            The server, username and password hash
+    """
+    from hashlib import sha256
+
+    values = {'server': args.server, 'username': args.username}
+    if args.password:
+        values['password'] = sha256(args.password.encode()).hexdigest()
+    return {key: value for key, value in values.items() if value}
+
+
+def daemon_running(socket_path: str) -> bool:
+    """ Function to check if a daemon accepts connections on the
+        socket
+
+        Parameters
+        ----------
+        socket_path : str
+            The path to the socket of the daemon
+
+        Returns
+        -------
+        bool
+            True if a daemon is running
+    """
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def create_unipy(args: Namespace) -> Any:
+    """ Function to create a logged in Unipy object with the
+        credentials from the arguments
+
+        Parameters
+        ----------
+        args : Namespace
+            The parsed arguments
+
+        Returns
+        -------
+        Unipy
+            The logged in Unipy object
+    """
+    from unipy import Unipy
+    from unipy.exceptions import PermissionDeniedError
+
+    if not args.server or not args.username or not args.password:
+        raise SystemExit(
+            'Server, username and password are required; use the arguments or '
+            'the UNIPY_SERVER, UNIPY_USERNAME and UNIPY_PASSWORD variables')
+
+    unipy = Unipy(
+        server=args.server,
+        username=args.username,
+        password=args.password,
+        verify=not args.insecure)
+    try:
+        unipy.login()
+    except PermissionDeniedError:
+        raise SystemExit(f'Login to "{args.server}" failed; check the username and password')
+    return unipy
+
+
+def execute(unipy: Any, command: str, options: dict) -> list[dict]:
+    """ Function to execute a command and get the result as rows
+
+        Parameters
+        ----------
+        unipy : Unipy
+            The Unipy object to use
+
+        command : str
+            The command to execute
+
+        options : dict
+            The options for the command
+
+        Returns
+        -------
+        list[dict]
+            The result as a list of dicts
+    """
+    network = unipy.network
+    if command == 'devices':
+        objects = network.get_devices()
+    elif command == 'clients':
+        if options.get('inactive'):
+            objects = network.get_inactive_clients()
+        else:
+            objects = network.get_active_clients()
+    elif command == 'ssids':
+        objects = network.get_ssids()
+    elif command == 'firewall':
+        if options.get('groups'):
+            return [group.to_dict() for group in network.get_firewall_groups()]
+        objects = list()
+        for chain in network.get_firewall_rules().values():
+            objects.extend(chain.rules or list())
+    else:
+        raise ValueError(f'Unknown command "{command}"')
+    return [item.to_dict() for item in objects]
+
+
+def request_daemon(socket_path: str,
+                   command: str,
+                   options: dict,
+                   login: dict) -> Optional[list[dict]]:
+    """ Function to let the daemon execute a command. The daemon
+        refuses the command when it is connected to another server
+        or with other credentials than given.
+
+        Parameters
+        ----------
+        socket_path : str
+            The path to the socket of the daemon
+
+        command : str
+            The command to execute
+
+        options : dict
+            The options for the command
+
+        login : dict
+            The server and credentials from `credentials`
+
+        Returns
+        -------
+        list[dict]
+            The result as a list of dicts
+
+        None
+            The daemon is not running
+    """
+    import socket
+
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(json.dumps(
+                {'command': command, 'options': options, 'login': login}).encode() + b'\n')
+            with client.makefile('rb') as response_file:
+                response = json.loads(response_file.readline())
+    except (ConnectionError, FileNotFoundError, ValueError):
+        return None
+
+    if 'error' in response:
+        raise SystemExit(f'Daemon error: {response["error"]}')
+    return response['rows']
+
+
+def run_daemon(args: Namespace) -> None:
+    """ Function to run the daemon. The daemon keeps a logged in
+        connection and serves commands over a Unix socket. Results
+        are cached for the configured number of seconds. Identical
+        commands that arrive at the same time are executed once;
+        other commands are executed at the same time.
+
+        Parameters
+        ----------
+        args : Namespace
+            The parsed arguments
+
+        Returns
+        -------
+        None
+    """
+    import socketserver
+    from unipy.unipysingleflight import UnipySingleFlight
+
+    if daemon_running(args.socket):
+        raise SystemExit(f'A daemon is already running on "{args.socket}"')
+
+    unipy = create_unipy(args)
+    daemon_login = credentials(args)
+    results = UnipySingleFlight(window=args.cache_ttl)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            # Connections without a request check if the daemon runs
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                command = request['command']
+                options = request.get('options', dict())
+                for key, value in request.get('login', dict()).items():
+                    if daemon_login.get(key) != value:
+                        raise ValueError(
+                            f'The daemon uses another {key}; stop the daemon or use --no-daemon')
+                key = json.dumps([command, options], sort_keys=True)
+                rows = results.do(key, lambda: execute(unipy, command, options))
+                response = {'rows': rows}
+            except Exception as error:
+                response = {'error': str(error)}
+            self.wfile.write(json.dumps(response, default=str).encode() + b'\n')
+
+    # A socket that is left by a daemon that stopped
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+
+    if args.detach and os.fork() != 0:
+        return
+    if args.detach:
+        os.setsid()
+
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(args.socket, Handler)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        unipy.logout()
+
+
+def print_rows(rows: list[dict], columns: list[str], as_json: bool) -> None:
+    """ Function to print the result of a command
+
+        Parameters
+        ----------
+        rows : list[dict]
+            The rows to print
+
+        columns : list[str]
+            The columns to print in a table
+
+        as_json : bool
+            If True, the complete rows are printed as JSON
+
+        Returns
+        -------
+        None
+    """
+    if as_json:
+        json.dump(rows, sys.stdout, default=str, indent=2)
+        sys.stdout.write('\n')
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table()
+    for column in columns:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*['' if row.get(column) is None else str(row.get(column))
+                        for column in columns])
+    Console().print(table)
 
 
 def unipy_cli_main() -> None:
@@ -10,6 +322,27 @@ def unipy_cli_main() -> None:
 
     # Create a argument parser
     arguments = ArgumentParser('Unipy CLI')
+    arguments.add_argument(
+        '--server', default=os.environ.get('UNIPY_SERVER'),
+        help='The UnifiOS server to connect to')
+    arguments.add_argument(
+        '--username', default=os.environ.get('UNIPY_USERNAME'),
+        help='The username to connect with')
+    arguments.add_argument(
+        '--password', default=os.environ.get('UNIPY_PASSWORD'),
+        help='The password to connect with')
+    arguments.add_argument(
+        '--insecure', action='store_true',
+        help='Do not verify the certificate of the server')
+    arguments.add_argument(
+        '--socket', default=default_socket_path(),
+        help='The socket of the daemon')
+    arguments.add_argument(
+        '--no-daemon', action='store_true',
+        help='Do not use the daemon, even when it is running')
+    arguments.add_argument(
+        '--json', action='store_true',
+        help='Print the complete objects as JSON')
 
     # Create a object for subparser
     subs = arguments.add_subparsers(
@@ -19,15 +352,48 @@ def unipy_cli_main() -> None:
         dest='group',
         required=True)
 
-    # Add the subparser for authentication
-    auth = subs.add_parser('auth', help='Authentication management').add_subparsers(
-        title='command', metavar='command', help='Command', required=True)
-    auth.add_parser('list', help='List all configured authentications')
+    # Add the subparsers for the commands
+    subs.add_parser('devices', help='List network devices')
+    clients = subs.add_parser('clients', help='List network clients')
+    clients.add_argument('--inactive', action='store_true',
+                         help='List inactive clients instead of active clients')
+    firewall = subs.add_parser('firewall', help='List firewall rules')
+    firewall.add_argument('--groups', action='store_true',
+                          help='List firewall groups instead of rules')
+    subs.add_parser('ssids', help='List SSIDs')
+
+    # Add the subparser for the daemon
+    daemon = subs.add_parser(
+        'daemon', help='Run a daemon that keeps the connection open')
+    daemon.add_argument('--cache-ttl', type=float, default=5.0,
+                        help='Seconds to cache the results')
+    daemon.add_argument('--detach', action='store_true',
+                        help='Run the daemon in the background')
 
     # Parse the arguments
     args = arguments.parse_args()
 
-    print(args.command)
+    if args.group == 'daemon':
+        run_daemon(args)
+        return
+
+    options = {key: value for key, value in vars(args).items()
+               if key in ('inactive', 'groups') and value}
+
+    rows = None
+    if not args.no_daemon:
+        rows = request_daemon(args.socket, args.group, options, credentials(args))
+    if rows is None:
+        unipy = create_unipy(args)
+        try:
+            rows = execute(unipy, args.group, options)
+        finally:
+            unipy.logout()
+
+    columns = COLUMNS[args.group]
+    if args.group == 'firewall' and options.get('groups'):
+        columns = ['name', 'group_type', 'members']
+    print_rows(rows, columns, args.json)
 
 
 if __name__ == '__main__':
@@ -16,3 +16,60 @@ class NoFirewallsFoundError(Exception):
     """ Error when the library is searching for a firewall but
         can't find any """
     pass
+
+
+class FieldConversionError(Exception):
+    """ Error when a value from the API can't be converted to the
+        type of the field """
+    pass
+
+
+class FrozenObjectError(Exception):
+    """ Error when a object that is shared between callers is
+        changed. Change a copy of the object instead """
+    pass
+
+
+class RequestFailedError(Exception):
+    """ Error when a API request could not be completed. The
+        more specific errors below are subclasses of this one """
+    pass
+
+
+class ServerUnreachableError(RequestFailedError):
+    """ Error when the connection to the server can't be made """
+    pass
+
+
+class RequestTimeoutError(RequestFailedError):
+    """ Error when the server does not respond in time """
+    pass
+
+
+class ServerError(RequestFailedError):
+    """ Error when the server responds with a 5xx status """
+
+    def __init__(self, message: str = '', status_code: int = 0) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RateLimitedError(RequestFailedError):
+    """ Error when a request is rate limited, by the server or by
+        the rate limiter of the connection """
+    pass
+
+
+class CircuitOpenError(RequestFailedError):
+    """ Error when the requests to a server are stopped because
+        the server kept failing """
+
+    def __init__(self, message: str = '', retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ResponseTooLargeError(RequestFailedError):
+    """ Error when the body of a response is larger than the
+        configured maximum """
+    pass
@@ -0,0 +1,123 @@
+""" Module that contains the class to detect configuration
+    changes on network devices """
+
+from typing import Iterable, Optional
+from unipy.networkdevice import NetworkDevice
+
+
+class NetworkConfigTracker:
+    """ Class that remembers the last seen configuration version
+        for network devices. Can be used to only execute
+        expensive per-device requests for devices where the
+        configuration changed since the last time. """
+
+    def __init__(self) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        # The last seen versions, keyed on the MAC address
+        self.versions: dict[str, tuple[Optional[str], Optional[str]]] = dict()
+
+    @staticmethod
+    def version_key(device: NetworkDevice) -> tuple[Optional[str], Optional[str]]:
+        """ Method to get the versions to track for a device
+
+            Parameters
+            ----------
+            device : NetworkDevice
+                The device to get the versions for
+
+            Returns
+            -------
+            tuple[Optional[str], Optional[str]]
+                The `cfg_version` and `known_cfgversion` of the
+                device
+        """
+        return (device.cfg_version, device.known_cfgversion)
+
+    def has_changed(self, device: NetworkDevice) -> bool:
+        """ Method to check if the configuration of a device
+            changed since it was last marked as seen. Devices
+            that were never seen are always changed.
+
+            Parameters
+            ----------
+            device : NetworkDevice
+                The device to check
+
+            Returns
+            -------
+            bool
+                True if the configuration changed
+        """
+        last_seen = self.versions.get(device.mac_address)
+        return last_seen is None or last_seen != self.version_key(device)
+
+    def mark_seen(self, device: NetworkDevice) -> None:
+        """ Method to remember the current configuration version
+            of a device
+
+            Parameters
+            ----------
+            device : NetworkDevice
+                The device to remember
+
+            Returns
+            -------
+            None
+        """
+        self.versions[device.mac_address] = self.version_key(device)
+
+    def changed_devices(self,
+                        devices: Iterable[NetworkDevice],
+                        mark_seen: bool = False) -> list[NetworkDevice]:
+        """ Method to get the devices where the configuration
+            changed
+
+            Parameters
+            ----------
+            devices : Iterable[NetworkDevice]
+                The devices to check
+
+            mark_seen : bool = False
+                If True, the changed devices are marked as seen
+                directly. Leave this False when the devices should
+                only be marked after processing succeeded.
+
+            Returns
+            -------
+            list[NetworkDevice]
+                The devices with a changed configuration
+        """
+        changed = [
+            device for device in devices if self.has_changed(device)]
+        if mark_seen:
+            for device in changed:
+                self.mark_seen(device)
+        return changed
+
+    def forget(self, device_mac: Optional[str] = None) -> None:
+        """ Method to forget the versions for a device, or for all
+            devices
+
+            Parameters
+            ----------
+            device_mac : Optional[str]
+                The MAC address of the device to forget. If not
+                given, all devices are forgotten.
+
+            Returns
+            -------
+            None
+        """
+        if device_mac is None:
+            self.versions.clear()
+        else:
+            self.versions.pop(device_mac, None)
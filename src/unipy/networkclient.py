@@ -18,11 +18,19 @@ class NetworkClient(UnipyObject):
     ipv4_address = ObjectField(type=str, api_field='ip')
     fixed_ipv4_address = ObjectField(type=str, api_field='fixed_ip')
     mac_address = ObjectField(type=str, api_field='mac')
-    status = ObjectField(type=str, api_field='status')
-    type = ObjectField(type=str, api_field='type')
+    status = ObjectField(type=str, api_field='status', intern=True)
+    type = ObjectField(type=str, api_field='type', intern=True)
     unifi_device = ObjectField(type=bool, api_field='unifi_device')
     fixed_ip = ObjectField(type=bool, api_field='use_fixedip')
     wired = ObjectField(type=bool, api_field='is_wired')
+    uplink_mac = ObjectField(type=str, api_field='uplink_mac')
+    last_uplink_mac = ObjectField(type=str, api_field='last_uplink_mac')
+    ap_mac = ObjectField(type=str, api_field='ap_mac')
+    sw_mac = ObjectField(type=str, api_field='sw_mac')
+    site_id = ObjectField(type=str, api_field='site_id', intern=True)
+    network_id = ObjectField(type=str, api_field='network_id', intern=True)
+    network_name = ObjectField(
+        type=str, api_field='network_name', intern=True)
 
     def __init__(self,
                  data: Optional[dict] = None,
@@ -41,6 +49,25 @@ class NetworkClient(UnipyObject):
         """
         super().__init__(data, binding)
 
+    def get_uplink_mac(self) -> Optional[str]:
+        """ Method to get the MAC address of the device this client
+            is connected to
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            str
+                The MAC address of the uplink device
+
+            None
+                The uplink device is unknown
+        """
+        return (self.uplink_mac or self.ap_mac or self.sw_mac or
+                self.last_uplink_mac)
+
 
 class NetworkActiveClient(NetworkClient):
     """ Dataclass containing all the fields for active
@@ -1,27 +1,35 @@
 """ Module that contains dataclasses for network devices """
 
-from typing import Optional
+from typing import Any, ClassVar, Optional, Type
+from unipy.networkdeviceconfig import NetworkDeviceSystemConfig
 from unipy.unipyapplication import UnipyApplication
 from unipy.unipyobject import UnipyObject, ObjectField
 
 
 class NetworkDevice(UnipyObject):
     """ Dataclass containing all the fields for network
-        devices """
+        devices. Subclasses that set `device_type` are added to
+        the registry and are used for devices of that type. """
+
+    # The `type` from the API this class is for, and the classes
+    # for all registered types
+    device_type: ClassVar[Optional[str]] = None
+    registry: ClassVar[dict[str, Type['NetworkDevice']]] = dict()
 
     id = ObjectField(type=str, api_field='_id')
     ipv4_address = ObjectField(type=str, api_field='ip')
     mac_address = ObjectField(type=str, api_field='mac')
-    model = ObjectField(type=str, api_field='model')
-    type = ObjectField(type=str, api_field='type')
-    version = ObjectField(type=str, api_field='version')
+    model = ObjectField(type=str, api_field='model', intern=True)
+    type = ObjectField(type=str, api_field='type', intern=True)
+    version = ObjectField(type=str, api_field='version', intern=True)
     adopted = ObjectField(type=bool, api_field='adopted')
-    site_id = ObjectField(type=str, api_field='site_id')
+    site_id = ObjectField(type=str, api_field='site_id', intern=True)
     cfg_version = ObjectField(type=str, api_field='cfgversion')
     cfg_network = ObjectField(type=str, api_field='config_network')
-    license_state = ObjectField(type=str, api_field='license_state')
-    inform_url = ObjectField(type=str, api_field='inform_url')
-    inform_ip = ObjectField(type=str, api_field='inform_ip')
+    license_state = ObjectField(
+        type=str, api_field='license_state', intern=True)
+    inform_url = ObjectField(type=str, api_field='inform_url', intern=True)
+    inform_ip = ObjectField(type=str, api_field='inform_ip', intern=True)
     hw_caps = ObjectField(type=int, api_field='hw_caps')
     fw_caps = ObjectField(type=int, api_field='fw_caps')
     serial = ObjectField(type=str, api_field='serial')
@@ -29,12 +37,13 @@ class NetworkDevice(UnipyObject):
     model_incompatible = ObjectField(type=bool, api_field='model_incompatible')
     model_in_lts = ObjectField(type=bool, api_field='model_in_lts')
     model_in_eol = ObjectField(type=bool, api_field='model_in_eol')
-    snmp_contact = ObjectField(type=str, api_field='snmp_contact')
-    snmp_location = ObjectField(type=str, api_field='snmp_location')
+    snmp_contact = ObjectField(type=str, api_field='snmp_contact', intern=True)
+    snmp_location = ObjectField(
+        type=str, api_field='snmp_location', intern=True)
     connected_at = ObjectField(type=int, api_field='connected_at')
     provisioned_at = ObjectField(type=int, api_field='provisioned_at')
     device_id = ObjectField(type=str, api_field='device_id')
-    uplink = ObjectField(type=str, api_field='uplink')
+    uplink = ObjectField(type=dict, api_field='uplink')
     state = ObjectField(type=int, api_field='state')
     # 1 = Online, 5 = Getting ready
     last_seen = ObjectField(type=int, api_field='last_seen')
@@ -65,10 +74,78 @@ class NetworkDevice(UnipyObject):
         """
         super().__init__(data, binding)
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """ Adds subclasses with a `device_type` to the registry """
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get('device_type'):
+            NetworkDevice.registry[cls.device_type] = cls
+
+    @classmethod
+    def class_for(cls, device_type: Optional[str]) -> Optional[Type['NetworkDevice']]:
+        """ Method to get the registered class for a device type
+
+            Parameters
+            ----------
+            device_type : Optional[str]
+                The `type` of the device from the API
+
+            Returns
+            -------
+            Type[NetworkDevice]
+                The class for the device type
+
+            None
+                No class is registered for the device type
+        """
+        return NetworkDevice.registry.get(device_type)
+
+    def get_uplink_mac(self) -> Optional[str]:
+        """ Method to get the MAC address of the device this device
+            is connected to
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            str
+                The MAC address of the uplink device
+
+            None
+                The device has no uplink device, for example
+                because it is the gateway
+        """
+        if type(self.uplink) is dict:
+            return self.uplink.get('uplink_mac')
+        return None
+
+    def get_system_cfg(self) -> NetworkDeviceSystemConfig:
+        """ Method to get the `system` configuration for this
+            device. Uses the binding to retrieve the
+            configuration, which is only retrieved again when
+            the configuration version of the device changed.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            NetworkDeviceSystemConfig
+                The configuration of the device
+        """
+        return self.binding.get_device_system_cfg(
+            device_mac=self.mac_address,
+            cfg_version=self.cfg_version,
+            known_cfgversion=self.known_cfgversion)
+
 
 class NetworkDeviceUGW(NetworkDevice):
     """ Dataclass for a UGW device """
 
+    device_type = 'ugw'
+
     speedtest_status_saved = ObjectField(
         type=bool, api_field='speedtest_status')
 
@@ -93,7 +170,9 @@ class NetworkDeviceUGW(NetworkDevice):
 class NetworkDeviceUSW(NetworkDevice):
     """ Dataclass for a USW device """
 
-    stp_version = ObjectField(type=str, api_field='stp_version')
+    device_type = 'usw'
+
+    stp_version = ObjectField(type=str, api_field='stp_version', intern=True)
     stp_priority = ObjectField(type=int, api_field='stp_priority')
 
     def __init__(self,
@@ -117,11 +196,92 @@ class NetworkDeviceUSW(NetworkDevice):
 class NetworkDeviceUAP(NetworkDevice):
     """ Dataclass for a UAP device """
 
+    device_type = 'uap'
+
     wifi_caps = ObjectField(type=int, api_field='wifi_caps')
     scanning = ObjectField(type=bool, api_field='scanning')
     spectrum_scanning = ObjectField(type=bool, api_field='spectrum_scanning')
     isolated = ObjectField(type=bool, api_field='isolate')
-    bandsteering_mode = ObjectField(type=str, api_field='bandsteering_mode')
+    bandsteering_mode = ObjectField(
+        type=str, api_field='bandsteering_mode', intern=True)
+
+    def __init__(self,
+                 data: Optional[dict] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : Optional[dict]
+                If given, this data is used to fill the
+                object
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(data, binding)
+
+
+class NetworkDeviceUDM(NetworkDeviceUGW):
+    """ Dataclass for a UDM device; a gateway with a built-in
+        switch and, for most models, a access point """
+
+    device_type = 'udm'
+
+    wifi_caps = ObjectField(type=int, api_field='wifi_caps')
+    stp_version = ObjectField(type=str, api_field='stp_version', intern=True)
+    stp_priority = ObjectField(type=int, api_field='stp_priority')
+
+    def __init__(self,
+                 data: Optional[dict] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : Optional[dict]
+                If given, this data is used to fill the
+                object
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(data, binding)
+
+
+class NetworkDeviceUXG(NetworkDeviceUGW):
+    """ Dataclass for a UXG device """
+
+    device_type = 'uxg'
+
+    def __init__(self,
+                 data: Optional[dict] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : Optional[dict]
+                If given, this data is used to fill the
+                object
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(data, binding)
+
+
+class NetworkDeviceUSP(NetworkDevice):
+    """ Dataclass for a USP (SmartPower) device """
+
+    device_type = 'usp'
+
+    outlets = ObjectField(type=list, api_field='outlet_table', default=None)
+    outlet_overrides = ObjectField(
+        type=list, api_field='outlet_overrides', default=None)
 
     def __init__(self,
                  data: Optional[dict] = None,
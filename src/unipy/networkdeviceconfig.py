@@ -0,0 +1,264 @@
+""" Module that contains the classes for the configuration of
+    network devices """
+
+from copy import deepcopy
+from typing import Any, Optional
+from unipy.exceptions import FrozenObjectError
+from unipy.unipyapplication import UnipyApplication
+from unipy.unipyobject import UnipyObject, ObjectField
+
+
+class NetworkDeviceConfigFirewall(UnipyObject):
+    """ Dataclass containing the `firewall` section of the
+        system configuration of a device """
+
+    chains = ObjectField(type=dict, api_field='name', default=None)
+    ipv6_chains = ObjectField(type=dict, api_field='ipv6-name', default=None)
+    groups = ObjectField(type=dict, api_field='group', default=None)
+    options = ObjectField(type=dict, api_field='options', default=None)
+    all_ping = ObjectField(type=str, api_field='all-ping')
+    broadcast_ping = ObjectField(type=str, api_field='broadcast-ping')
+    ip_src_route = ObjectField(type=str, api_field='ip-src-route')
+    log_martians = ObjectField(type=str, api_field='log-martians')
+    receive_redirects = ObjectField(type=str, api_field='receive-redirects')
+    send_redirects = ObjectField(type=str, api_field='send-redirects')
+    source_validation = ObjectField(type=str, api_field='source-validation')
+    syn_cookies = ObjectField(type=str, api_field='syn-cookies')
+
+    def __init__(self,
+                 data: Optional[dict] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : Optional[dict]
+                If given, this data is used to fill the
+                object
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(data, binding)
+
+
+class NetworkDeviceConfigInterfaces(UnipyObject):
+    """ Dataclass containing the `interfaces` section of the
+        system configuration of a device """
+
+    ethernet = ObjectField(type=dict, api_field='ethernet', default=None)
+    switch = ObjectField(type=dict, api_field='switch', default=None)
+    loopback = ObjectField(type=dict, api_field='loopback', default=None)
+    bridge = ObjectField(type=dict, api_field='bridge', default=None)
+    pseudo_ethernet = ObjectField(
+        type=dict, api_field='pseudo-ethernet', default=None)
+    vti = ObjectField(type=dict, api_field='vti', default=None)
+
+    def __init__(self,
+                 data: Optional[dict] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : Optional[dict]
+                If given, this data is used to fill the
+                object
+
+            Returns
+            -------
+            None
+        """
+        super().__init__(data, binding)
+
+
+class NetworkDeviceSystemConfig:
+    """ Class that represents the `system` configuration of a
+        device. The configuration is a very large structure, so
+        sections are only converted to objects when they are
+        requested. Sections without a configured class are
+        returned as the raw dict from the API.
+
+        A frozen configuration is shared between callers: the
+        sections are frozen when they are converted and the raw
+        data must not be changed. Use `copy()` to get a
+        configuration that can be changed. """
+
+    # Classes for the sections that can be converted
+    section_types: dict[str, type[UnipyObject]] = {
+        'firewall': NetworkDeviceConfigFirewall,
+        'interfaces': NetworkDeviceConfigInterfaces
+    }
+
+    def __init__(self,
+                 data: dict,
+                 cfg_version: Optional[str] = None,
+                 known_cfgversion: Optional[str] = None,
+                 binding: Optional[UnipyApplication] = None) -> None:
+        """ Sets the values
+
+            Parameters
+            ----------
+            data : dict
+                The raw `system_cfg` dict from the API
+
+            cfg_version : Optional[str]
+                The configuration version of the device when
+                this configuration was retrieved
+
+            known_cfgversion : Optional[str]
+                The configuration version the device reported
+                as known when this configuration was retrieved
+
+            binding : Optional[UnipyApplication]
+                The application this object is bound to
+
+            Returns
+            -------
+            None
+        """
+        self.raw = data
+        self.cfg_version = cfg_version
+        self.known_cfgversion = known_cfgversion
+        self.binding = binding
+
+        # Cache for sections that are already converted
+        self.__sections: dict[str, Any] = dict()
+        self.__frozen = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get('_NetworkDeviceSystemConfig__frozen'):
+            raise FrozenObjectError(
+                'This configuration is shared and can\'t be changed; change a copy from copy()')
+        object.__setattr__(self, name, value)
+
+    def freeze(self) -> 'NetworkDeviceSystemConfig':
+        """ Method to make the configuration read-only, because it
+            is shared between callers. Sections that are converted
+            from now on are frozen as well.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            NetworkDeviceSystemConfig
+                This configuration
+        """
+        for section in self.__sections.values():
+            if isinstance(section, UnipyObject):
+                section.freeze()
+        self.__frozen = True
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        """ True if the configuration is shared and read-only """
+        return self.__frozen
+
+    def section(self, name: str) -> Any:
+        """ Method to get a section of the configuration. The
+            section is converted on first use.
+
+            Parameters
+            ----------
+            name : str
+                The name of the section, as used in the API
+
+            Returns
+            -------
+            Any
+                A object for sections with a configured class,
+                the raw data for other sections
+
+            Raises
+            ------
+            KeyError
+                The section does not exist for this device
+        """
+        if name not in self.__sections:
+            data = self.raw[name]
+            section_type = self.section_types.get(name)
+            if section_type and type(data) is dict:
+                data = section_type(data, self.binding)
+                if self.__frozen:
+                    data.freeze()
+            self.__sections[name] = data
+        return self.__sections[name]
+
+    def copy(self) -> 'NetworkDeviceSystemConfig':
+        """ Method to get a copy of the configuration that can be
+            changed without changing this configuration. The copy
+            is not frozen.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            NetworkDeviceSystemConfig
+                The copy, with the same versions and binding
+        """
+        return NetworkDeviceSystemConfig(
+            deepcopy(self.raw),
+            cfg_version=self.cfg_version,
+            known_cfgversion=self.known_cfgversion,
+            binding=self.binding)
+
+    def is_version(self,
+                   cfg_version: Optional[str],
+                   known_cfgversion: Optional[str]) -> bool:
+        """ Method to check if this configuration was retrieved
+            for the given configuration versions.
+
+            Parameters
+            ----------
+            cfg_version : Optional[str]
+                The configuration version to check
+
+            known_cfgversion : Optional[str]
+                The known configuration version to check
+
+            Returns
+            -------
+            bool
+                True if the versions match, False if they don't
+                or if the versions are unknown
+        """
+        if self.cfg_version is None:
+            return False
+        return (self.cfg_version == cfg_version and
+                self.known_cfgversion == known_cfgversion)
+
+    @property
+    def firewall(self) -> NetworkDeviceConfigFirewall:
+        """ The `firewall` section of the configuration """
+        return self.section('firewall')
+
+    @property
+    def interfaces(self) -> NetworkDeviceConfigInterfaces:
+        """ The `interfaces` section of the configuration """
+        return self.section('interfaces')
+
+    def keys(self) -> list[str]:
+        """ Method to get the names of all sections
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            list[str]
+                The names of the sections
+        """
+        return list(self.raw.keys())
+
+    def __getitem__(self, name: str) -> Any:
+        return self.section(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.raw
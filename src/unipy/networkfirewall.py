@@ -1,6 +1,11 @@
 """ Module that contains the class for firewall objects """
 
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from copy import deepcopy
+from heapq import merge
+from operator import attrgetter
+from typing import Any, Iterable, Optional
+from unipy.exceptions import FrozenObjectError
 from unipy.unipyapplication import UnipyApplication
 from unipy.unipyobject import UnipyObject, ObjectField
 
@@ -10,7 +15,7 @@ class NetworkFirewallGroup(UnipyObject):
 
     id = ObjectField(type=str, api_field='_id')
     name = ObjectField(type=str, api_field='name')
-    group_type = ObjectField(type=str, api_field='group_type')
+    group_type = ObjectField(type=str, api_field='group_type', intern=True)
     members = ObjectField(type=list, api_field='group_members')
 
     def __init__(self,
@@ -69,10 +74,10 @@ class NetworkFirewallRule(UnipyObject):
         type=list, api_field='dst_firewallgroup_ids', default=None)
     src_firewall_group_ids = ObjectField(
         type=list, api_field='src_firewallgroup_ids', default=None)
-    chain = ObjectField(type=str, api_field='ruleset')
+    chain = ObjectField(type=str, api_field='ruleset', intern=True)
     chain_index = ObjectField(type=int, api_field='rule_index')
     logging = ObjectField(type=bool, api_field='logging', default=False)
-    action = ObjectField(type=str, api_field='action')
+    action = ObjectField(type=str, api_field='action', intern=True)
 
     def __init__(self,
                  data: Optional[dict] = None,
@@ -90,3 +95,382 @@ class NetworkFirewallRule(UnipyObject):
             None
         """
         super().__init__(data, binding)
+
+
+class NetworkFirewallChains(dict):
+    """ Class that contains the firewall chains of a router, keyed
+        on the name of the chain, with the predefined and the
+        configured rules merged. The rules of every chain are kept
+        in order of `chain_index`, so rules can be added and
+        removed without sorting the chains again. A configured
+        rule replaces the predefined rule with the same index.
+
+        Frozen chains are shared between callers: the chains and
+        rules are frozen, the rules of a chain are a tuple and the
+        methods that change the chains raise a FrozenObjectError.
+        Use `copy()` to get chains that can be changed. """
+
+    def __init__(self) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        super().__init__()
+
+        # The `chain_index` of every rule per chain, in the same
+        # order as the rules; used to find the position for a rule
+        self.indexes: dict[str, list[int]] = dict()
+
+        # The predefined rules per chain, keyed on the index; also
+        # the ones that are replaced by a configured rule
+        self.predefined: dict[str, dict[int, NetworkFirewallRule]] = dict()
+
+        # True when the chains are shared and can't be changed
+        self.frozen = False
+
+    def check_mutable(self) -> None:
+        """ Method to raise a FrozenObjectError when the chains
+            are frozen """
+        if self.frozen:
+            raise FrozenObjectError(
+                'These chains are shared and can\'t be changed; change a copy from copy()')
+
+    def __setitem__(self, name: str, chain: NetworkFirewallChain) -> None:
+        self.check_mutable()
+        super().__setitem__(name, chain)
+
+    def __delitem__(self, name: str) -> None:
+        self.check_mutable()
+        super().__delitem__(name)
+
+    def pop(self, *args: Any) -> Any:
+        self.check_mutable()
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, NetworkFirewallChain]:
+        self.check_mutable()
+        return super().popitem()
+
+    def setdefault(self, *args: Any) -> Any:
+        self.check_mutable()
+        return super().setdefault(*args)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.check_mutable()
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.check_mutable()
+        super().clear()
+
+    def freeze(self) -> 'NetworkFirewallChains':
+        """ Method to make the chains read-only, because they are
+            shared between callers
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            NetworkFirewallChains
+                These chains
+        """
+        for chain in self.values():
+            if chain.rules is not None:
+                for rule in chain.rules:
+                    rule.freeze()
+                chain.rules = tuple(chain.rules)
+            chain.freeze()
+        for rules in self.predefined.values():
+            for rule in rules.values():
+                rule.freeze()
+        self.indexes = {name: tuple(indexes) for name, indexes in self.indexes.items()}
+        self.frozen = True
+        return self
+
+    @classmethod
+    def merge(cls,
+              chains: dict[str, dict],
+              configured: Iterable[NetworkFirewallRule]) -> 'NetworkFirewallChains':
+        """ Method to create the chains from the `firewall` section
+            of the system configuration and the configured rules
+
+            Parameters
+            ----------
+            chains : dict[str, dict]
+                The chains from the system configuration, keyed on
+                the name of the chain
+
+            configured : Iterable[NetworkFirewallRule]
+                The configured rules
+
+            Returns
+            -------
+            NetworkFirewallChains
+                The merged chains
+        """
+        merged = cls()
+        for name, data in chains.items():
+            chain = NetworkFirewallChain(data)
+            chain.name = name
+            merged[name] = chain
+            if 'rule' in data.keys():
+                chain.rules = list()
+                predefined = merged.predefined[name] = dict()
+                for index, details in data['rule'].items():
+                    rule = NetworkFirewallRule()
+                    rule.name = details['description']
+                    rule.enabled = True
+                    rule.chain = name
+                    rule.chain_index = int(index)
+                    rule.action = details['action']
+                    rule.is_predefined = True
+                    predefined[rule.chain_index] = rule
+
+        merged.replace_configured(configured)
+        return merged
+
+    def copy(self) -> 'NetworkFirewallChains':
+        """ Method to get a copy of the chains, with copies of the
+            rules, that can be changed without changing these
+            chains. The copy is not frozen.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            NetworkFirewallChains
+                The copy
+        """
+        # One memo, so a rule that is in a chain and in the
+        # predefined rules is copied once
+        memo: dict = dict()
+        copied = NetworkFirewallChains()
+        for name, chain in self.items():
+            copied_chain = deepcopy(chain, memo)
+            if copied_chain.rules is not None:
+                copied_chain.rules = list(copied_chain.rules)
+            copied[name] = copied_chain
+        copied.indexes = {name: list(indexes) for name, indexes in self.indexes.items()}
+        copied.predefined = deepcopy(self.predefined, memo)
+        return copied
+
+    def get_chain(self, name: str) -> NetworkFirewallChain:
+        """ Method to get a chain; creates a empty chain when it
+            does not exist """
+        chain = self.get(name)
+        if chain is None:
+            self.check_mutable()
+            chain = NetworkFirewallChain()
+            chain.name = name
+            self[name] = chain
+        return chain
+
+    def merge_chain(self,
+                    chain: NetworkFirewallChain,
+                    configured: Iterable[NetworkFirewallRule]) -> None:
+        """ Method to set the rules of a chain to its predefined
+            rules merged with the given configured rules. Both are
+            sorted once and merged in one pass.
+
+            Parameters
+            ----------
+            chain : NetworkFirewallChain
+                The chain to set the rules for
+
+            configured : Iterable[NetworkFirewallRule]
+                The configured rules for the chain
+
+            Returns
+            -------
+            None
+        """
+        self.check_mutable()
+        by_index = attrgetter('chain_index')
+        configured = sorted(configured, key=by_index)
+        replaced = {rule.chain_index for rule in configured}
+        predefined = [rule for index, rule in sorted(self.predefined.get(chain.name, {}).items())
+                      if index not in replaced]
+
+        if chain.rules is None and not configured:
+            self.indexes[chain.name] = list()
+            return
+        chain.rules = list(merge(predefined, configured, key=by_index))
+        self.indexes[chain.name] = [rule.chain_index for rule in chain.rules]
+
+    def replace_configured(self, configured: Iterable[NetworkFirewallRule]) -> None:
+        """ Method to replace all configured rules, keeping the
+            predefined rules
+
+            Parameters
+            ----------
+            configured : Iterable[NetworkFirewallRule]
+                The new configured rules
+
+            Returns
+            -------
+            None
+        """
+        self.check_mutable()
+        configured_rules: dict[str, list[NetworkFirewallRule]] = dict()
+        for rule in configured:
+            configured_rules.setdefault(rule.chain, list()).append(rule)
+        for name in configured_rules:
+            self.get_chain(name)
+        for name, chain in self.items():
+            self.merge_chain(chain, configured_rules.get(name, ()))
+
+    def detach_rule(self,
+                    chain_name: str,
+                    chain_index: int,
+                    predefined: bool) -> Optional[NetworkFirewallRule]:
+        """ Method to take a rule out of the ordered rules of a
+            chain
+
+            Parameters
+            ----------
+            chain_name : str
+                The name of the chain
+
+            chain_index : int
+                The index of the rule
+
+            predefined : bool
+                If True, the predefined rule is taken, otherwise
+                the configured rule
+
+            Returns
+            -------
+            NetworkFirewallRule
+                The rule that was taken out
+
+            None
+                No rule was found
+        """
+        self.check_mutable()
+        chain = self.get(chain_name)
+        indexes = self.indexes.get(chain_name)
+        if chain is None or not chain.rules or not indexes:
+            return None
+
+        position = bisect_left(indexes, chain_index)
+        while position < len(indexes) and indexes[position] == chain_index:
+            rule = chain.rules[position]
+            if rule.is_predefined == predefined:
+                del indexes[position]
+                del chain.rules[position]
+                return rule
+            position += 1
+        return None
+
+    def insert_rule(self, rule: NetworkFirewallRule) -> None:
+        """ Method to put a rule in the ordered rules of its chain,
+            after the rules with the same index """
+        self.check_mutable()
+        chain = self.get_chain(rule.chain)
+        if chain.rules is None:
+            chain.rules = list()
+        indexes = self.indexes.setdefault(rule.chain, list())
+        position = bisect_right(indexes, rule.chain_index)
+        indexes.insert(position, rule.chain_index)
+        chain.rules.insert(position, rule)
+
+    def add_rule(self, rule: NetworkFirewallRule) -> None:
+        """ Method to add a rule at the position for its index. A
+            configured rule replaces the predefined rule with the
+            same index.
+
+            Parameters
+            ----------
+            rule : NetworkFirewallRule
+                The rule to add
+
+            Returns
+            -------
+            None
+        """
+        self.check_mutable()
+        if rule.is_predefined:
+            self.predefined.setdefault(rule.chain, dict())[rule.chain_index] = rule
+            self.detach_rule(rule.chain, rule.chain_index, predefined=True)
+
+            # A configured rule with the same index replaces it
+            if any(not existing.is_predefined
+                   for existing in self.rules_at(rule.chain, rule.chain_index)):
+                return
+        else:
+            self.detach_rule(rule.chain, rule.chain_index, predefined=True)
+        self.insert_rule(rule)
+
+    def remove_rule(self,
+                    chain_name: str,
+                    chain_index: int,
+                    predefined: bool = False) -> Optional[NetworkFirewallRule]:
+        """ Method to remove a rule. When a configured rule is
+            removed, the predefined rule with the same index comes
+            back.
+
+            Parameters
+            ----------
+            chain_name : str
+                The name of the chain
+
+            chain_index : int
+                The index of the rule
+
+            predefined : bool = False
+                If True, the predefined rule is removed instead of
+                the configured rule
+
+            Returns
+            -------
+            NetworkFirewallRule
+                The removed rule
+
+            None
+                No rule was found
+        """
+        self.check_mutable()
+        if predefined:
+            self.predefined.get(chain_name, dict()).pop(chain_index, None)
+            return self.detach_rule(chain_name, chain_index, predefined=True)
+
+        rule = self.detach_rule(chain_name, chain_index, predefined=False)
+        if rule is not None and not self.rules_at(chain_name, chain_index):
+            restored = self.predefined.get(chain_name, dict()).get(chain_index)
+            if restored is not None:
+                self.insert_rule(restored)
+        return rule
+
+    def rules_at(self, chain_name: str, chain_index: int) -> list[NetworkFirewallRule]:
+        """ Method to get the rules of a chain with a index
+
+            Parameters
+            ----------
+            chain_name : str
+                The name of the chain
+
+            chain_index : int
+                The index of the rules
+
+            Returns
+            -------
+            list[NetworkFirewallRule]
+                The rules with the index
+        """
+        chain = self.get(chain_name)
+        indexes = self.indexes.get(chain_name)
+        if chain is None or not chain.rules or not indexes:
+            return list()
+        start = bisect_left(indexes, chain_index)
+        end = bisect_right(indexes, chain_index, lo=start)
+        return list(chain.rules[start:end])
@@ -15,10 +15,11 @@ class NetworkPortForward(UnipyObject):
     fwd_port = ObjectField(type=int, api_field='fwd_port', default=0)
     fwd = ObjectField(type=str, api_field='fwd', default=0)
     log = ObjectField(type=bool, api_field='log', default=False)
-    src = ObjectField(type=str, api_field='src')
-    proto = ObjectField(type=str, api_field='proto')
-    site_id = ObjectField(type=str, api_field='site_id')
-    pfwd_interface = ObjectField(type=str, api_field='pfwd_interface')
+    src = ObjectField(type=str, api_field='src', intern=True)
+    proto = ObjectField(type=str, api_field='proto', intern=True)
+    site_id = ObjectField(type=str, api_field='site_id', intern=True)
+    pfwd_interface = ObjectField(
+        type=str, api_field='pfwd_interface', intern=True)
     destination_ip = ObjectField(type=str, api_field='destination_ip')
 
     def __init__(self,
@@ -0,0 +1,405 @@
+""" Module that contains the classes to reconstruct the sessions
+    of network clients; when clients connect and disconnect, and
+    how long they stay on each access point """
+
+from collections import deque
+from sys import intern
+from threading import Lock
+from time import time
+from typing import Iterable, Optional
+from unipy.networkclient import NetworkClient
+
+
+class NetworkClientState:
+    """ Class that keeps the session state of one client. Only the
+        last `max_sessions` closed sessions are kept. """
+
+    __slots__ = ('mac', 'session_start', 'last_seen', 'uplink',
+                 'uplink_since', 'sessions', 'dwell', 'roams')
+
+    def __init__(self, mac: str, max_sessions: int) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the client
+
+            max_sessions : int
+                The number of closed sessions to keep
+
+            Returns
+            -------
+            None
+        """
+        self.mac = mac
+
+        # The open session; None when the client is disconnected
+        self.session_start: Optional[float] = None
+        self.last_seen = 0.0
+        self.uplink: Optional[str] = None
+        self.uplink_since = 0.0
+
+        # Closed sessions as (connect time, disconnect time)
+        self.sessions: deque[tuple[float, float]] = deque(maxlen=max_sessions)
+
+        # The seconds connected per uplink device, and the number
+        # of roams between uplink devices
+        self.dwell: dict[str, float] = dict()
+        self.roams = 0
+
+    @property
+    def connected(self) -> bool:
+        """ True if the client has a open session """
+        return self.session_start is not None
+
+
+class NetworkClientSessions:
+    """ Class that reconstructs client sessions from repeated
+        polls of the active clients and from the client history.
+        The state is updated incrementally with every poll. Window
+        queries use per-hour buckets, so they don't need the raw
+        polls. The memory use is bounded: closed sessions per
+        client are limited, hour buckets and clients that were not
+        seen are removed after the retention time. """
+
+    def __init__(self,
+                 bucket_size: float = 3600.0,
+                 retention: float = 14 * 24 * 3600.0,
+                 max_sessions: int = 32) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            bucket_size : float = 3600.0
+                The seconds per bucket for the window queries
+
+            retention : float = 14 days
+                The seconds to keep buckets and clients that are
+                not seen anymore
+
+            max_sessions : int = 32
+                The number of closed sessions to keep per client
+
+            Returns
+            -------
+            None
+        """
+        self.bucket_size = bucket_size
+        self.retention = retention
+        self.max_sessions = max_sessions
+        self.lock = Lock()
+        self.clients: dict[str, NetworkClientState] = dict()
+
+        # bucket start -> uplink MAC -> MAC addresses of the clients
+        # that were connected to the uplink in the bucket
+        self.presence: dict[float, dict[str, set[str]]] = dict()
+
+        # bucket start -> [connects, disconnects, roams]
+        self.events: dict[float, list[int]] = dict()
+
+    def bucket(self, timestamp: float) -> float:
+        """ Method to get the start of the bucket for a time """
+        return timestamp - (timestamp % self.bucket_size)
+
+    def count_event(self, timestamp: float, event: int) -> None:
+        """ Method to count a connect (0), disconnect (1) or roam (2)
+            in the bucket for the time """
+        counts = self.events.get(self.bucket(timestamp))
+        if counts is None:
+            counts = self.events[self.bucket(timestamp)] = [0, 0, 0]
+        counts[event] += 1
+
+    def get_state(self, mac: str) -> NetworkClientState:
+        """ Method to get the state for a client; creates it when
+            the client is new """
+        state = self.clients.get(mac)
+        if state is None:
+            state = NetworkClientState(intern(mac), self.max_sessions)
+            self.clients[state.mac] = state
+        return state
+
+    def close_session(self, state: NetworkClientState, timestamp: float) -> None:
+        """ Method to close the open session of a client
+
+            Parameters
+            ----------
+            state : NetworkClientState
+                The state of the client
+
+            timestamp : float
+                The time the client disconnected
+
+            Returns
+            -------
+            None
+        """
+        if state.session_start is None:
+            return
+        timestamp = max(timestamp, state.session_start)
+        if state.uplink is not None:
+            state.dwell[state.uplink] = (
+                state.dwell.get(state.uplink, 0.0) +
+                max(0.0, timestamp - state.uplink_since))
+        state.sessions.append((state.session_start, timestamp))
+        state.session_start = None
+        state.uplink = None
+        self.count_event(timestamp, 1)
+
+    def observe(self,
+                clients: Iterable[NetworkClient],
+                timestamp: Optional[float] = None) -> None:
+        """ Method to add a poll of the active clients, for example
+            the result of `UnipyNetwork.get_active_clients`. Clients
+            that were connected in the previous poll but are missing
+            now are disconnected at the time they were last seen.
+
+            Parameters
+            ----------
+            clients : Iterable[NetworkClient]
+                The active clients
+
+            timestamp : Optional[float]
+                The time of the poll. If not given, the current
+                time is used.
+
+            Returns
+            -------
+            None
+        """
+        if timestamp is None:
+            timestamp = time()
+        bucket = self.bucket(timestamp)
+
+        with self.lock:
+            presence = self.presence.get(bucket)
+            if presence is None:
+                presence = self.presence[bucket] = dict()
+
+            seen = set()
+            for client in clients:
+                mac = client.mac_address
+                if not mac:
+                    continue
+                seen.add(mac)
+                state = self.get_state(mac)
+                uplink = client.get_uplink_mac()
+                if uplink is not None:
+                    uplink = intern(uplink)
+
+                if state.session_start is None:
+                    # New session; use the uptime of the client for
+                    # the connect time when it is known
+                    uptime = getattr(client, 'uptime', None)
+                    start = timestamp - uptime if uptime else timestamp
+                    if state.sessions:
+                        start = max(start, state.sessions[-1][1])
+                    state.session_start = start
+                    state.uplink = uplink
+                    state.uplink_since = start
+                    self.count_event(start, 0)
+                elif uplink != state.uplink:
+                    # Roamed to another uplink device
+                    if state.uplink is not None:
+                        state.dwell[state.uplink] = (
+                            state.dwell.get(state.uplink, 0.0) +
+                            max(0.0, timestamp - state.uplink_since))
+                    state.uplink = uplink
+                    state.uplink_since = timestamp
+                    state.roams += 1
+                    self.count_event(timestamp, 2)
+
+                state.last_seen = timestamp
+                if uplink is not None:
+                    members = presence.get(uplink)
+                    if members is None:
+                        members = presence[uplink] = set()
+                    members.add(state.mac)
+
+            # Clients that disappeared are disconnected
+            for mac, state in self.clients.items():
+                if state.session_start is not None and mac not in seen:
+                    self.close_session(state, state.last_seen)
+
+            self.expire(timestamp)
+
+    def observe_history(self,
+                        clients: Iterable[NetworkClient],
+                        timestamp: Optional[float] = None) -> None:
+        """ Method to add the client history, for example the result
+            of `UnipyNetwork.get_inactive_clients`. The `last_seen`
+            of the clients is used as the disconnect time. Clients
+            that were never polled get a session from `last_seen`
+            without a known connect time, so only the disconnect is
+            added. Open sessions are left to the polls, unless the
+            client was last seen before the last poll that listed
+            it.
+
+            Parameters
+            ----------
+            clients : Iterable[NetworkClient]
+                The inactive clients
+
+            timestamp : Optional[float]
+                The current time, used to skip clients that are
+                older than the retention
+
+            Returns
+            -------
+            None
+        """
+        if timestamp is None:
+            timestamp = time()
+
+        with self.lock:
+            for client in clients:
+                mac = client.mac_address
+                last_seen = client.last_seen
+                if not mac or not last_seen or timestamp - last_seen > self.retention:
+                    continue
+                state = self.get_state(mac)
+                if state.session_start is not None:
+                    # The history also lists connected clients, so
+                    # a open session is only closed when the client
+                    # was last seen before the last poll that listed
+                    # it; the list of active clients lags behind
+                    if state.session_start <= last_seen < state.last_seen:
+                        self.close_session(state, last_seen)
+                    continue
+                if not state.sessions or state.sessions[-1][1] < last_seen:
+                    start = client.first_seen or last_seen
+                    if state.sessions:
+                        start = max(start, state.sessions[-1][1])
+                    state.sessions.append((start, last_seen))
+                    self.count_event(last_seen, 1)
+                state.last_seen = max(state.last_seen, last_seen)
+
+    def expire(self, timestamp: float) -> None:
+        """ Method to remove buckets and disconnected clients that
+            are older than the retention. Is called by `observe`.
+
+            Parameters
+            ----------
+            timestamp : float
+                The current time
+
+            Returns
+            -------
+            None
+        """
+        oldest = self.bucket(timestamp - self.retention)
+        for buckets in (self.presence, self.events):
+            for start in [start for start in buckets if start < oldest]:
+                del buckets[start]
+
+        expired = [mac for mac, state in self.clients.items()
+                   if state.session_start is None and
+                   timestamp - state.last_seen > self.retention]
+        for mac in expired:
+            del self.clients[mac]
+
+    def clients_per_uplink(self,
+                           start: float,
+                           end: float) -> dict[float, dict[str, int]]:
+        """ Method to get the number of distinct clients per uplink
+            device per bucket, for example per access point per
+            hour
+
+            Parameters
+            ----------
+            start : float
+                The start of the window
+
+            end : float
+                The end of the window
+
+            Returns
+            -------
+            dict[float, dict[str, int]]
+                The number of clients per uplink MAC address, keyed
+                on the start of the bucket
+        """
+        first = self.bucket(start)
+        with self.lock:
+            return {bucket: {uplink: len(members) for uplink, members in presence.items()}
+                    for bucket, presence in sorted(self.presence.items())
+                    if first <= bucket < end}
+
+    def event_counts(self, start: float, end: float) -> dict[float, dict[str, int]]:
+        """ Method to get the number of connects, disconnects and
+            roams per bucket
+
+            Parameters
+            ----------
+            start : float
+                The start of the window
+
+            end : float
+                The end of the window
+
+            Returns
+            -------
+            dict[float, dict[str, int]]
+                The counts, keyed on the start of the bucket
+        """
+        first = self.bucket(start)
+        with self.lock:
+            return {bucket: {'connects': counts[0], 'disconnects': counts[1],
+                             'roams': counts[2]}
+                    for bucket, counts in sorted(self.events.items())
+                    if first <= bucket < end}
+
+    def sessions(self, mac: str) -> list[tuple[float, Optional[float]]]:
+        """ Method to get the sessions of a client
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the client
+
+            Returns
+            -------
+            list[tuple[float, Optional[float]]]
+                The connect and disconnect time of the kept
+                sessions. The disconnect time of a open session is
+                None.
+        """
+        with self.lock:
+            state = self.clients.get(mac)
+            if state is None:
+                return list()
+            sessions: list[tuple[float, Optional[float]]] = list(state.sessions)
+            if state.session_start is not None:
+                sessions.append((state.session_start, None))
+            return sessions
+
+    def dwell_times(self, mac: str) -> dict[str, float]:
+        """ Method to get the seconds a client was connected to each
+            uplink device, including the open session
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the client
+
+            Returns
+            -------
+            dict[str, float]
+                The seconds per uplink MAC address
+        """
+        with self.lock:
+            state = self.clients.get(mac)
+            if state is None:
+                return dict()
+            dwell = dict(state.dwell)
+            if state.session_start is not None and state.uplink is not None:
+                dwell[state.uplink] = (
+                    dwell.get(state.uplink, 0.0) +
+                    max(0.0, state.last_seen - state.uplink_since))
+            return dwell
+
+    def roams(self, mac: str) -> int:
+        """ Method to get the number of roams of a client """
+        with self.lock:
+            state = self.clients.get(mac)
+            return state.roams if state else 0
@@ -12,7 +12,7 @@ class NetworkSite(UnipyObject):
     anonymous_id = ObjectField(type=str, api_field='anonymous_id')
     name = ObjectField(type=str, api_field='name')
     description = ObjectField(type=str, api_field='desc')
-    role = ObjectField(type=str, api_field='role')
+    role = ObjectField(type=str, api_field='role', intern=True)
     hidden_id = ObjectField(type=str, api_field='attr_hidden_id')
 
     def __init__(self,
@@ -11,9 +11,9 @@ class NetworkSSID(UnipyObject):
     id = ObjectField(type=str, api_field='_id')
     enabled = ObjectField(type=bool, api_field='enabled', default=False)
     name = ObjectField(type=str, api_field='name')
-    security = ObjectField(type=str, api_field='security')
-    wpa_mode = ObjectField(type=str, api_field='wpa_mode')
-    wpa_enc = ObjectField(type=str, api_field='wpa_enc')
+    security = ObjectField(type=str, api_field='security', intern=True)
+    wpa_mode = ObjectField(type=str, api_field='wpa_mode', intern=True)
+    wpa_enc = ObjectField(type=str, api_field='wpa_enc', intern=True)
     passphrase = ObjectField(type=str, api_field='x_passphrase')
 
     def __init__(self,
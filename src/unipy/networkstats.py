@@ -0,0 +1,388 @@
+""" Module that contains the classes to sample statistics of
+    network devices over time """
+
+from array import array
+from logging import getLogger
+from threading import Event, Lock, Thread
+from time import time
+from typing import Callable, Iterable, Optional
+from unipy.networkdevice import NetworkDevice
+
+# The seconds the startup time of a device can move between samples
+# without being a restart. The controller computes the startup time
+# from the uptime, so it jitters by a second or so.
+STARTUP_TOLERANCE = 5
+
+
+class NetworkCounterRing:
+    """ Class that stores samples of the counters of one device in
+        fixed-size ring buffers. The memory for the buffers is
+        allocated once, so the memory use does not grow. """
+
+    def __init__(self, size: int) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            size : int
+                The number of samples to keep
+
+            Returns
+            -------
+            None
+        """
+        self.size = size
+        self.count = 0
+        self.position = 0
+
+        # Raw samples
+        self.timestamps = array('d', bytes(8 * size))
+        self.tx_bytes = array('q', bytes(8 * size))
+        self.rx_bytes = array('q', bytes(8 * size))
+        self.uptime = array('q', bytes(8 * size))
+        self.startup_timestamp = array('q', bytes(8 * size))
+
+        # Rates for the interval that ends with the sample, in
+        # bytes per second
+        self.tx_rate = array('d', bytes(8 * size))
+        self.rx_rate = array('d', bytes(8 * size))
+
+    def add(self,
+            timestamp: float,
+            tx_bytes: int,
+            rx_bytes: int,
+            uptime: int,
+            startup_timestamp: int) -> None:
+        """ Method to add a sample and compute the rates since the
+            previous sample. When the device restarted, the
+            counters started again at zero, so the rate is
+            computed from zero for the time the device is up. A
+            restart is detected from a lower uptime, lower
+            counters or a startup time that moved more than
+            `STARTUP_TOLERANCE` seconds.
+
+            Parameters
+            ----------
+            timestamp : float
+                The time of the sample
+
+            tx_bytes : int
+                The transmitted bytes counter
+
+            rx_bytes : int
+                The received bytes counter
+
+            uptime : int
+                The uptime of the device in seconds
+
+            startup_timestamp : int
+                The time the device started
+
+            Returns
+            -------
+            None
+        """
+        tx_rate = 0.0
+        rx_rate = 0.0
+
+        if self.count:
+            last = (self.position - 1) % self.size
+            interval = timestamp - self.timestamps[last]
+            previous_tx = self.tx_bytes[last]
+            previous_rx = self.rx_bytes[last]
+
+            # Detect a counter reset
+            if (uptime < self.uptime[last] or
+                    abs(startup_timestamp - self.startup_timestamp[last]) > STARTUP_TOLERANCE or
+                    tx_bytes < previous_tx or
+                    rx_bytes < previous_rx):
+                previous_tx = 0
+                previous_rx = 0
+                if 0 < uptime < interval:
+                    interval = uptime
+
+            if interval > 0:
+                tx_rate = (tx_bytes - previous_tx) / interval
+                rx_rate = (rx_bytes - previous_rx) / interval
+
+        position = self.position
+        self.timestamps[position] = timestamp
+        self.tx_bytes[position] = tx_bytes
+        self.rx_bytes[position] = rx_bytes
+        self.uptime[position] = uptime
+        self.startup_timestamp[position] = startup_timestamp
+        self.tx_rate[position] = tx_rate
+        self.rx_rate[position] = rx_rate
+
+        self.position = (position + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def indexes(self) -> range:
+        """ Method to get the indexes of the samples, from old to
+            new. Use them modulo `size`.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            range
+                The indexes of the samples
+        """
+        start = self.position - self.count
+        return range(start, self.position)
+
+    def rates(self) -> list[tuple[float, float, float]]:
+        """ Method to get the rates for all intervals in the buffer
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            list[tuple[float, float, float]]
+                The timestamp, transmit rate and receive rate for
+                each interval, from old to new
+        """
+        # The first sample has no previous sample to compute a
+        # rate with
+        indexes = self.indexes()[1:] if self.count < self.size else self.indexes()
+        return [(self.timestamps[index % self.size],
+                 self.tx_rate[index % self.size],
+                 self.rx_rate[index % self.size]) for index in indexes]
+
+
+class NetworkDeviceStatsSampler:
+    """ Class that samples the counters of network devices on a
+        schedule and computes rates and aggregates from them. The
+        samples are kept in a ring buffer per device. """
+
+    def __init__(self,
+                 source: Callable[[], Iterable[NetworkDevice]],
+                 interval: float = 30.0,
+                 size: int = 2880) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            source : Callable[[], Iterable[NetworkDevice]]
+                Function that returns the devices to sample, for
+                example `UnipyNetwork.get_devices`
+
+            interval : float = 30.0
+                The seconds between samples
+
+            size : int = 2880
+                The number of samples to keep per device. With the
+                default interval, this is one day.
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger('NetworkDeviceStatsSampler')
+        self.source = source
+        self.interval = interval
+        self.size = size
+        self.rings: dict[str, NetworkCounterRing] = dict()
+        self.lock = Lock()
+
+        # State of the background thread
+        self.stopped = Event()
+        self.thread: Optional[Thread] = None
+
+    def sample(self, timestamp: Optional[float] = None) -> None:
+        """ Method to take one sample of all devices
+
+            Parameters
+            ----------
+            timestamp : Optional[float]
+                The time of the sample. If not given, the current
+                time is used.
+
+            Returns
+            -------
+            None
+        """
+        devices = self.source()
+        if timestamp is None:
+            timestamp = time()
+        self.add_devices(devices, timestamp)
+
+    def add_devices(self,
+                    devices: Iterable[NetworkDevice],
+                    timestamp: float) -> None:
+        """ Method to add the counters of already retrieved devices
+
+            Parameters
+            ----------
+            devices : Iterable[NetworkDevice]
+                The devices to add
+
+            timestamp : float
+                The time the devices were retrieved
+
+            Returns
+            -------
+            None
+        """
+        with self.lock:
+            for device in devices:
+                ring = self.rings.get(device.mac_address)
+                if ring is None:
+                    ring = NetworkCounterRing(self.size)
+                    self.rings[device.mac_address] = ring
+                ring.add(
+                    timestamp=timestamp,
+                    tx_bytes=device.tx_bytes or 0,
+                    rx_bytes=device.rx_bytes or 0,
+                    uptime=device.uptime or 0,
+                    startup_timestamp=device.startup_timestamp or 0)
+
+    def start(self) -> None:
+        """ Method to start sampling in a background thread
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = Thread(
+            target=self.run, name='NetworkDeviceStatsSampler', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ Method to stop sampling
+
+            Parameters
+            ----------
+            timeout : Optional[float]
+                Seconds to wait for the background thread
+
+            Returns
+            -------
+            None
+        """
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def run(self) -> None:
+        """ Method that samples until the sampler is stopped. Is
+            started by `start`.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        next_sample = time()
+        while not self.stopped.is_set():
+            try:
+                self.sample()
+            except Exception as error:
+                self.logger.warning(f'Sampling failed: {error}')
+
+            # Keep the schedule; skip samples that are missed
+            next_sample += self.interval
+            now = time()
+            if next_sample < now:
+                next_sample = now + self.interval
+            self.stopped.wait(next_sample - now)
+
+    def rates(self, device_mac: str) -> list[tuple[float, float, float]]:
+        """ Method to get the rates for a device
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            list[tuple[float, float, float]]
+                The timestamp, transmit rate and receive rate in
+                bytes per second for each interval
+        """
+        with self.lock:
+            ring = self.rings.get(device_mac)
+            return ring.rates() if ring else list()
+
+    def aggregate(self,
+                  device_mac: str,
+                  window: float) -> list[dict[str, float]]:
+        """ Method to get the minimum, average and maximum rates per
+            time window for a device
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            window : float
+                The size of the windows in seconds
+
+            Returns
+            -------
+            list[dict[str, float]]
+                A dict for each window with the start of the window
+                and the min, avg and max of the transmit and
+                receive rates
+        """
+        aggregates: list[dict[str, float]] = list()
+        current: Optional[dict[str, float]] = None
+        samples = 0
+
+        for timestamp, tx_rate, rx_rate in self.rates(device_mac):
+            start = timestamp - (timestamp % window)
+            if current is None or current['start'] != start:
+                if current:
+                    current['tx_avg'] /= samples
+                    current['rx_avg'] /= samples
+                current = {
+                    'start': start,
+                    'tx_min': tx_rate, 'tx_avg': 0.0, 'tx_max': tx_rate,
+                    'rx_min': rx_rate, 'rx_avg': 0.0, 'rx_max': rx_rate
+                }
+                aggregates.append(current)
+                samples = 0
+
+            current['tx_min'] = min(current['tx_min'], tx_rate)
+            current['tx_max'] = max(current['tx_max'], tx_rate)
+            current['tx_avg'] += tx_rate
+            current['rx_min'] = min(current['rx_min'], rx_rate)
+            current['rx_max'] = max(current['rx_max'], rx_rate)
+            current['rx_avg'] += rx_rate
+            samples += 1
+
+        if current:
+            current['tx_avg'] /= samples
+            current['rx_avg'] /= samples
+
+        return aggregates
+
+    def forget(self, device_mac: str) -> None:
+        """ Method to remove the samples for a device
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            None
+        """
+        with self.lock:
+            self.rings.pop(device_mac, None)
@@ -0,0 +1,310 @@
+""" Module that contains the classes for the topology of the
+    network; how devices and clients are connected to each
+    other """
+
+from typing import Iterable, Optional
+from unipy.networkclient import NetworkClient
+from unipy.networkdevice import NetworkDevice
+
+
+class NetworkTopologyNode:
+    """ Class that represents a device in the topology """
+
+    __slots__ = ('mac', 'device', 'parent', 'children', 'clients',
+                 'client_count')
+
+    def __init__(self, mac: str, device: Optional[NetworkDevice] = None) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the device
+
+            device : Optional[NetworkDevice]
+                The device object
+
+            Returns
+            -------
+            None
+        """
+        self.mac = mac
+        self.device = device
+        self.parent: Optional[NetworkTopologyNode] = None
+        self.children: dict[str, NetworkTopologyNode] = dict()
+        self.clients: dict[str, NetworkClient] = dict()
+
+        # The number of clients connected to this device and all
+        # devices below it
+        self.client_count = 0
+
+
+class NetworkTopology:
+    """ Class that keeps the topology of the network; the gateway,
+        the devices connected to it and the clients connected to
+        the devices. The number of clients below each device is
+        kept up-to-date when the topology changes, so it can be
+        requested without walking the topology. """
+
+    def __init__(self) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.nodes: dict[str, NetworkTopologyNode] = dict()
+        self.clients: dict[str, NetworkClient] = dict()
+
+        # The device each client is connected to
+        self.client_uplinks: dict[str, str] = dict()
+
+    @classmethod
+    def build(cls,
+              devices: Iterable[NetworkDevice],
+              clients: Iterable[NetworkClient]) -> 'NetworkTopology':
+        """ Method to create a topology from the results of
+            `get_devices` and `get_active_clients`
+
+            Parameters
+            ----------
+            devices : Iterable[NetworkDevice]
+                The network devices
+
+            clients : Iterable[NetworkClient]
+                The network clients
+
+            Returns
+            -------
+            NetworkTopology
+                The created topology
+        """
+        topology = cls()
+        for device in devices:
+            topology.add_device(device)
+        for client in clients:
+            topology.add_client(client)
+        return topology
+
+    def get_node(self, mac: str) -> NetworkTopologyNode:
+        """ Method to get the node for a device. Creates a empty
+            node if the device is not known yet.
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            NetworkTopologyNode
+                The node for the device
+        """
+        node = self.nodes.get(mac)
+        if node is None:
+            node = NetworkTopologyNode(mac)
+            self.nodes[mac] = node
+        return node
+
+    def update_counts(self, node: Optional[NetworkTopologyNode], change: int) -> None:
+        """ Method to change the client count for a device and all
+            devices above it
+
+            Parameters
+            ----------
+            node : Optional[NetworkTopologyNode]
+                The node to start at
+
+            change : int
+                The number to add to the counts
+
+            Returns
+            -------
+            None
+        """
+        seen = set()
+        while node is not None and node.mac not in seen:
+            seen.add(node.mac)
+            node.client_count += change
+            node = node.parent
+
+    def add_device(self, device: NetworkDevice) -> None:
+        """ Method to add a device to the topology, or to update the
+            position of a device that is already in the topology
+
+            Parameters
+            ----------
+            device : NetworkDevice
+                The device to add
+
+            Returns
+            -------
+            None
+        """
+        node = self.get_node(device.mac_address)
+        node.device = device
+
+        uplink_mac = device.get_uplink_mac()
+        if node.parent and node.parent.mac == uplink_mac:
+            return
+
+        # Detach the device from the old uplink
+        if node.parent:
+            self.update_counts(node.parent, -node.client_count)
+            node.parent.children.pop(node.mac, None)
+            node.parent = None
+
+        # Attach it to the new uplink
+        if uplink_mac and uplink_mac != node.mac:
+            parent = self.get_node(uplink_mac)
+            parent.children[node.mac] = node
+            node.parent = parent
+            self.update_counts(parent, node.client_count)
+
+    def add_client(self, client: NetworkClient) -> None:
+        """ Method to add a client to the topology. If the client is
+            already in the topology, it is moved to its current
+            uplink device.
+
+            Parameters
+            ----------
+            client : NetworkClient
+                The client to add
+
+            Returns
+            -------
+            None
+        """
+        self.move_client(client, client.get_uplink_mac())
+
+    def move_client(self, client: NetworkClient, uplink_mac: Optional[str]) -> None:
+        """ Method to move a client to another device, for example
+            when the client roams to another access point
+
+            Parameters
+            ----------
+            client : NetworkClient
+                The client to move
+
+            uplink_mac : Optional[str]
+                The MAC address of the new uplink device
+
+            Returns
+            -------
+            None
+        """
+        mac = client.mac_address
+        old_uplink = self.client_uplinks.get(mac)
+        if old_uplink is not None and old_uplink != uplink_mac:
+            old_node = self.nodes[old_uplink]
+            old_node.clients.pop(mac, None)
+            self.update_counts(old_node, -1)
+
+        self.clients[mac] = client
+        if uplink_mac is None:
+            self.client_uplinks.pop(mac, None)
+            return
+
+        node = self.get_node(uplink_mac)
+        node.clients[mac] = client
+        if old_uplink != uplink_mac:
+            self.update_counts(node, 1)
+        self.client_uplinks[mac] = uplink_mac
+
+    def remove_client(self, client_mac: str) -> None:
+        """ Method to remove a client from the topology
+
+            Parameters
+            ----------
+            client_mac : str
+                The MAC address of the client
+
+            Returns
+            -------
+            None
+        """
+        self.clients.pop(client_mac, None)
+        uplink_mac = self.client_uplinks.pop(client_mac, None)
+        if uplink_mac is not None:
+            node = self.nodes[uplink_mac]
+            node.clients.pop(client_mac, None)
+            self.update_counts(node, -1)
+
+    def gateways(self) -> list[NetworkTopologyNode]:
+        """ Method to get the devices that have no uplink device
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            list[NetworkTopologyNode]
+                The nodes of the devices at the top
+        """
+        return [node for node in self.nodes.values()
+                if node.parent is None and node.device is not None]
+
+    def clients_behind(self, device_mac: str) -> list[NetworkClient]:
+        """ Method to get the clients that are directly connected
+            to a device
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            list[NetworkClient]
+                The clients connected to the device
+        """
+        node = self.nodes.get(device_mac)
+        return list(node.clients.values()) if node else list()
+
+    def client_count(self, device_mac: str) -> int:
+        """ Method to get the number of clients connected to a
+            device and all devices below it
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            int
+                The number of clients
+        """
+        node = self.nodes.get(device_mac)
+        return node.client_count if node else 0
+
+    def path_to_gateway(self, mac: str) -> list[str]:
+        """ Method to get the devices between a device or client and
+            the gateway
+
+            Parameters
+            ----------
+            mac : str
+                The MAC address of the device or client
+
+            Returns
+            -------
+            list[str]
+                The MAC addresses of the devices, starting with the
+                device itself or the uplink of the client, and
+                ending with the gateway
+        """
+        if mac in self.client_uplinks:
+            mac = self.client_uplinks[mac]
+
+        path: list[str] = list()
+        node = self.nodes.get(mac)
+        while node is not None and node.mac not in path:
+            path.append(node.mac)
+            node = node.parent
+        return path
@@ -58,6 +58,11 @@ class Unipy:
             Returns
             -------
             None
+
+            Raises
+            ------
+            PermissionDeniedError
+                The username or password is not accepted
         """
         return self.connection.login()
 
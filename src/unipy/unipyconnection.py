@@ -1,10 +1,18 @@
 """ Module that contains the class to connect to Unifi """
 
 from requests import Request, Response, Session
-from requests.exceptions import Timeout, ConnectionError
+from requests.exceptions import ChunkedEncodingError, ConnectionError, SSLError, Timeout
 import urllib3
-from typing import Optional
-from unipy.exceptions import PermissionDeniedError
+from threading import BoundedSemaphore, Lock, RLock
+from time import perf_counter
+from typing import Any, Optional, Union
+from unipy.exceptions import (CircuitOpenError, PermissionDeniedError, RateLimitedError,
+                              RequestTimeoutError, ServerError, ServerUnreachableError)
+from unipy.unipydecoder import UnipyDecoder, get_decoder
+from unipy.unipylimits import get_circuit_breaker, get_rate_limiter
+from unipy.unipyprofile import phase, record
+from unipy.unipysingleflight import UnipySingleFlight
+from unipy.unipytransport import UnipyTransport, accept_encoding
 from logging import getLogger
 
 
@@ -16,7 +24,18 @@ class UnipyConnection:
                  server: str,
                  username: str,
                  password: str,
-                 verify: bool = True) -> None:
+                 verify: bool = True,
+                 decoder: Union[str, UnipyDecoder, None] = None,
+                 max_in_flight: int = 16,
+                 timeout: Optional[float] = 30.0,
+                 rate_limit: Optional[float] = None,
+                 burst: int = 10,
+                 failure_threshold: int = 5,
+                 cooldown: float = 30.0,
+                 coalesce_gets: bool = True,
+                 transport: Optional[UnipyTransport] = None,
+                 compression: bool = True,
+                 max_body_size: Optional[int] = None) -> None:
         """ The initiator sets the values for the object
 
             Parameters
@@ -33,6 +52,58 @@ class UnipyConnection:
             verify : bool = False
                 If True, the UnifiOS certificate will be verified
 
+            decoder : Union[str, UnipyDecoder, None] = None
+                The JSON decoder for responses, or the name of it.
+                If not given, the fastest installed decoder is used.
+
+            max_in_flight : int = 16
+                The maximum number of requests that are executed at
+                the same time with this connection
+
+            timeout : Optional[float] = 30.0
+                The seconds to wait for the server. Also the maximum
+                time a request waits for the rate limiter.
+
+            rate_limit : Optional[float]
+                The maximum number of requests per second to the
+                server. If not given, the rate is not limited. The
+                rate limiter and the circuit breaker are shared
+                with other connections to the same server with the
+                same settings.
+
+            burst : int = 10
+                The number of requests that can be done at once
+                before the rate limit applies
+
+            failure_threshold : int = 5
+                The number of timeouts or server errors in a row
+                after which requests to the server fail directly
+
+            cooldown : float = 30.0
+                The seconds before a request to a failing server
+                is tried again
+
+            coalesce_gets : bool = True
+                If True, identical GET requests that are done at the
+                same time share one request and one decoded body.
+                The decoded body is shared, so it should not be
+                changed.
+
+            transport : Optional[UnipyTransport]
+                The transport to send the requests with. Use a
+                `UnipyRecordingTransport` to record the traffic,
+                or a `UnipyReplayTransport` to replay it.
+
+            compression : bool = True
+                If True, the server is asked to compress the
+                responses with the best supported algorithm
+
+            max_body_size : Optional[int]
+                The maximum size of a decompressed response body
+                in bytes. Also applies to a given transport. If not
+                given, the size is not limited, or the limit of the
+                given transport is used.
+
             Returns
             -------
             None
@@ -46,24 +117,74 @@ class UnipyConnection:
         self.password = password
         self.server = server
         self.verify = verify
+        self.decoder = get_decoder(decoder)
+        self.timeout = timeout
+
+        # The rate limiter and circuit breaker are shared by all
+        # connections to the same server with the same settings
+        self.rate_limiter = (
+            get_rate_limiter(server, rate_limit, burst) if rate_limit else None)
+        self.circuit_breaker = get_circuit_breaker(
+            server, failure_threshold, cooldown)
 
         # Create a requests session object. This can e used to
         # execute API requests and keep the given headers
         self.session = Session()
         self.session.verify = verify
+        self.transport = transport or UnipyTransport(max_body_size)
+        if transport is not None and max_body_size is not None:
+            transport.max_body_size = max_body_size
+        self.session.headers['Accept-Encoding'] = (
+            accept_encoding() if compression else 'identity')
 
         # Disable warning about unverified HTTPs certificates
         if not verify:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        # Not logged in yet
+        # Not logged in yet. The authentication state is protected
+        # by a lock, so the connection can be shared by threads.
+        # The CSRF token is added to each request, instead of to
+        # the headers of the shared session.
+        self.auth_lock = RLock()
         self.logged_in = False
+        self.csrf_token: Optional[str] = None
+        self.auth_generation = 0
+
+        # Limit the number of requests at the same time
+        self.in_flight = BoundedSemaphore(max_in_flight)
+        self.stats_lock = Lock()
+
+        # Identical GET requests that are in flight at the same
+        # time are coalesced
+        self.coalesce_gets = coalesce_gets
+        self.gets_in_flight = UnipySingleFlight()
+
+        # Latency of the requests in seconds. `latency` is a moving
+        # average, `latency_baseline` follows the lowest average
+        # and slowly moves up with `baseline_smoothing`, so a
+        # controller that stays slower becomes the new normal.
+        # The same is kept per endpoint in `endpoint_latency`, as
+        # [average, baseline], because endpoints differ a lot in
+        # duration.
+        self.latency: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.latency_smoothing = 0.2
+        self.baseline_smoothing = 0.01
+        self.endpoint_latency: dict[str, list[float]] = dict()
+        self.max_endpoints = 256
+
+        # The size of the response bodies; on the wire and after
+        # decompression
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
 
     def request(self,
                 method: str,
                 endpoint: str,
-                data: Optional[dict] = None) -> Response:
-        """ Method to execute a API request
+                data: Optional[dict] = None,
+                retry: bool = True) -> Response:
+        """ Method to execute a API request. Identical GET requests
+            that are done at the same time share one response.
 
             Parameters
             ----------
@@ -76,39 +197,337 @@ class UnipyConnection:
             data : dict = None
                 The data to send to the API
 
+            retry : bool = True
+                If True, the request is retried once after a new
+                login when the session expired
+
             Returns
             -------
             Response
                 The response object from the requests library
         """
 
-        # Compile the URL
+        if method == 'GET' and retry and self.coalesce_gets:
+            return self.gets_in_flight.do(
+                endpoint, lambda: self.send(method, endpoint, data, retry))
+        return self.send(method, endpoint, data, retry)
+
+    def send(self,
+             method: str,
+             endpoint: str,
+             data: Optional[dict] = None,
+             retry: bool = True) -> Response:
+        """ Method to send a API request to the server. Use
+            `request` to execute requests; this method does not
+            coalesce identical requests.
+
+            Parameters
+            ----------
+            method : str
+                The HTTP method to use
+
+            endpoint : str
+                The endpoint to execute
+
+            data : dict = None
+                The data to send to the API
+
+            retry : bool = True
+                If True, the request is retried once after a new
+                login when the session expired
+
+            Returns
+            -------
+            Response
+                The response object from the requests library
+        """
+
+        # Compile the URL and add the CSRF token for this request
         url = f'https://{self.server}/{endpoint}'
+        headers = dict()
+        csrf_token = self.csrf_token
+        if csrf_token:
+            headers['X-CSRF-Token'] = csrf_token
+        generation = self.auth_generation
         request = Request(
             method=method,
             url=url,
-            json=data)
+            json=data,
+            headers=headers)
 
-        # Prepare the request
+        # Fail fast when the server keeps failing, and wait for
+        # the rate limiter
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError(
+                f'Requests to "{self.server}" are stopped after repeated failures',
+                retry_after=self.circuit_breaker.retry_after())
+        if self.rate_limiter and not self.rate_limiter.acquire(self.timeout):
+            self.circuit_breaker.release()
+            raise RateLimitedError(
+                f'Rate limit for "{self.server}" reached')
+
+        # Prepare and send the request. Timeouts and broken
+        # connections count as failures of the server. Other errors,
+        # like certificate errors, invalid URLs or errors of a
+        # custom transport, don't; they only end the trial request
+        # of a half-open circuit, so the circuit can't get stuck.
         self.logger.debug(f'Starting API request to "{url}"')
-        prep = self.session.prepare_request(request)
         try:
-            api_request = self.session.send(prep)
-        except (Timeout, ConnectionError):
+            prep = self.session.prepare_request(request)
+            with self.in_flight:
+                start = perf_counter()
+                api_request = self.transport.send(
+                    self.session, prep, self.timeout)
+                duration = perf_counter() - start
+        except Timeout:
+            self.circuit_breaker.record_failure()
+            self.logger.error(
+                f'Unifi server "{self.server}" did not respond in time')
+            raise RequestTimeoutError(
+                f'Request for url {url} timed out')
+        except SSLError as error:
+            self.circuit_breaker.release()
             self.logger.error(
+                f'Certificate of Unifi server "{self.server}" could not be verified')
+            raise ServerUnreachableError(
+                f'Certificate of Unifi server "{self.server}" could not be verified: {error}')
+        except (ConnectionError, ChunkedEncodingError):
+            self.circuit_breaker.record_failure()
+            self.logger.error(
+                f'Unable to connect to Unifi server "{self.server}"')
+            raise ServerUnreachableError(
                 f'Unable to connect to Unifi server "{self.server}"')
-            # TODO: Raise correct exception
-            raise PermissionDeniedError()
+        except BaseException:
+            self.circuit_breaker.release()
+            raise
+
+        if api_request.status_code >= 500:
+            self.circuit_breaker.record_failure()
+            raise ServerError(
+                f'Received a error {api_request.status_code} from Unifi for url {url}',
+                status_code=api_request.status_code)
+        self.circuit_breaker.record_success()
 
         self.logger.debug(
             f'Request for URL "{url}" done in {api_request.elapsed.microseconds / 1000} milliseconds')
+        self.update_latency(api_request.elapsed.total_seconds(), endpoint)
+        self.update_sizes(
+            getattr(api_request, 'wire_bytes', len(api_request.content)),
+            len(api_request.content))
+
+        # The elapsed time of the response ends when the headers
+        # are parsed; the rest of the time is the body download
+        waited = min(api_request.elapsed.total_seconds(), duration)
+        record('network wait', start, waited)
+        record('body download', start + waited, duration - waited)
+
+        # The session expired; login again and retry once. Threads
+        # that got a 401 for the same session only login once.
+        if (api_request.status_code == 401 and retry and
+                not endpoint.startswith('api/auth/')):
+            self.relogin(generation)
+            return self.send(method, endpoint, data, retry=False)
 
         if api_request.status_code == 403:
             raise PermissionDeniedError(
                 f'Received a error 403 from Unifi for url {url}')
 
+        if api_request.status_code == 429:
+            raise RateLimitedError(
+                f'Received a error 429 from Unifi for url {url}')
+
+        # The response can be shared by coalesced requests; make
+        # sure it is only decoded once
+        api_request.decode_lock = Lock()
         return api_request
 
+    @property
+    def coalesced(self) -> int:
+        """ The number of GET requests that shared the response of
+            another request """
+        return self.gets_in_flight.coalesced
+
+    def decode(self, response: Response) -> Any:
+        """ Method to decode the JSON body of a response with the
+            configured decoder. The decoded body is kept on the
+            response, so responses that are shared by coalesced
+            requests are only decoded once.
+
+            Parameters
+            ----------
+            response : Response
+                The response to decode
+
+            Returns
+            -------
+            Any
+                The decoded body
+        """
+        decode_lock = getattr(response, 'decode_lock', None)
+        if decode_lock is None:
+            with phase('json parse'):
+                return self.decoder.decode(response.content)
+        with decode_lock:
+            if not hasattr(response, 'decoded'):
+                with phase('json parse'):
+                    response.decoded = self.decoder.decode(response.content)
+        return response.decoded
+
+    def smoothed(self,
+                 average: Optional[float],
+                 baseline: Optional[float],
+                 seconds: float) -> tuple[float, float]:
+        """ Method to add a duration to a moving average and its
+            baseline
+
+            Parameters
+            ----------
+            average : Optional[float]
+                The moving average, or None for the first duration
+
+            baseline : Optional[float]
+                The baseline, or None for the first duration
+
+            seconds : float
+                The duration to add
+
+            Returns
+            -------
+            tuple[float, float]
+                The new average and baseline
+        """
+        if average is None or baseline is None:
+            return seconds, seconds
+        average += self.latency_smoothing * (seconds - average)
+        if average < baseline:
+            baseline = average
+        else:
+            baseline += self.baseline_smoothing * (average - baseline)
+        return average, baseline
+
+    def update_latency(self, seconds: float, endpoint: Optional[str] = None) -> None:
+        """ Method to add the duration of a request to the
+            latency statistics
+
+            Parameters
+            ----------
+            seconds : float
+                The duration of the request
+
+            endpoint : Optional[str]
+                The endpoint of the request. The query string is
+                left out.
+
+            Returns
+            -------
+            None
+        """
+        with self.stats_lock:
+            self.latency, self.latency_baseline = self.smoothed(
+                self.latency, self.latency_baseline, seconds)
+
+            if endpoint is None:
+                return
+            endpoint = endpoint.partition('?')[0]
+            statistics = self.endpoint_latency.get(endpoint)
+            if statistics is None:
+                if len(self.endpoint_latency) >= self.max_endpoints:
+                    return
+                statistics = self.endpoint_latency[endpoint] = [seconds, seconds]
+            else:
+                statistics[:] = self.smoothed(statistics[0], statistics[1], seconds)
+
+    def slowdown(self) -> float:
+        """ Method to get how much slower the controller is than
+            normal. Every endpoint is compared with its own
+            baseline, so slow endpoints don't count as a slow
+            controller.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            float
+                The average of the moving average divided by the
+                baseline over the endpoints; 1.0 when nothing is
+                measured yet
+        """
+        with self.stats_lock:
+            ratios = [average / baseline
+                      for average, baseline in self.endpoint_latency.values() if baseline > 0]
+        if not ratios:
+            return 1.0
+        return sum(ratios) / len(ratios)
+
+    def update_sizes(self, wire_bytes: int, decoded_bytes: int) -> None:
+        """ Method to add the size of a response body to the
+            statistics
+
+            Parameters
+            ----------
+            wire_bytes : int
+                The size of the body on the wire
+
+            decoded_bytes : int
+                The size of the body after decompression
+
+            Returns
+            -------
+            None
+        """
+        with self.stats_lock:
+            self.wire_bytes += wire_bytes
+            self.decoded_bytes += decoded_bytes
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """ The decoded size of the responses divided by the size
+            on the wire, or None when nothing is received yet """
+        if not self.wire_bytes:
+            return None
+        return self.decoded_bytes / self.wire_bytes
+
+    def ensure_logged_in(self) -> None:
+        """ Method to login, unless the connection is already logged
+            in. When multiple threads call this at the same time,
+            only one of them logs in.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.logged_in:
+            return
+        with self.auth_lock:
+            if not self.logged_in:
+                self.login()
+
+    def relogin(self, generation: int) -> None:
+        """ Method to login again after the session expired. Only
+            logs in when no other thread logged in since the
+            failed request was started.
+
+            Parameters
+            ----------
+            generation : int
+                The `auth_generation` when the failed request was
+                started
+
+            Returns
+            -------
+            None
+        """
+        with self.auth_lock:
+            if self.auth_generation == generation:
+                self.logged_in = False
+                self.login()
+
     def login(self) -> None:
         """ Method to login to Unifi
 
@@ -119,32 +538,37 @@ class UnipyConnection:
             Returns
             -------
             None
+
+            Raises
+            ------
+            PermissionDeniedError
+                The username or password is not accepted
         """
 
-        try:
-            login = self.request(
-                method='POST',
-                endpoint='api/auth/login',
-                data={
-                    'username': self.username,
-                    'password': self.password
-                }
-            )
-
-            # Set the X-CSRF-Token header; this is needed for
-            # some endpoints
-            self.session.headers.update(
-                {'X-CSRF-Token': login.headers['X-CSRF-Token']})
-        except PermissionDeniedError:
-            # Failed; remove everything
-            if 'X-CSRF-Token' in self.session.headers.keys():
-                self.session.headers.pop('X-CSRF-Token', None)
-            self.logged_in = False
-
-            # TODO: Raise exception
-        else:
-            # Logged in!
-            self.logged_in = True
+        with self.auth_lock:
+            try:
+                login = self.request(
+                    method='POST',
+                    endpoint='api/auth/login',
+                    data={
+                        'username': self.username,
+                        'password': self.password
+                    }
+                )
+
+                # Remember the X-CSRF-Token header; this is needed
+                # for some endpoints
+                self.csrf_token = login.headers['X-CSRF-Token']
+            except PermissionDeniedError:
+                # Failed; remove everything
+                self.csrf_token = None
+                self.logged_in = False
+                raise
+            else:
+                # Logged in!
+                self.logged_in = True
+            finally:
+                self.auth_generation += 1
 
     def logout(self) -> None:
         """ Method to logout from Unifi
@@ -153,10 +577,12 @@ class UnipyConnection:
             -------
             None
         """
-        if self.logged_in:
-            login = self.request(
-                method='POST',
-                endpoint='api/auth/logout'
-            )
-            self.session.headers.pop('X-CSRF-Token')
-            self.logged_in = False
+        with self.auth_lock:
+            if self.logged_in:
+                login = self.request(
+                    method='POST',
+                    endpoint='api/auth/logout'
+                )
+                self.csrf_token = None
+                self.logged_in = False
+                self.auth_generation += 1
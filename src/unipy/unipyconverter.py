@@ -0,0 +1,184 @@
+""" Module that contains the functions to convert values from the
+    API to the types of the fields of the objects """
+
+from datetime import datetime, timezone
+from sys import intern
+from typing import Any, Callable
+
+# Strings the API uses for booleans
+TRUE_STRINGS = frozenset(('true', '1', 'yes', 'on', 'enabled', 'enable'))
+FALSE_STRINGS = frozenset(('false', '0', 'no', 'off', 'disabled', 'disable', ''))
+
+
+def to_bool(value: Any) -> bool:
+    """ Function to convert a value from the API to a bool. Strings
+        like "false" are converted to False, instead of to True like
+        `bool()` does.
+
+        Parameters
+        ----------
+        value : Any
+            The value to convert
+
+        Returns
+        -------
+        bool
+            The converted value
+    """
+    value_type = type(value)
+    if value_type is bool:
+        return value
+    if value_type is int or value_type is float:
+        return bool(value)
+    if value_type is str:
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+        raise ValueError(f'"{value}" is not a boolean')
+    raise TypeError(f'Can\'t convert "{value_type.__name__}" to bool')
+
+
+def to_int(value: Any) -> int:
+    """ Function to convert a value from the API to a int. Floats
+        are only converted when they have no fraction.
+
+        Parameters
+        ----------
+        value : Any
+            The value to convert
+
+        Returns
+        -------
+        int
+            The converted value
+    """
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is bool or value_type is str:
+        return int(value)
+    if value_type is float:
+        if not value.is_integer():
+            raise ValueError(f'{value} is not a whole number')
+        return int(value)
+    raise TypeError(f'Can\'t convert "{value_type.__name__}" to int')
+
+
+def to_float(value: Any) -> float:
+    """ Function to convert a value from the API to a float """
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int or value_type is str:
+        return float(value)
+    raise TypeError(f'Can\'t convert "{value_type.__name__}" to float')
+
+
+def to_str(value: Any) -> str:
+    """ Function to convert a value from the API to a str. Only
+        scalar values are converted.
+
+        Parameters
+        ----------
+        value : Any
+            The value to convert
+
+        Returns
+        -------
+        str
+            The converted value
+    """
+    value_type = type(value)
+    if value_type is str:
+        return value
+    if value_type is int or value_type is float or value_type is bool:
+        return str(value)
+    raise TypeError(f'Can\'t convert "{value_type.__name__}" to str')
+
+
+def to_list(value: Any) -> list:
+    """ Function to convert a value from the API to a list """
+    value_type = type(value)
+    if value_type is list:
+        return value
+    if value_type is tuple:
+        return list(value)
+    raise TypeError(f'Can\'t convert "{value_type.__name__}" to list')
+
+
+def to_dict(value: Any) -> dict:
+    """ Function to check that a value from the API is a dict """
+    if type(value) is dict:
+        return value
+    raise TypeError(f'Can\'t convert "{type(value).__name__}" to dict')
+
+
+def to_datetime(value: Any) -> datetime:
+    """ Function to convert a timestamp from the API to a timezone
+        aware datetime. Timestamps in milliseconds are detected.
+
+        Parameters
+        ----------
+        value : Any
+            The timestamp in seconds or milliseconds, or a ISO
+            formatted string
+
+        Returns
+        -------
+        datetime
+            The converted value
+    """
+    value_type = type(value)
+    if value_type is datetime:
+        return value
+    if value_type is str:
+        try:
+            value = float(value)
+        except ValueError:
+            return datetime.fromisoformat(value)
+    elif value_type is not int and value_type is not float:
+        raise TypeError(f'Can\'t convert "{value_type.__name__}" to datetime')
+
+    # Timestamps after the year 5138 are in milliseconds
+    if value > 10 ** 11:
+        value /= 1000
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+# The converters for the types
+CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    bool: to_bool,
+    int: to_int,
+    float: to_float,
+    str: to_str,
+    list: to_list,
+    dict: to_dict,
+    datetime: to_datetime
+}
+
+
+def make_converter(field_type: type, interned: bool = False) -> Callable[[Any], Any]:
+    """ Function to create the converter for a field
+
+        Parameters
+        ----------
+        field_type : type
+            The type of the field
+
+        interned : bool = False
+            If True, converted strings are interned
+
+        Returns
+        -------
+        Callable[[Any], Any]
+            Function that converts a value to the type of the field,
+            or raises a ValueError or TypeError
+    """
+    converter = CONVERTERS.get(field_type, field_type)
+    if interned and field_type is str:
+        def convert_interned(value: Any) -> str:
+            return intern(to_str(value))
+        return convert_interned
+    return converter
@@ -0,0 +1,117 @@
+""" Module that contains the JSON decoders for API responses. The
+    fastest installed decoder is used by default. """
+
+import json
+from typing import Any, Union
+
+
+class UnipyDecoder:
+    """ Base class for JSON decoders. Uses the JSON module from the
+        standard library. """
+
+    name = 'json'
+
+    def decode(self, content: bytes) -> Any:
+        """ Method to decode a JSON document
+
+            Parameters
+            ----------
+            content : bytes
+                The JSON document
+
+            Returns
+            -------
+            Any
+                The decoded document
+        """
+        return json.loads(content)
+
+
+class OrjsonDecoder(UnipyDecoder):
+    """ Decoder that uses `orjson` """
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+        self.loads = orjson.loads
+
+    def decode(self, content: bytes) -> Any:
+        return self.loads(content)
+
+
+class UjsonDecoder(UnipyDecoder):
+    """ Decoder that uses `ujson` """
+
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        import ujson
+        self.loads = ujson.loads
+
+    def decode(self, content: bytes) -> Any:
+        return self.loads(content)
+
+
+class MsgspecDecoder(UnipyDecoder):
+    """ Decoder that uses `msgspec` """
+
+    name = 'msgspec'
+
+    def __init__(self) -> None:
+        import msgspec
+        self.decoder = msgspec.json.Decoder()
+
+    def decode(self, content: bytes) -> Any:
+        return self.decoder.decode(content)
+
+
+# The decoders, in the order of preference
+DECODERS: dict[str, type[UnipyDecoder]] = {
+    'orjson': OrjsonDecoder,
+    'msgspec': MsgspecDecoder,
+    'ujson': UjsonDecoder,
+    'json': UnipyDecoder
+}
+
+
+def get_decoder(decoder: Union[str, UnipyDecoder, None] = None) -> UnipyDecoder:
+    """ Function to get a decoder
+
+        Parameters
+        ----------
+        decoder : Union[str, UnipyDecoder, None]
+            The name of the decoder or a decoder object. If not
+            given, the fastest installed decoder is used.
+
+        Returns
+        -------
+        UnipyDecoder
+            The decoder
+
+        Raises
+        ------
+        ValueError
+            The name is not a known decoder
+
+        ImportError
+            The package for the decoder is not installed
+    """
+    if isinstance(decoder, UnipyDecoder):
+        return decoder
+    if decoder is not None:
+        if decoder not in DECODERS:
+            raise ValueError(
+                f'Unknown decoder "{decoder}"; the available decoders are: {", ".join(DECODERS)}')
+        return DECODERS[decoder]()
+
+    # The standard library decoder is always installed, so it is
+    # only used when none of the others are
+    for decoder_type in DECODERS.values():
+        if decoder_type is UnipyDecoder:
+            continue
+        try:
+            return decoder_type()
+        except ImportError:
+            continue
+    return UnipyDecoder()
@@ -0,0 +1,456 @@
+""" Module that contains the classes to subscribe to the event
+    stream of the `network` application and to keep a in-memory
+    inventory up-to-date with these events """
+
+import json
+import random
+import ssl
+from logging import getLogger
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import Callable, Iterator, Optional
+from unipy.networkclient import NetworkActiveClient
+from unipy.networkdevice import NetworkDevice
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipynetwork import UnipyNetwork
+
+
+class NetworkInventory:
+    """ Class that keeps a in-memory inventory of devices and
+        active clients. The inventory can be loaded with the
+        getters from `UnipyNetwork` and is updated incrementally
+        with messages from the event stream. """
+
+    # Messages that contain (partial) client data
+    client_messages = ('sta:sync', 'client:sync')
+
+    # Messages that contain (partial) device data
+    device_messages = ('device:sync', 'device:update')
+
+    # Event keys that mean a client disconnected
+    disconnect_events = ('EVT_WU_Disconnected',
+                         'EVT_WG_Disconnected',
+                         'EVT_LU_Disconnected')
+
+    def __init__(self,
+                 device_factory: Optional[Callable[[dict], NetworkDevice]] = None,
+                 binding: Optional[UnipyNetwork] = None) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            device_factory : Optional[Callable[[dict], NetworkDevice]]
+                Function to create new devices from API data. Use
+                `UnipyNetwork.device_factory` to get objects of
+                the correct type. If not given, `NetworkDevice` is
+                used.
+
+            binding : Optional[UnipyNetwork]
+                The application that new objects from events are
+                bound to. Is set by `load`.
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger('NetworkInventory')
+        self.device_factory = device_factory or NetworkDevice
+        self.binding = binding
+        self.devices: dict[str, NetworkDevice] = dict()
+        self.clients: dict[str, NetworkActiveClient] = dict()
+        self.lock = Lock()
+
+    def load(self, network: UnipyNetwork) -> None:
+        """ Method to (re)load the complete inventory from the API
+
+            Parameters
+            ----------
+            network : UnipyNetwork
+                The application to retrieve the data from
+
+            Returns
+            -------
+            None
+        """
+        devices = network.get_devices()
+        clients = network.get_active_clients()
+        with self.lock:
+            self.device_factory = network.device_factory
+            self.binding = network
+            self.devices = {device.mac_address: device for device in devices}
+            self.clients = {client.mac_address: client for client in clients}
+
+    def apply(self, message_type: str, data: dict) -> None:
+        """ Method to apply one item from a event message to the
+            inventory. Existing objects are updated with the
+            fields in the item, so partial updates only change
+            the fields that are given. New objects are bound to
+            the application of the inventory.
+
+            Parameters
+            ----------
+            message_type : str
+                The type of the message, as given in the `meta`
+                of the message
+
+            data : dict
+                One item from the `data` of the message
+
+            Returns
+            -------
+            None
+        """
+        mac = data.get('mac')
+        with self.lock:
+            if message_type in self.client_messages and mac:
+                client = self.clients.get(mac)
+                if client:
+                    client.set_from_api(data)
+                else:
+                    self.clients[mac] = NetworkActiveClient(data, self.binding)
+            elif message_type in self.device_messages and mac:
+                device = self.devices.get(mac)
+                if device:
+                    device.set_from_api(data)
+                elif 'type' in data:
+                    device = self.device_factory(data)
+                    if device.binding is None:
+                        device.bind(self.binding)
+                    self.devices[mac] = device
+            elif message_type == 'events':
+                if data.get('key') in self.disconnect_events:
+                    self.clients.pop(data.get('user'), None)
+
+    def drain(self, stream: 'UnipyEventStream') -> int:
+        """ Method to apply all events that are waiting in the
+            queue of a event stream. Does not block.
+
+            Parameters
+            ----------
+            stream : UnipyEventStream
+                The stream to get the events from
+
+            Returns
+            -------
+            int
+                The number of events that were applied
+        """
+        applied = 0
+        while True:
+            event = stream.get(timeout=0)
+            if event is None:
+                return applied
+            self.apply(*event)
+            applied += 1
+
+    def follow(self, stream: 'UnipyEventStream') -> None:
+        """ Method to apply events from a event stream until the
+            stream is stopped. Blocks the calling thread.
+
+            Parameters
+            ----------
+            stream : UnipyEventStream
+                The stream to get the events from
+
+            Returns
+            -------
+            None
+        """
+        for message_type, data in stream:
+            self.apply(message_type, data)
+
+
+class UnipyEventStream:
+    """ Class that subscribes to the websocket with events for
+        the `network` application. The websocket is read in a
+        background thread and the events are put in a bounded
+        queue. Uses the `websocket-client` package, which has to
+        be installed to use this class. """
+
+    def __init__(self,
+                 connection: UnipyConnection,
+                 site: str = 'default',
+                 queue_size: int = 10000,
+                 drop_when_full: bool = False,
+                 min_backoff: float = 1.0,
+                 max_backoff: float = 60.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            connection : UnipyConnection
+                The connection to use. The authentication cookies
+                of this connection are used for the websocket.
+
+            site : str = 'default'
+                The site to get the events for
+
+            queue_size : int = 10000
+                The maximum number of events waiting in the queue
+
+            drop_when_full : bool = False
+                If False, reading the websocket pauses when the
+                queue is full, so the controller has to wait for
+                us. If True, the oldest event is dropped instead.
+
+            min_backoff : float = 1.0
+                The seconds to wait before the first reconnection
+
+            max_backoff : float = 60.0
+                The maximum seconds to wait before reconnecting
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger(
+            f'UnipyEventStream - wss://{connection.server}/')
+        self.connection = connection
+        self.site = site
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.drop_when_full = drop_when_full
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        # Statistics
+        self.dropped = 0
+        self.reconnects = 0
+
+        # State of the background thread
+        self.stopped = Event()
+        self.thread: Optional[Thread] = None
+        self.websocket = None
+
+    @property
+    def url(self) -> str:
+        """ The URL of the websocket """
+        return f'wss://{self.connection.server}/proxy/network/wss/s/{self.site}/events'
+
+    def start(self) -> None:
+        """ Method to start reading the websocket in a background
+            thread
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.thread and self.thread.is_alive():
+            return
+
+        # Fail directly when the websocket package is missing,
+        # instead of retrying in the background
+        try:
+            import websocket  # noqa: F401
+        except ImportError as error:
+            raise ImportError(
+                'The "websocket-client" package is needed for UnipyEventStream') from error
+
+        self.stopped.clear()
+        self.thread = Thread(
+            target=self.run, name='UnipyEventStream', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ Method to stop reading the websocket
+
+            Parameters
+            ----------
+            timeout : Optional[float]
+                Seconds to wait for the background thread
+
+            Returns
+            -------
+            None
+        """
+        self.stopped.set()
+        websocket = self.websocket
+        if websocket:
+            try:
+                websocket.close()
+            except Exception:
+                pass
+        if self.thread:
+            self.thread.join(timeout)
+
+    def connect(self):
+        """ Method to open the websocket with the authentication
+            of the connection
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            websocket.WebSocket
+                The opened websocket
+        """
+        import websocket
+
+        self.connection.ensure_logged_in()
+
+        # Reuse the cookies and CSRF token of the connection
+        cookies = '; '.join(
+            f'{name}={value}' for name, value in self.connection.session.cookies.items())
+        headers = list()
+        csrf_token = self.connection.csrf_token
+        if csrf_token:
+            headers.append(f'X-CSRF-Token: {csrf_token}')
+
+        sslopt = dict()
+        if not self.connection.verify:
+            sslopt = {'cert_reqs': ssl.CERT_NONE, 'check_hostname': False}
+
+        return websocket.create_connection(
+            self.url,
+            cookie=cookies,
+            header=headers,
+            sslopt=sslopt,
+            timeout=1)
+
+    def run(self) -> None:
+        """ Method that reads the websocket until the stream is
+            stopped. Reconnects with a exponential backoff when
+            the websocket fails. Is started by `start`.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        backoff = self.min_backoff
+        while not self.stopped.is_set():
+            generation = self.connection.auth_generation
+            try:
+                self.connection.ensure_logged_in()
+                generation = self.connection.auth_generation
+                self.websocket = self.connect()
+                self.logger.debug(f'Connected to "{self.url}"')
+                backoff = self.min_backoff
+                self.read(self.websocket)
+            except Exception as error:
+                if self.stopped.is_set():
+                    break
+                self.logger.warning(
+                    f'Websocket failed, reconnecting in {backoff:.1f} seconds')
+                self.logger.debug(f'Error: {error}')
+
+                # Authentication could be expired; login again,
+                # unless another thread already did
+                if getattr(error, 'status_code', None) in (401, 403):
+                    try:
+                        self.connection.relogin(generation)
+                    except Exception as login_error:
+                        self.logger.warning(f'Login failed: {login_error}')
+            finally:
+                if self.websocket:
+                    try:
+                        self.websocket.close()
+                    except Exception:
+                        pass
+                    self.websocket = None
+
+            if self.stopped.wait(backoff * random.uniform(0.5, 1.0)):
+                break
+            self.reconnects += 1
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def read(self, websocket) -> None:
+        """ Method to read messages from a opened websocket and put
+            the items in the queue
+
+            Parameters
+            ----------
+            websocket : websocket.WebSocket
+                The opened websocket
+
+            Returns
+            -------
+            None
+        """
+        from websocket import WebSocketTimeoutException
+
+        while not self.stopped.is_set():
+            try:
+                message = websocket.recv()
+            except WebSocketTimeoutException:
+                continue
+            if not message:
+                raise ConnectionError('Websocket closed by server')
+
+            try:
+                message = json.loads(message)
+                message_type = message['meta']['message']
+                items = message.get('data', list())
+            except (ValueError, KeyError, TypeError):
+                self.logger.debug(f'Ignoring unknown message "{message}"')
+                continue
+
+            for item in items:
+                self.put((message_type, item))
+
+    def put(self, event: tuple[str, dict]) -> None:
+        """ Method to put a event in the queue. Blocks when the
+            queue is full, or drops the oldest event when
+            `drop_when_full` is set.
+
+            Parameters
+            ----------
+            event : tuple[str, dict]
+                The message type and the item
+
+            Returns
+            -------
+            None
+        """
+        while not self.stopped.is_set():
+            try:
+                if self.drop_when_full:
+                    self.queue.put_nowait(event)
+                else:
+                    self.queue.put(event, timeout=1)
+                return
+            except Full:
+                if self.drop_when_full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped += 1
+                    except Empty:
+                        pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[tuple[str, dict]]:
+        """ Method to get the next event from the queue
+
+            Parameters
+            ----------
+            timeout : Optional[float]
+                Seconds to wait for a event. If None, blocks until
+                a event is available.
+
+            Returns
+            -------
+            tuple[str, dict]
+                The message type and the item
+
+            None
+                No event was available within the timeout
+        """
+        try:
+            if timeout == 0:
+                return self.queue.get_nowait()
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        while not (self.stopped.is_set() and self.queue.empty()):
+            event = self.get(timeout=1)
+            if event is not None:
+                yield event
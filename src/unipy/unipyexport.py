@@ -0,0 +1,319 @@
+""" Module that contains functions to export UnipyObjects, or the
+    raw API data for them, to formats for data pipelines. The
+    exports are driven by the `ObjectField` schema of the object
+    types. """
+
+import csv
+import json
+from io import TextIOBase
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Union
+from unipy.unipyobject import UnipyObject
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Exportable = Union[UnipyObject, dict]
+
+
+def dumps(value: Any) -> bytes:
+    """ Function to serialize a value to JSON. Uses `orjson` when
+        it is installed.
+
+        Parameters
+        ----------
+        value : Any
+            The value to serialize
+
+        Returns
+        -------
+        bytes
+            The JSON document
+    """
+    if orjson:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, separators=(',', ':')).encode()
+
+
+def get_columns(object_type: type[UnipyObject],
+                fields: Optional[Iterable[str]] = None) -> list[tuple[str, Optional[str], Any]]:
+    """ Function to get the columns to export for a object type
+
+        Parameters
+        ----------
+        object_type : type[UnipyObject]
+            The object type
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export. If not given, all
+            fields are exported.
+
+        Returns
+        -------
+        list[tuple[str, Optional[str], Any]]
+            The name, API field and default value for each column
+    """
+    object_fields = object_type.get_fields()
+    if fields is None:
+        fields = object_fields.keys()
+
+    columns = list()
+    for name in fields:
+        if name not in object_fields:
+            raise KeyError(
+                f'Field "{name}" does not exist for "{object_type.__name__}"')
+        field = object_fields[name]
+        columns.append((name, field.api_field, field.default))
+    return columns
+
+
+def iter_rows(items: Iterable[Exportable],
+              object_type: type[UnipyObject],
+              fields: Optional[Iterable[str]] = None) -> Iterator[tuple]:
+    """ Function to get the values for the columns for each item.
+        Items can be objects or the raw dicts from the API. For
+        raw dicts no objects are created, but the values are
+        converted with the converters of the object type, so both
+        give the same values.
+
+        Parameters
+        ----------
+        items : Iterable[Exportable]
+            The items to export
+
+        object_type : type[UnipyObject]
+            The object type of the items
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export
+
+        Returns
+        -------
+        Iterator[tuple]
+            The values for the columns for each item
+    """
+    columns = get_columns(object_type, fields)
+    names = [name for name, _, _ in columns]
+
+    # The API field and converter for each column. Like for
+    # objects, a API field that is used by multiple fields only
+    # fills the first declared field; the others keep the default
+    converters = object_type.get_converters()
+    api_columns: list[tuple[Optional[str], Any, Any]] = list()
+    for name, api_field, default in columns:
+        converter = converters.get(api_field) if api_field else None
+        if converter is None or converter[0] != name:
+            api_columns.append((None, None, default))
+        else:
+            api_columns.append((api_field, converter[1], default))
+
+    for item in items:
+        if type(item) is dict:
+            yield tuple(convert_value(item, api_field, convert, default)
+                        for api_field, convert, default in api_columns)
+        else:
+            yield tuple(getattr(item, name) for name in names)
+
+
+def convert_value(item: dict,
+                  api_field: Optional[str],
+                  convert: Optional[Callable[[Any], Any]],
+                  default: Any) -> Any:
+    """ Function to get the converted value of a API field from a
+        raw dict, the same way `UnipyObject.set_from_api` does. A
+        value that can't be converted is kept as given by the API.
+
+        Parameters
+        ----------
+        item : dict
+            The raw dict from the API
+
+        api_field : Optional[str]
+            The API field, or None when the column is not filled
+            from the API
+
+        convert : Optional[Callable[[Any], Any]]
+            The converter for the field
+
+        default : Any
+            The default value of the field
+
+        Returns
+        -------
+        Any
+            The value for the column
+    """
+    if api_field is None or api_field not in item:
+        return default
+    value = item[api_field]
+    if value is None:
+        return None
+    try:
+        return convert(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def export_ndjson(items: Iterable[Exportable],
+                  file: IO,
+                  object_type: type[UnipyObject],
+                  fields: Optional[Iterable[str]] = None) -> int:
+    """ Function to write items as newline delimited JSON
+
+        Parameters
+        ----------
+        items : Iterable[Exportable]
+            The items to export
+
+        file : IO
+            The file-like object to write to. Can be opened in text
+            or binary mode.
+
+        object_type : type[UnipyObject]
+            The object type of the items
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export
+
+        Returns
+        -------
+        int
+            The number of exported items
+    """
+    names = [name for name, _, _ in get_columns(object_type, fields)]
+    text = isinstance(file, TextIOBase)
+    count = 0
+    for row in iter_rows(items, object_type, names):
+        line = dumps(dict(zip(names, row))) + b'\n'
+        file.write(line.decode() if text else line)
+        count += 1
+    return count
+
+
+def export_csv(items: Iterable[Exportable],
+               file: IO,
+               object_type: type[UnipyObject],
+               fields: Optional[Iterable[str]] = None) -> int:
+    """ Function to write items as CSV with a header. Lists and
+        dicts are written as JSON.
+
+        Parameters
+        ----------
+        items : Iterable[Exportable]
+            The items to export
+
+        file : IO
+            The file-like object to write to. Has to be opened in
+            text mode, with `newline=''`.
+
+        object_type : type[UnipyObject]
+            The object type of the items
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export
+
+        Returns
+        -------
+        int
+            The number of exported items
+    """
+    names = [name for name, _, _ in get_columns(object_type, fields)]
+    writer = csv.writer(file)
+    writer.writerow(names)
+    count = 0
+    for row in iter_rows(items, object_type, names):
+        writer.writerow([
+            dumps(value).decode() if type(value) in (list, dict) else value
+            for value in row])
+        count += 1
+    return count
+
+
+def to_arrow(items: Iterable[Exportable],
+             object_type: type[UnipyObject],
+             fields: Optional[Iterable[str]] = None):
+    """ Function to create a Arrow table from items. The columns
+        are typed with the types of the fields. Lists and dicts
+        are stored as JSON. Needs the `pyarrow` package.
+
+        Parameters
+        ----------
+        items : Iterable[Exportable]
+            The items to export
+
+        object_type : type[UnipyObject]
+            The object type of the items
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export
+
+        Returns
+        -------
+        pyarrow.Table
+            The created table
+    """
+    import pyarrow
+
+    arrow_types = {
+        str: pyarrow.string(),
+        int: pyarrow.int64(),
+        bool: pyarrow.bool_(),
+        float: pyarrow.float64(),
+        list: pyarrow.string(),
+        dict: pyarrow.string()
+    }
+
+    object_fields = object_type.get_fields()
+    names = [name for name, _, _ in get_columns(object_type, fields)]
+    columns: list[list] = [list() for _ in names]
+    for row in iter_rows(items, object_type, names):
+        for column, value in zip(columns, row):
+            column.append(value)
+
+    arrays = list()
+    for name, column in zip(names, columns):
+        field_type = object_fields[name].type
+        if field_type in (list, dict):
+            column = [None if value is None else dumps(value).decode()
+                      for value in column]
+        try:
+            arrays.append(pyarrow.array(
+                column, type=arrow_types.get(field_type)))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            # The API does not always give the configured type
+            arrays.append(pyarrow.array(
+                [None if value is None else str(value) for value in column],
+                type=pyarrow.string()))
+
+    return pyarrow.Table.from_arrays(arrays, names=names)
+
+
+def export_parquet(items: Iterable[Exportable],
+                   path: str,
+                   object_type: type[UnipyObject],
+                   fields: Optional[Iterable[str]] = None) -> None:
+    """ Function to write items to a Parquet file. Needs the
+        `pyarrow` package.
+
+        Parameters
+        ----------
+        items : Iterable[Exportable]
+            The items to export
+
+        path : str
+            The path of the file to write
+
+        object_type : type[UnipyObject]
+            The object type of the items
+
+        fields : Optional[Iterable[str]]
+            The names of the fields to export
+
+        Returns
+        -------
+        None
+    """
+    import pyarrow.parquet
+
+    pyarrow.parquet.write_table(to_arrow(items, object_type, fields), path)
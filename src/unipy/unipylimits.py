@@ -0,0 +1,251 @@
+""" Module that contains the classes to limit the load on a
+    UnifiOS server; a rate limiter and a circuit breaker """
+
+from threading import Lock
+from time import monotonic, sleep
+from typing import Optional
+
+
+class UnipyTokenBucket:
+    """ Class that limits the rate of requests with a token
+        bucket. The bucket holds at most `burst` tokens and is
+        refilled with `rate` tokens per second. Every request
+        takes one token. """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            rate : float
+                The number of requests per second
+
+            burst : int = 1
+                The number of requests that can be done at once
+                after a quiet period
+
+            Returns
+            -------
+            None
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    def reserve(self) -> float:
+        """ Method to take a token. When the bucket is empty, the
+            token is taken from the future.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            float
+                The seconds to wait before the token can be used
+        """
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def cancel(self) -> None:
+        """ Method to give back a token that was reserved but not
+            used """
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """ Method to wait for a token
+
+            Parameters
+            ----------
+            timeout : Optional[float]
+                The maximum seconds to wait. If not given, waits
+                as long as needed.
+
+            Returns
+            -------
+            bool
+                True if a token was taken, False if the wait would
+                be longer than the timeout
+        """
+        wait = self.reserve()
+        if timeout is not None and wait > timeout:
+            self.cancel()
+            return False
+        if wait:
+            sleep(wait)
+        return True
+
+
+class UnipyCircuitBreaker:
+    """ Class that stops requests to a server that keeps failing.
+        After `threshold` failures in a row the circuit opens and
+        requests fail directly. After `cooldown` seconds one trial
+        request is let through (half-open); when it succeeds the
+        circuit closes again, when it fails the circuit opens for
+        another cooldown. """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            threshold : int = 5
+                The number of failures in a row that opens the
+                circuit
+
+            cooldown : float = 30.0
+                The seconds the circuit stays open
+
+            Returns
+            -------
+            None
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0.0
+        self.trial = False
+        self.lock = Lock()
+
+    def allow(self) -> bool:
+        """ Method to check if a request can be done
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            bool
+                True if the request can be done, False if the
+                circuit is open
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if monotonic() - self.opened < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial = False
+
+            # Half-open; only one trial request at a time
+            if self.trial:
+                return False
+            self.trial = True
+            return True
+
+    def retry_after(self) -> float:
+        """ Method to get the seconds until the circuit half-opens """
+        with self.lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (monotonic() - self.opened))
+
+    def release(self) -> None:
+        """ Method to register that a allowed request was not done,
+            so another trial request can be done """
+        with self.lock:
+            self.trial = False
+
+    def record_success(self) -> None:
+        """ Method to register a successful request """
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial = False
+
+    def record_failure(self) -> None:
+        """ Method to register a failed request. Opens the circuit
+            when the threshold is reached or when the trial request
+            failed. """
+        with self.lock:
+            self.failures += 1
+            self.trial = False
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened = monotonic()
+
+
+# The rate limiters and circuit breakers per server and settings,
+# so connections to the same server with the same settings share
+# them, and a connection with other settings gets its own
+rate_limiters: dict[tuple[str, float, int], UnipyTokenBucket] = dict()
+circuit_breakers: dict[tuple[str, int, float], UnipyCircuitBreaker] = dict()
+registry_lock = Lock()
+
+
+def get_rate_limiter(server: str, rate: float, burst: int = 1) -> UnipyTokenBucket:
+    """ Function to get the rate limiter for a server with the
+        given settings
+
+        Parameters
+        ----------
+        server : str
+            The server to get the rate limiter for
+
+        rate : float
+            The number of requests per second
+
+        burst : int = 1
+            The burst size
+
+        Returns
+        -------
+        UnipyTokenBucket
+            The rate limiter for the server and settings
+    """
+    key = (server, rate, burst)
+    with registry_lock:
+        limiter = rate_limiters.get(key)
+        if limiter is None:
+            limiter = UnipyTokenBucket(rate, burst)
+            rate_limiters[key] = limiter
+        return limiter
+
+
+def get_circuit_breaker(server: str,
+                        threshold: int = 5,
+                        cooldown: float = 30.0) -> UnipyCircuitBreaker:
+    """ Function to get the circuit breaker for a server with the
+        given settings
+
+        Parameters
+        ----------
+        server : str
+            The server to get the circuit breaker for
+
+        threshold : int = 5
+            The failures in a row that open the circuit
+
+        cooldown : float = 30.0
+            The seconds the circuit stays open
+
+        Returns
+        -------
+        UnipyCircuitBreaker
+            The circuit breaker for the server and settings
+    """
+    key = (server, threshold, cooldown)
+    with registry_lock:
+        breaker = circuit_breakers.get(key)
+        if breaker is None:
+            breaker = UnipyCircuitBreaker(threshold, cooldown)
+            circuit_breakers[key] = breaker
+        return breaker
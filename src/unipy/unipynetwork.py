@@ -1,23 +1,43 @@
 """ Module that contains the UnipyNetwork class. This class
     can be used to use the `network` application """
 
-from typing import Optional
+from typing import Callable, Iterable, Optional
 from unipy.exceptions import NoFirewallsFoundError, NoRoutersFoundError
-from unipy.networkclient import NetworkActiveClient, NetworkInactiveClient
-from unipy.networkfirewall import NetworkFirewallChain, NetworkFirewallGroup, NetworkFirewallRule
+from unipy.networkclient import NetworkActiveClient, NetworkClient, NetworkInactiveClient
+from unipy.networkfirewall import NetworkFirewallChains, NetworkFirewallGroup, NetworkFirewallRule
 from unipy.networksite import NetworkSite
 from unipy.networkssid import NetworkSSID
 from unipy.unipyconnection import UnipyConnection
-from unipy.networkdevice import NetworkDevice, NetworkDeviceUAP, NetworkDeviceUGW, NetworkDeviceUSW
+from unipy.networkdevice import NetworkDevice, NetworkDeviceUGW
+from unipy.networkdeviceconfig import NetworkDeviceSystemConfig
+from unipy.networkcfgtracker import NetworkConfigTracker
 from unipy.networkportforward import NetworkPortForward
+from unipy.networktopology import NetworkTopology
+from unipy.unipyquery import UnipyQuery
+from unipy.unipyobject import UnipyObject
+from unipy.unipyprofile import phase, profiled
+from unipy.unipysingleflight import UnipyBatcher, UnipySingleFlight
 from logging import getLogger
 
 
 class UnipyNetwork:
     """ Class that can be used to use the `network`
-        application """
-
-    def __init__(self, connection: UnipyConnection):
+        application.
+
+        Results that are shared between callers are frozen: the
+        cached system configurations and firewall chains, and the
+        results of lookups that are shared within the lookup
+        window. Changing a frozen object raises a
+        FrozenObjectError; use `copy()` to get a object that can
+        be changed. The other getters return new objects, but
+        requests for the same endpoint that are done at the same
+        time share the decoded response, so lists and dicts in the
+        fields of the objects must not be changed in place. """
+
+    def __init__(self,
+                 connection: UnipyConnection,
+                 lookup_window: float = 0.2,
+                 batch_window: float = 0.01):
         """ Initiator sets the needed values
 
             Parameters
@@ -26,6 +46,15 @@ class UnipyNetwork:
                 A UnipyConnection object that can be used to
                 execute API commands.
 
+            lookup_window : float = 0.2
+                The seconds the result of a lookup for a single
+                device or client is shared with other lookups for
+                the same MAC address
+
+            batch_window : float = 0.01
+                The seconds to wait for lookups of other devices,
+                so they are retrieved with one request
+
             Returns
             -------
             None
@@ -34,12 +63,50 @@ class UnipyNetwork:
         self.logger = getLogger(
             f'UnipyNetwork https://{connection.server}/')
 
-    def get_devices(self) -> list[NetworkDevice]:
+        # Cache for the `system` configuration of devices, keyed
+        # on the MAC address of the device. Callers share the
+        # frozen configurations.
+        self.system_cfg_cache: dict[str, NetworkDeviceSystemConfig] = dict()
+
+        # Tracker for configuration versions of devices, used to
+        # only retrieve configurations for changed devices
+        self.cfg_tracker = NetworkConfigTracker()
+
+        # Cache for the assembled firewall rules, together with
+        # the configuration versions of the router it was
+        # assembled for. Callers share the frozen chains.
+        self.firewall_rules_cache: Optional[tuple[tuple, NetworkFirewallChains]] = None
+
+        # Lookups for a single device or client that are done at
+        # the same time are coalesced into one request
+        self.lookups = UnipySingleFlight(window=lookup_window)
+
+        # Lookups for different devices that are done at the same
+        # time are batched into one request
+        self.device_batcher = UnipyBatcher(
+            self.get_devices_by_mac, window=batch_window)
+
+        # False when the controller ignored the `macs` filter for
+        # devices; then all devices are retrieved and filtered here
+        self.macs_filter: Optional[bool] = None
+
+        # Device types without a registered class; they are only
+        # logged the first time
+        self.unknown_device_types: set[str] = set()
+
+    @profiled
+    def get_devices(self, query: Optional[UnipyQuery] = None) -> list[NetworkDevice]:
         """ Method to get all network devices
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects. When the query selects
+                devices on `mac_address`, only those devices are
+                retrieved from the controller. When the controller
+                does not support the filter, all devices are
+                retrieved and filtered here.
 
             Returns
             -------
@@ -48,59 +115,279 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
+
+        # Let the controller filter on MAC address when we can
+        macs = query.values_for('mac_address') if query else None
+        if macs is not None and len(macs) == 0:
+            return list()
 
         # Execute the API request
-        resources = self.connection.request(
-            method='GET',
-            endpoint='proxy/network/api/s/default/stat/device')
+        if macs and len(macs) == 1:
+            data = self.request_data(
+                'GET', f'proxy/network/api/s/default/stat/device/{macs[0]}') or list()
+        elif macs and self.macs_filter is not False:
+            data = self.request_data(
+                'POST', 'proxy/network/api/s/default/stat/device', {'macs': macs})
+
+            # A controller that ignores the filter gives all
+            # devices, one that rejects it gives a error. Then we
+            # filter the devices ourselves from now on.
+            requested = set(macs)
+            supported = data is not None and all(
+                device.get('mac') in requested for device in data)
+            if not supported and self.macs_filter is None:
+                self.logger.info(
+                    'The controller does not support the "macs" filter; filtering devices locally')
+            self.macs_filter = supported
+        else:
+            data = None
 
-        # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [self.device_factory(
-            resource) for resource in data]
+        if data is None:
+            resources = self.connection.request(
+                method='GET',
+                endpoint='proxy/network/api/s/default/stat/device')
+            data = self.connection.decode(resources)['data']
+
+        # Convert the data to objects; the query drops the devices
+        # that were not asked for
+        resources_converted = self.convert(
+            data, NetworkDevice, query, bulk_factory=self.devices_factory,
+            keep=('type',))
 
         # Return the devicelist
         return resources_converted
 
-    def get_device_system_cfg(self, device_mac: str) -> dict:
-        """ Method to get `system` configuration for a device
+    @profiled
+    def get_device(self, device_mac: str) -> Optional[NetworkDevice]:
+        """ Method to get one network device. Lookups for the same
+            device that are done at the same time share one
+            request; lookups for different devices within the
+            batch window are retrieved with one request. The
+            device is shared with the other lookups and frozen.
+
+            Parameters
+            ----------
+            device_mac : str
+                The MAC address of the device
+
+            Returns
+            -------
+            NetworkDevice
+                The requested device
+
+            None
+                The device does not exist
+        """
+        return self.lookups.do(
+            ('device', device_mac),
+            lambda: self.device_batcher.get(device_mac))
+
+    @profiled
+    def get_devices_by_mac(self, device_macs: Iterable[str]) -> dict[str, NetworkDevice]:
+        """ Method to get multiple network devices with one
+            request. Lookups for the same devices that are done at
+            the same time share the devices, so they are frozen.
+
+            Parameters
+            ----------
+            device_macs : Iterable[str]
+                The MAC addresses of the devices
+
+            Returns
+            -------
+            dict[str, NetworkDevice]
+                The devices that exist, keyed on the MAC address
+        """
+        device_macs = sorted(set(device_macs))
+        devices = self.lookups.do(
+            ('devices', tuple(device_macs)),
+            lambda: [device.freeze() for device in self.get_devices(
+                UnipyQuery().where('mac_address', 'in', device_macs))])
+        return {device.mac_address: device for device in devices}
+
+    @profiled
+    def request_data(self,
+                     method: str,
+                     endpoint: str,
+                     data: Optional[dict] = None) -> Optional[list[dict]]:
+        """ Method to execute a API request and get the `data` of
+            the response
+
+            Parameters
+            ----------
+            method : str
+                The HTTP method to use
+
+            endpoint : str
+                The endpoint to execute
+
+            data : Optional[dict]
+                The data to send to the API
+
+            Returns
+            -------
+            list[dict]
+                The `data` of the response
+
+            None
+                The request failed or the response has no `data`
+        """
+        resources = self.connection.request(
+            method=method, endpoint=endpoint, data=data)
+        if not resources.ok:
+            return None
+        decoded = self.connection.decode(resources)
+        if not isinstance(decoded, dict) or not isinstance(decoded.get('data'), list):
+            return None
+        return decoded['data']
+
+    @profiled
+    def get_device_system_cfg(self,
+                              device_mac: str,
+                              cfg_version: Optional[str] = None,
+                              known_cfgversion: Optional[str] = None) -> NetworkDeviceSystemConfig:
+        """ Method to get `system` configuration for a device. The
+            configuration is cached per device. If the
+            configuration versions of the device are given and
+            they match the cached configuration, the cached
+            configuration is returned without a API request.
+
+            The returned configuration is frozen and shared with
+            other callers; use `copy()` on it to get a
+            configuration that can be changed.
 
         Parameters
         ----------
         device_mac : str
             The MAC address of the device
 
+        cfg_version : Optional[str]
+            The `cfg_version` of the device, as known by the
+            caller
+
+        known_cfgversion : Optional[str]
+            The `known_cfgversion` of the device, as known by the
+            caller
+
         Returns:
         --------
-        dict
+        NetworkDeviceSystemConfig
             The requested information
         """
 
+        # Check if we have the configuration for this version
+        cached = self.system_cfg_cache.get(device_mac)
+        if cached and cfg_version is not None:
+            if cached.is_version(cfg_version, known_cfgversion):
+                return cached
+
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
             method='GET',
             endpoint=f'proxy/network/api/s/default/stat/device/{device_mac}?cfg=system')
 
-        # Get the data and convert it to objects
-        data = resources.json()['data'][0]['system_cfg']
-        # TODO: Convert to object
-        resources_converted = data
-
-        # Return the devicelist
+        # Get the data. The response contains the versions of the
+        # configuration, so we only create a new object when the
+        # version changed
+        device = self.connection.decode(resources)['data'][0]
+        cfg_version = device.get('cfgversion')
+        known_cfgversion = device.get('known_cfgversion')
+        if cached and cached.is_version(cfg_version, known_cfgversion):
+            return cached
+
+        resources_converted = NetworkDeviceSystemConfig(
+            device['system_cfg'],
+            cfg_version=cfg_version,
+            known_cfgversion=known_cfgversion,
+            binding=self)
+        self.system_cfg_cache[device_mac] = resources_converted.freeze()
         return resources_converted
 
-    def get_active_clients(self) -> list[NetworkActiveClient]:
-        """ Method to get all active network clients
+    @profiled
+    def get_changed_system_cfgs(self,
+                                devices: Optional[list[NetworkDevice]] = None) -> dict[str, NetworkDeviceSystemConfig]:
+        """ Method to get the `system` configuration for all devices
+            where the configuration version changed since the last
+            call. Devices that did not change are skipped, so a
+            periodic sweep only retrieves the changed devices.
+
+            Parameters
+            ----------
+            devices : Optional[list[NetworkDevice]]
+                The devices to check. If not given, the devices are
+                retrieved with `get_devices`.
+
+            Returns
+            -------
+            dict[str, NetworkDeviceSystemConfig]
+                The configurations for the changed devices, keyed
+                on the MAC address
+        """
+        if devices is None:
+            devices = self.get_devices()
+
+        changed: dict[str, NetworkDeviceSystemConfig] = dict()
+        for device in self.cfg_tracker.changed_devices(devices):
+            changed[device.mac_address] = self.get_device_system_cfg(
+                device_mac=device.mac_address,
+                cfg_version=device.cfg_version,
+                known_cfgversion=device.known_cfgversion)
+
+            # Only mark the device when the configuration is
+            # retrieved, so failed devices are tried again
+            self.cfg_tracker.mark_seen(device)
+
+        return changed
+
+    @profiled
+    def get_client(self, client_mac: str) -> Optional[NetworkClient]:
+        """ Method to get one network client, active or inactive.
+            Lookups for the same client that are done at the same
+            time share one request and the client, so the client
+            is frozen.
 
             Parameters
             ----------
+            client_mac : str
+                The MAC address of the client
+
+            Returns
+            -------
+            NetworkClient
+                The requested client
+
             None
+                The client does not exist
+        """
+        def lookup() -> list[NetworkClient]:
+            # If not logged in; login
+            self.connection.ensure_logged_in()
+
+            # Execute the API request
+            resources = self.connection.request(
+                method='GET',
+                endpoint=f'proxy/network/api/s/default/stat/user/{client_mac}')
+
+            # Get the data and convert it to objects
+            data = self.connection.decode(resources).get('data', list())
+            return [client.freeze() for client in self.convert(data, NetworkClient)]
+
+        clients = self.lookups.do(('client', client_mac), lookup)
+        return clients[0] if clients else None
+
+    @profiled
+    def get_active_clients(self, query: Optional[UnipyQuery] = None) -> list[NetworkActiveClient]:
+        """ Method to get all active network clients
+
+            Parameters
+            ----------
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
 
             Returns
             -------
@@ -109,8 +396,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -118,19 +404,28 @@ class UnipyNetwork:
             endpoint='proxy/network/v2/api/site/default/clients/active')
 
         # Get the data and convert it to objects
-        data = resources.json()
-        resources_converted = [NetworkActiveClient(
-            resource) for resource in data]
+        data = self.connection.decode(resources)
+        resources_converted = self.convert(data, NetworkActiveClient, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_inactive_clients(self) -> list[NetworkInactiveClient]:
+    @profiled
+    def get_inactive_clients(self,
+                             query: Optional[UnipyQuery] = None,
+                             within_hours: int = 0) -> list[NetworkInactiveClient]:
         """ Method to get all inactive network clients
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
+
+            within_hours : int = 0
+                Only get the clients that were seen within this
+                number of hours. The controller does the
+                filtering. Use 0 to get all clients.
 
             Returns
             -------
@@ -139,28 +434,29 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
             method='GET',
-            endpoint='proxy/network/v2/api/site/default/clients/history?withinHours=0')
+            endpoint=f'proxy/network/v2/api/site/default/clients/history?withinHours={within_hours}')
 
         # Get the data and convert it to objects
-        data = resources.json()
-        resources_converted = [NetworkInactiveClient(
-            resource) for resource in data]
+        data = self.connection.decode(resources)
+        resources_converted = self.convert(data, NetworkInactiveClient, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_port_forwards(self) -> list[NetworkPortForward]:
+    @profiled
+    def get_port_forwards(self, query: Optional[UnipyQuery] = None) -> list[NetworkPortForward]:
         """ Method to get all port forwards
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
 
             Returns
             -------
@@ -169,8 +465,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -178,19 +473,21 @@ class UnipyNetwork:
             endpoint='proxy/network/api/s/default/rest/portforward')
 
         # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [NetworkPortForward(
-            resource) for resource in data]
+        data = self.connection.decode(resources)['data']
+        resources_converted = self.convert(data, NetworkPortForward, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_ssids(self) -> list[NetworkSSID]:
+    @profiled
+    def get_ssids(self, query: Optional[UnipyQuery] = None) -> list[NetworkSSID]:
         """ Method to get all SSIDs
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
 
             Returns
             -------
@@ -199,8 +496,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -208,19 +504,21 @@ class UnipyNetwork:
             endpoint='proxy/network/api/s/default/rest/wlanconf')
 
         # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [NetworkSSID(
-            resource) for resource in data]
+        data = self.connection.decode(resources)['data']
+        resources_converted = self.convert(data, NetworkSSID, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_firewall_groups(self) -> list[NetworkFirewallGroup]:
+    @profiled
+    def get_firewall_groups(self, query: Optional[UnipyQuery] = None) -> list[NetworkFirewallGroup]:
         """ Method to get all groups defined for the firewall
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
 
             Returns
             -------
@@ -229,8 +527,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -238,19 +535,21 @@ class UnipyNetwork:
             endpoint='proxy/network/api/s/default/rest/firewallgroup')
 
         # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [NetworkFirewallGroup(
-            resource) for resource in data]
+        data = self.connection.decode(resources)['data']
+        resources_converted = self.convert(data, NetworkFirewallGroup, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_firewall_configured_rules(self) -> list[NetworkFirewallRule]:
+    @profiled
+    def get_firewall_configured_rules(self, query: Optional[UnipyQuery] = None) -> list[NetworkFirewallRule]:
         """ Method to get all rules defined for the firewall
 
             Parameters
             ----------
-            None
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
 
             Returns
             -------
@@ -259,8 +558,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -268,15 +566,22 @@ class UnipyNetwork:
             endpoint='proxy/network/api/s/default/rest/firewallrule')
 
         # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [NetworkFirewallRule(
-            resource) for resource in data]
+        data = self.connection.decode(resources)['data']
+        resources_converted = self.convert(data, NetworkFirewallRule, query)
 
         # Return the devicelist
         return resources_converted
 
-    def get_firewall_rules(self) -> Optional[list]:
-        """ Method to get all default rules for the firewall
+    @profiled
+    def get_firewall_rules(self) -> NetworkFirewallChains:
+        """ Method to get all rules for the firewall; the
+            predefined rules of the router merged with the
+            configured rules. The rules are cached until the
+            configuration of the router changes.
+
+            The returned chains are frozen and shared with other
+            callers; use `copy()` on them to get chains that can be
+            changed.
 
             Parameters
             ----------
@@ -284,82 +589,80 @@ class UnipyNetwork:
 
             Returns
             -------
-            list[]
-                A list with network devices
-
-            None
-                No default firewall rules are found
+            NetworkFirewallChains
+                The chains with the rules, keyed on the name of
+                the chain
         """
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
-
-        # Get the rules that are configured
-        configured = self.get_firewall_configured_rules()
-        configured_names = [
-            f'{rule.chain}_{rule.chain_index}' for rule in configured]
+        self.connection.ensure_logged_in()
 
         # First, we have to find the router for this site
         routers: list[NetworkDeviceUGW] = [
-            x for x in self.get_devices() if x.type == 'ugw']
+            x for x in self.get_devices() if isinstance(x, NetworkDeviceUGW)]
 
         if len(routers) == 0:
             # No routers found!
             raise NoRoutersFoundError
 
+        # Every change to the firewall changes the configuration
+        # version of the router. If it didn't change, we can
+        # return the rules we assembled before
+        version_key = NetworkConfigTracker.version_key(routers[0])
+        if (self.firewall_rules_cache and
+                version_key[0] is not None and
+                self.firewall_rules_cache[0] == version_key):
+            return self.firewall_rules_cache[1]
+
+        # Get the rules that are configured
+        configured = self.get_firewall_configured_rules()
+
         # Get the predefined rules for each device
         try:
             firewall_rules = self.get_device_system_cfg(
-                device_mac=routers[0].mac_address)['firewall']
-            all_rules = firewall_rules['name']
-            all_rules.update(firewall_rules['ipv6-name'])
-        except (KeyError, IndexError):
+                device_mac=routers[0].mac_address,
+                cfg_version=routers[0].cfg_version,
+                known_cfgversion=routers[0].known_cfgversion).firewall
+            all_rules = dict(firewall_rules.chains)
+            all_rules.update(firewall_rules.ipv6_chains)
+        except (KeyError, IndexError, TypeError):
             raise NoFirewallsFoundError
 
-        # Loop through the chains and check out the rules
-        chains: dict[str, NetworkFirewallChain] = dict()
-        for chain, rules in all_rules.items():
-            # Create a chain object
-            chain_object = NetworkFirewallChain(rules)
-            chain_object.name = chain
-            if 'rule' in rules.keys():
-                chain_object.rules = list()
-                for rule, details in rules['rule'].items():
-                    if f'{chain}_{rule}' not in configured_names:
-                        # Not a configured rule, create a
-                        # NetworkFirewallRule for it.
-                        rule_object = NetworkFirewallRule()
-                        rule_object.name = details['description']
-                        rule_object.enabled = True
-                        rule_object.chain = chain
-                        rule_object.chain_index = int(rule)
-                        rule_object.action = details['action']
-                        rule_object.is_predefined = True
-                        chain_object.rules.append(rule_object)
-
-            # Add the chain to the chains list
-            chains[chain] = chain_object
-
-        # Add the configured rules
-        for configured_rule in configured:
-            if chains[configured_rule.chain].rules is None:
-                chains[configured_rule.chain].rules = list()
-            chains[configured_rule.chain].rules.append(configured_rule)
-
-        # Sort the rules
-        for chain, chain_object in chains.items():
-            if chain_object.rules:
-                chain_object.rules.sort(key=lambda rule: rule.chain_index)
+        # Merge the predefined and configured rules
+        with phase('post-processing'):
+            chains = NetworkFirewallChains.merge(all_rules, configured)
 
+        self.firewall_rules_cache = (version_key, chains.freeze())
         return chains
 
-    def get_sites(self) -> list[NetworkSite]:
-        """ Method to get all sites
+    @profiled
+    def get_topology(self) -> NetworkTopology:
+        """ Method to get the topology of the network, with the
+            devices and the active clients
 
             Parameters
             ----------
             None
 
+            Returns
+            -------
+            NetworkTopology
+                The topology of the network
+        """
+        devices = self.get_devices()
+        clients = self.get_active_clients()
+        with phase('post-processing'):
+            return NetworkTopology.build(devices=devices, clients=clients)
+
+    @profiled
+    def get_sites(self, query: Optional[UnipyQuery] = None) -> list[NetworkSite]:
+        """ Method to get all sites
+
+            Parameters
+            ----------
+            query : Optional[UnipyQuery]
+                If given, only the items that match the query are
+                converted to objects
+
             Returns
             -------
             list[NetworkDevice]
@@ -367,8 +670,7 @@ class UnipyNetwork:
         """
 
         # If not logged in; login
-        if self.connection.logged_in:
-            self.connection.login()
+        self.connection.ensure_logged_in()
 
         # Execute the API request
         resources = self.connection.request(
@@ -376,13 +678,84 @@ class UnipyNetwork:
             endpoint='proxy/network/api/self/sites')
 
         # Get the data and convert it to objects
-        data = resources.json()['data']
-        resources_converted = [NetworkSite(
-            resource) for resource in data]
+        data = self.connection.decode(resources)['data']
+        resources_converted = self.convert(data, NetworkSite, query)
 
         # Return the devicelist
         return resources_converted
 
+    def convert(self,
+                data: list[dict],
+                object_type: type[UnipyObject],
+                query: Optional[UnipyQuery] = None,
+                factory: Optional[Callable[[dict], UnipyObject]] = None,
+                keep: Iterable[str] = (),
+                bulk_factory: Optional[Callable[[list[dict]], list]] = None) -> list[UnipyObject]:
+        """ Method to convert the data from the API to objects. If
+            a query is given, the query is applied to the data
+            before the objects are created.
+
+            Parameters
+            ----------
+            data : list[dict]
+                The data from the API
+
+            object_type : type[UnipyObject]
+                The object type for the data
+
+            query : Optional[UnipyQuery]
+                The query to apply
+
+            factory : Optional[Callable[[dict], UnipyObject]]
+                Function to create the objects. Defaults to
+                `object_type`.
+
+            keep : Iterable[str]
+                API fields the factory needs, even if they are not
+                selected in the query
+
+            bulk_factory : Optional[Callable[[list[dict]], list]]
+                Function to create all objects at once. Is used
+                instead of `factory` when given.
+
+            Returns
+            -------
+            list[UnipyObject]
+                The created objects
+        """
+        with phase('object build'):
+            if query:
+                data = query.filter(data, object_type, keep)
+            if bulk_factory:
+                return bulk_factory(data)
+            factory = factory or object_type
+            return [factory(resource) for resource in data]
+
+    def device_class(self, device_type: Optional[str]) -> type[NetworkDevice]:
+        """ Method to get the class for a device type. Logs a
+            warning the first time a type without a registered
+            class is seen.
+
+            Parameters
+            ----------
+            device_type : Optional[str]
+                The `type` of the device from the API
+
+            Returns
+            -------
+            type[NetworkDevice]
+                The registered class, or NetworkDevice for unknown
+                types
+        """
+        class_object = NetworkDevice.class_for(device_type)
+        if class_object is None:
+            class_object = NetworkDevice
+            if device_type not in self.unknown_device_types:
+                self.unknown_device_types.add(device_type)
+                self.logger.warning(
+                    f'No class configured for devicetype "{device_type}" in "device_factory"')
+        return class_object
+
     def device_factory(self, data: dict) -> NetworkDevice:
         """ Method to create a NetworkDevice object of
             the correct type.
@@ -398,26 +771,37 @@ class UnipyNetwork:
             NetworkDevice
                 The created object
         """
-        # Object types
-        object_types = {
-            'ugw': NetworkDeviceUGW,
-            'usw': NetworkDeviceUSW,
-            'uap': NetworkDeviceUAP
-        }
-
-        # Find the correct class
-        class_object = NetworkDevice
-        if data['type'] in object_types.keys():
-            class_object = object_types[data['type']]
-        else:
-            self.logger.warning(
-                f'No class configured for devicetype "{data["type"]}" in "device_factory"')
+        class_object = self.device_class(data.get('type'))
+
+        # Create the object and bind it to this specific
+        # UnipyNetwork object
+        return class_object(data, self)
 
-        # Create the object
-        new_object = class_object(data)
+    def devices_factory(self, items: list[dict]) -> list[NetworkDevice]:
+        """ Method to create NetworkDevice objects of the correct
+            type for a list of devices. The devices are grouped on
+            type and every group is created in one pass.
 
-        # Bind this object to this specific UnipyNetwork object
-        new_object.bind(self)
+            Parameters
+            ----------
+            items : list[dict]
+                The data for the devices
 
-        # Return the object
-        return new_object
+            Returns
+            -------
+            list[NetworkDevice]
+                The created objects, in the order of the data
+        """
+        # Group the positions of the devices on type
+        groups: dict[Optional[str], list[int]] = dict()
+        for index, data in enumerate(items):
+            groups.setdefault(data.get('type'), list()).append(index)
+
+        devices: list = [None] * len(items)
+        for device_type, indexes in groups.items():
+            class_object = self.device_class(device_type)
+            created = class_object.from_api_list(
+                [items[index] for index in indexes], self)
+            for index, device in zip(indexes, created):
+                devices[index] = device
+        return devices
@@ -1,10 +1,15 @@
 """ Module that contains the baseclass for all objects returned
     from the API """
 
+from collections import Counter
+from copy import deepcopy
 from dataclasses import dataclass, fields
 from logging import getLogger
-from typing import Optional, Any
+from threading import Lock
+from typing import Callable, Iterable, Optional, Any
+from unipy.exceptions import FieldConversionError, FrozenObjectError
 from unipy.unipyapplication import UnipyApplication
+from unipy.unipyconverter import make_converter
 
 
 @dataclass
@@ -12,6 +17,7 @@ class ObjectField:
     type: type
     api_field: Optional[str] = None
     default: Any = None
+    intern: bool = False
 
 
 class UnipyObject:
@@ -19,7 +25,14 @@ class UnipyObject:
         the API
     """
 
-    __model = dict()
+    # If True, values from the API that can't be converted to the
+    # type of the field raise a FieldConversionError. If False,
+    # the value is kept as given by the API.
+    strict_conversion: bool = False
+
+    # Number of failed conversions per class, field and type
+    conversion_failures: Counter = Counter()
+    conversion_failures_lock = Lock()
 
     def __init__(self,
                  data: Optional[dict] = None,
@@ -42,23 +55,238 @@ class UnipyObject:
         # Set the binding
         self.binding: Optional[UnipyApplication] = binding
 
-        # Empty dict with API fields
-        self.api_fields = dict()
-
-        # Loop through all fields in the model, add it to the
-        # API cache and set the attribute with either the
-        # configured default value, or the default value for
-        # the configured object type
-        for field in dir(self.__class__):
-            attr = getattr(self, field)
-            if type(attr) is ObjectField:
-                self.api_fields[attr.api_field] = field
-                self.__model[field] = attr
-                setattr(self, field, attr.default)
+        # Set all fields of the model to the configured default
+        # value
+        self.__dict__.update(self.get_defaults())
 
         if data:
             self.set_from_api(data)
 
+    @classmethod
+    def get_fields(cls) -> dict[str, ObjectField]:
+        """ Method to get the fields of the model, in the order
+            they are declared. The result is cached per class.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            dict[str, ObjectField]
+                The fields, keyed on the attribute name
+        """
+        if '_object_fields' not in cls.__dict__:
+            object_fields: dict[str, ObjectField] = dict()
+            for klass in reversed(cls.__mro__):
+                for name, attr in vars(klass).items():
+                    if type(attr) is ObjectField:
+                        object_fields[name] = attr
+            cls._object_fields = object_fields
+        return cls._object_fields
+
+    @classmethod
+    def get_defaults(cls) -> dict[str, Any]:
+        """ Method to get the default values for the fields. The
+            result is cached per class.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            dict[str, Any]
+                The default values, keyed on the attribute name
+        """
+        if '_object_defaults' not in cls.__dict__:
+            cls._object_defaults = {
+                name: field.default for name, field in cls.get_fields().items()}
+        return cls._object_defaults
+
+    @classmethod
+    def get_converters(cls) -> dict[str, tuple[str, Callable[[Any], Any]]]:
+        """ Method to get the converters for the API fields. The
+            converters are created once per class. When multiple
+            fields use the same API field, the first declared field
+            is used.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            dict[str, tuple[str, Callable[[Any], Any]]]
+                The attribute name and the converter, keyed on the
+                API field
+        """
+        if '_object_converters' not in cls.__dict__:
+            converters: dict[str, tuple[str, Callable[[Any], Any]]] = dict()
+            for name, field in cls.get_fields().items():
+                if field.api_field is None or field.api_field in converters:
+                    continue
+                converters[field.api_field] = (
+                    name, make_converter(field.type, field.intern))
+            cls._object_converters = converters
+        return cls._object_converters
+
+    @classmethod
+    def from_api_list(cls,
+                      items: Iterable[dict],
+                      binding: Optional[UnipyApplication] = None) -> list['UnipyObject']:
+        """ Method to create objects for a list of dicts from the
+            API in one pass. The fields, defaults and logger are
+            looked up once for all objects. `__init__` is not
+            called, so this can only be used for classes where
+            `__init__` only fills the fields.
+
+            Parameters
+            ----------
+            items : Iterable[dict]
+                The data for the objects
+
+            binding : Optional[UnipyApplication]
+                The application to bind the objects to
+
+            Returns
+            -------
+            list[UnipyObject]
+                The created objects
+        """
+        defaults = cls.get_defaults()
+        shared = {'logger': getLogger(cls.__name__), 'binding': binding}
+        new = cls.__new__
+        objects = list()
+        for data in items:
+            new_object = new(cls)
+            values = new_object.__dict__
+            values.update(shared)
+            values.update(defaults)
+            if data:
+                new_object.set_from_api(data)
+            objects.append(new_object)
+        return objects
+
+    @classmethod
+    def report_conversion_failures(cls, reset: bool = True) -> dict[tuple[str, str, str], int]:
+        """ Method to log the number of failed conversions since the
+            last report
+
+            Parameters
+            ----------
+            reset : bool = True
+                If True, the counters are reset
+
+            Returns
+            -------
+            dict[tuple[str, str, str], int]
+                The number of failures, keyed on the class name,
+                the field name and the type given by the API
+        """
+        with cls.conversion_failures_lock:
+            failures = dict(UnipyObject.conversion_failures)
+            if reset:
+                UnipyObject.conversion_failures.clear()
+
+        for (class_name, field_name, value_type), count in failures.items():
+            getLogger(class_name).warning(
+                f'Field "{field_name}" could not be converted from "{value_type}" {count} times')
+        return failures
+
+    def to_dict(self) -> dict[str, Any]:
+        """ Method to get the values of all fields as a dict
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            dict[str, Any]
+                The values, keyed on the attribute name
+        """
+        return {name: getattr(self, name) for name in self.get_fields()}
+
+    def __getstate__(self) -> dict[str, Any]:
+        """ Leaves the logger and the binding out when the object is
+            pickled; they can't be shared with other processes """
+        state = dict(self.__dict__)
+        state.pop('logger', None)
+        state.pop('binding', None)
+        state.pop('_frozen', None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """ Restores a pickled object without a binding """
+        self.__dict__.update(state)
+        self.logger = getLogger(type(self).__name__)
+        self.binding = None
+
+    def __deepcopy__(self, memo: dict) -> 'UnipyObject':
+        """ Copies the values of the object; the logger and the
+            binding are shared with the copy. The copy is not
+            frozen. """
+        copied = type(self).__new__(type(self))
+        memo[id(self)] = copied
+        values = copied.__dict__
+        for name, value in self.__dict__.items():
+            if name in ('logger', 'binding'):
+                values[name] = value
+            elif name != '_frozen':
+                values[name] = deepcopy(value, memo)
+        return copied
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if '_frozen' in self.__dict__:
+            raise FrozenObjectError(
+                f'This "{type(self).__name__}" is shared and can\'t be changed; change a copy from copy()')
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if '_frozen' in self.__dict__:
+            raise FrozenObjectError(
+                f'This "{type(self).__name__}" is shared and can\'t be changed; change a copy from copy()')
+        object.__delattr__(self, name)
+
+    def freeze(self) -> 'UnipyObject':
+        """ Method to make the object read-only, because it is
+            shared between callers. Assigning a attribute raises a
+            FrozenObjectError. Lists and dicts in the fields are
+            not frozen; don't change them either.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            UnipyObject
+                This object
+        """
+        self.__dict__['_frozen'] = True
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        """ True if the object is shared and read-only """
+        return '_frozen' in self.__dict__
+
+    def copy(self) -> 'UnipyObject':
+        """ Method to get a copy of the object that can be changed,
+            also when this object is frozen
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            UnipyObject
+                The copy, bound to the same application
+        """
+        return deepcopy(self)
+
     def bind(self, unipynet_object: UnipyApplication) -> None:
         """ Method to bind this object to a UnipyNetwork
             object.
@@ -76,7 +304,8 @@ class UnipyObject:
 
     def set_from_api(self, data: dict) -> None:
         """ Method to set the values from a dict that comes
-            from the API.
+            from the API. The values are converted to the type of
+            the field with the converters of the class.
 
             Parameters
             ----------
@@ -87,23 +316,63 @@ class UnipyObject:
             -------
             None
 
+            Raises
+            ------
+            FieldConversionError
+                A value can't be converted and `strict_conversion`
+                is set
+        """
+        converters = self.get_converters()
+        values = self.__dict__
+        for field, value in data.items():
+            converter = converters.get(field)
+            if converter is None:
+                continue
+            field_name, convert = converter
+            if value is not None:
+                try:
+                    value = convert(value)
+                except (ValueError, TypeError) as error:
+                    self.conversion_failed(field_name, value, error)
+            values[field_name] = value
+
+    def conversion_failed(self, field_name: str, value: Any, error: Exception) -> None:
+        """ Method that is called when a value from the API can't be
+            converted. The failure is counted and only the first
+            failure for a field and type is logged, to prevent a
+            log line for every object in large responses.
+
             Parameters
             ----------
-            Parameters and their types
+            field_name : str
+                The name of the field
+
+            value : Any
+                The value from the API
+
+            error : Exception
+                The error from the converter
 
             Returns
             -------
-            Return values
+            None
+
+            Raises
+            ------
+            FieldConversionError
+                When `strict_conversion` is set
         """
-        for field, value in data.items():
-            if field in self.api_fields:
-                field_name = self.api_fields[field]
-                field_type = self.__model[field_name].type
-                if type(value) is not field_type:
-                    try:
-                        value = field_type(value)
-                    except ValueError as error:
-                        self.logger.warning(
-                            f'Field "{field_name}" should be of type "{field_type.__name__}" but API gives "{type(value).__name__}". Converting failed!')
-                        self.logger.debug(f'Error: {error}')
-                setattr(self, field_name, value)
+        field_type = self.get_fields()[field_name].type
+        if self.strict_conversion:
+            raise FieldConversionError(
+                f'Field "{field_name}" should be of type "{field_type.__name__}" but API gives "{type(value).__name__}"') from error
+
+        key = (type(self).__name__, field_name, type(value).__name__)
+        with self.conversion_failures_lock:
+            first = key not in UnipyObject.conversion_failures
+            UnipyObject.conversion_failures[key] += 1
+
+        if first:
+            self.logger.warning(
+                f'Field "{field_name}" should be of type "{field_type.__name__}" but API gives "{type(value).__name__}". Converting failed! Further failures are counted.')
+            self.logger.debug(f'Error: {error}')
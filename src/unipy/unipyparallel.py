@@ -0,0 +1,266 @@
+""" Module that contains functions to convert very large API
+    responses to objects in multiple processes. The document is
+    decoded once in this process and split in chunks, that are
+    sent to the workers as compact JSON. Every worker only parses
+    and converts its own chunks. Only the converted values are
+    sent back, as tuples or columns, so the items are never
+    pickled. """
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from sys import intern
+from typing import Any, Optional, Union
+from unipy.unipydecoder import UnipyDecoder, get_decoder
+from unipy.unipyobject import UnipyObject
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The smallest document in bytes that is converted in worker
+# processes. Smaller documents are converted in this process,
+# because starting the workers and sending the values back costs
+# more than the conversion. Measure with
+# `benchmarks/parallel_decode.py` to tune it for a machine.
+MIN_PARALLEL_SIZE = 16 * 1024 * 1024
+
+# The decoders of a worker process, keyed on the decoder type
+decoders: dict[type[UnipyDecoder], UnipyDecoder] = dict()
+
+
+def encode_chunk(items: list) -> bytes:
+    """ Function to encode a chunk of items as compact JSON for a
+        worker process. Uses `orjson` when it is installed.
+
+        Parameters
+        ----------
+        items : list
+            The items of the chunk
+
+        Returns
+        -------
+        bytes
+            The JSON document with the items
+    """
+    if orjson:
+        try:
+            return orjson.dumps(items)
+        except TypeError:
+            # Integers that don't fit in 64 bits
+            pass
+    return json.dumps(items, separators=(',', ':')).encode()
+
+
+def convert_chunk(object_type: type[UnipyObject],
+                  chunk: bytes,
+                  decoder_type: type[UnipyDecoder]) -> list[tuple]:
+    """ Function to convert a chunk of items in a worker process.
+        The items are converted with the normal conversion of the
+        object type; only the values of the fields are returned.
+
+        Parameters
+        ----------
+        object_type : type[UnipyObject]
+            The object type for the items
+
+        chunk : bytes
+            The JSON document with the items of the chunk
+
+        decoder_type : type[UnipyDecoder]
+            The type of the JSON decoder; created once per worker
+
+        Returns
+        -------
+        list[tuple]
+            The values for each item, in the order of the fields
+    """
+    decoder = decoders.get(decoder_type)
+    if decoder is None:
+        decoder = decoders[decoder_type] = decoder_type()
+    names = tuple(object_type.get_fields())
+    return [tuple(map(vars(converted).__getitem__, names))
+            for converted in object_type.from_api_list(decoder.decode(chunk))]
+
+
+def convert_chunk_columns(object_type: type[UnipyObject],
+                          chunk: bytes,
+                          decoder_type: type[UnipyDecoder]) -> list[list]:
+    """ Function to convert a chunk of items to columns in a
+        worker process
+
+        Parameters
+        ----------
+        object_type : type[UnipyObject]
+            The object type for the items
+
+        chunk : bytes
+            The JSON document with the items of the chunk
+
+        decoder_type : type[UnipyDecoder]
+            The type of the JSON decoder
+
+        Returns
+        -------
+        list[list]
+            The values per field, in the order of the fields
+    """
+    rows = convert_chunk(object_type, chunk, decoder_type)
+    return [list(column) for column in zip(*rows)] if rows else [
+        list() for _ in object_type.get_fields()]
+
+
+def columns_for(objects: list[UnipyObject],
+                object_type: type[UnipyObject]) -> dict[str, list]:
+    """ Function to get the values per field for objects """
+    return {name: [vars(converted)[name] for converted in objects]
+            for name in object_type.get_fields()}
+
+
+def build_objects(object_type: type[UnipyObject],
+                  names: tuple[str, ...],
+                  rows: list[tuple],
+                  binding: Any = None,
+                  interned: tuple[int, ...] = ()) -> list[UnipyObject]:
+    """ Function to create objects from values that are already
+        converted. The conversion is not done again; strings of
+        fields that are interned are interned again, because they
+        are copies from the worker process.
+
+        Parameters
+        ----------
+        object_type : type[UnipyObject]
+            The object type to create
+
+        names : tuple[str, ...]
+            The names of the fields
+
+        rows : list[tuple]
+            The values for each object
+
+        binding : Any
+            The application to bind the objects to
+
+        interned : tuple[int, ...]
+            The positions in the rows of the interned fields
+
+        Returns
+        -------
+        list[UnipyObject]
+            The created objects
+    """
+    template = object_type(binding=binding)
+    state = vars(template)
+    objects = list()
+    for row in rows:
+        new_object = object_type.__new__(object_type)
+        values = new_object.__dict__
+        values.update(state)
+        values.update(zip(names, row))
+        for index in interned:
+            value = row[index]
+            if type(value) is str:
+                values[names[index]] = intern(value)
+        objects.append(new_object)
+    return objects
+
+
+def decode_parallel(content: Union[bytes, list],
+                    object_type: type[UnipyObject],
+                    key: Optional[str] = None,
+                    workers: Optional[int] = None,
+                    chunks_per_worker: int = 2,
+                    columnar: bool = False,
+                    decoder: Union[str, UnipyDecoder, None] = None,
+                    binding: Any = None,
+                    min_size: int = MIN_PARALLEL_SIZE) -> Union[list[UnipyObject], dict[str, list]]:
+    """ Function to convert a large API response to objects or a
+        columnar batch with a pool of worker processes. Documents
+        smaller than `min_size`, already decoded lists and
+        machines with one CPU are converted in this process. The
+        workers create their own decoder of the same type as the
+        given decoder.
+
+        Parameters
+        ----------
+        content : Union[bytes, list]
+            The JSON document, or the already decoded list
+
+        object_type : type[UnipyObject]
+            The object type for the items
+
+        key : Optional[str]
+            The key in the document that contains the list. If not
+            given, the document is the list.
+
+        workers : Optional[int]
+            The number of worker processes. Defaults to the number
+            of CPUs.
+
+        chunks_per_worker : int = 2
+            The number of tasks per worker
+
+        columnar : bool = False
+            If True, a dict with a list of values per field is
+            returned instead of objects
+
+        decoder : Union[str, UnipyDecoder, None]
+            The JSON decoder to use
+
+        binding : Any
+            The application to bind the objects to
+
+        min_size : int = MIN_PARALLEL_SIZE
+            The smallest document in bytes to use workers for
+
+        Returns
+        -------
+        list[UnipyObject]
+            The created objects
+
+        dict[str, list]
+            The values per field, when `columnar` is True
+    """
+    decoder = get_decoder(decoder)
+    workers = workers or os.cpu_count() or 1
+
+    data = content
+    if not isinstance(content, list):
+        data = decoder.decode(content)
+        if key:
+            data = data[key]
+
+    if isinstance(content, list) or workers < 2 or len(content) < min_size:
+        objects = object_type.from_api_list(data, binding)
+        return columns_for(objects, object_type) if columnar else objects
+
+    names = tuple(object_type.get_fields())
+    interned = tuple(index for index, field in enumerate(object_type.get_fields().values())
+                     if field.intern)
+    parts = workers * chunks_per_worker
+    length = len(data)
+
+    # The chunks are encoded while the workers convert the ones
+    # that are already submitted
+    chunks = (encode_chunk(data[length * part // parts:length * (part + 1) // parts])
+              for part in range(parts))
+    decoder_types = [type(decoder)] * parts
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if columnar:
+            columns: dict[str, list] = {name: list() for name in names}
+            for batch in executor.map(convert_chunk_columns,
+                                      [object_type] * parts, chunks, decoder_types):
+                for name, values in zip(names, batch):
+                    columns[name].extend(values)
+            for index in interned:
+                columns[names[index]] = [
+                    intern(value) if type(value) is str else value
+                    for value in columns[names[index]]]
+            return columns
+
+        objects: list[UnipyObject] = list()
+        for rows in executor.map(convert_chunk,
+                                 [object_type] * parts, chunks, decoder_types):
+            objects.extend(build_objects(object_type, names, rows, binding, interned))
+        return objects
@@ -0,0 +1,317 @@
+""" Module that contains the profiler for the getters of the
+    `network` application. The profiler splits every call into
+    phases; waiting for the server, downloading the body, parsing
+    the JSON, building the objects and post-processing.
+
+    Profiling is off by default. Enable it with the `profile`
+    context manager, or set the `UNIPY_PROFILE` environment
+    variable. When the variable is a filename ending in `.json`, a
+    Chrome trace is written to it when the program exits; for other
+    values a table is printed to stderr. """
+
+import atexit
+import json
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from threading import Lock, get_ident, local
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Iterator, Optional
+
+# The phases, in the order they are reported
+PHASES = ('network wait', 'body download', 'json parse', 'object build',
+          'post-processing')
+
+
+class UnipyProfiler:
+    """ Class that collects the duration of the phases of profiled
+        calls. The durations are aggregated per call and phase;
+        the individual spans are kept for a trace, up to
+        `max_spans`. """
+
+    def __init__(self, max_spans: int = 100000) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            max_spans : int = 100000
+                The maximum number of spans to keep for the trace
+
+            Returns
+            -------
+            None
+        """
+        self.max_spans = max_spans
+        self.lock = Lock()
+        self.origin = perf_counter()
+        self.local = local()
+
+        # (call, phase) -> [count, total, min, max]
+        self.totals: dict[tuple[str, str], list] = dict()
+
+        # (name, category, start, duration, thread)
+        self.spans: list[tuple[str, str, float, float, int]] = list()
+
+    def current_call(self) -> str:
+        """ Method to get the innermost profiled call of this thread """
+        stack = getattr(self.local, 'calls', None)
+        return stack[-1] if stack else '(outside calls)'
+
+    def record(self, phase: str, start: float, duration: float) -> None:
+        """ Method to add the duration of a phase
+
+            Parameters
+            ----------
+            phase : str
+                The name of the phase
+
+            start : float
+                The `perf_counter` time the phase started
+
+            duration : float
+                The duration in seconds
+
+            Returns
+            -------
+            None
+        """
+        call = self.current_call()
+        with self.lock:
+            total = self.totals.get((call, phase))
+            if total is None:
+                self.totals[(call, phase)] = [1, duration, duration, duration]
+            else:
+                total[0] += 1
+                total[1] += duration
+                total[2] = min(total[2], duration)
+                total[3] = max(total[3], duration)
+            if len(self.spans) < self.max_spans:
+                self.spans.append((phase, call, start, duration, get_ident()))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """ Context manager to measure a phase of the current call
+
+            Parameters
+            ----------
+            name : str
+                The name of the phase
+
+            Returns
+            -------
+            Iterator[None]
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, perf_counter() - start)
+
+    @contextmanager
+    def call(self, name: str) -> Iterator[None]:
+        """ Context manager to measure a call. Phases measured
+            within the call are added to it.
+
+            Parameters
+            ----------
+            name : str
+                The name of the call
+
+            Returns
+            -------
+            Iterator[None]
+        """
+        stack = getattr(self.local, 'calls', None)
+        if stack is None:
+            stack = self.local.calls = list()
+        stack.append(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            self.record('total', start, duration)
+            stack.pop()
+
+    def report(self) -> str:
+        """ Method to create a table with the aggregated durations
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            str
+                The table
+        """
+        order = {phase: index for index, phase in enumerate(('total',) + PHASES)}
+        with self.lock:
+            rows = sorted(self.totals.items(), key=lambda item: (
+                item[0][0], order.get(item[0][1], len(order)), item[0][1]))
+
+        lines = [f'{"call":<32} {"phase":<16} {"count":>7} {"total ms":>11} '
+                 f'{"avg ms":>9} {"min ms":>9} {"max ms":>9}']
+        for (call, phase), (count, total, minimum, maximum) in rows:
+            lines.append(
+                f'{call:<32} {phase:<16} {count:>7} {total * 1000:>11.2f} '
+                f'{total / count * 1000:>9.2f} {minimum * 1000:>9.2f} {maximum * 1000:>9.2f}')
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict:
+        """ Method to create a trace in the Chrome trace format. The
+            trace can be opened in `chrome://tracing`, Perfetto or
+            speedscope.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            dict
+                The trace
+        """
+        pid = os.getpid()
+        with self.lock:
+            spans = list(self.spans)
+        events = [{
+            'name': call if phase == 'total' else phase,
+            'cat': call,
+            'ph': 'X',
+            'ts': (start - self.origin) * 1000000,
+            'dur': duration * 1000000,
+            'pid': pid,
+            'tid': thread
+        } for phase, call, start, duration, thread in spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: str) -> None:
+        """ Method to write the Chrome trace to a file
+
+            Parameters
+            ----------
+            path : str
+                The file to write
+
+            Returns
+            -------
+            None
+        """
+        with open(path, 'w') as trace:
+            json.dump(self.chrome_trace(), trace)
+
+
+# The active profiler; None when profiling is off
+active: Optional[UnipyProfiler] = None
+
+
+def phase(name: str) -> ContextManager:
+    """ Function to measure a phase with the active profiler. Does
+        nothing when profiling is off.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase
+
+        Returns
+        -------
+        ContextManager
+            Context manager that measures the phase
+    """
+    if active is None:
+        return nullcontext()
+    return active.phase(name)
+
+
+def record(name: str, start: float, duration: float) -> None:
+    """ Function to add a measured phase to the active profiler.
+        Does nothing when profiling is off. """
+    if active is not None:
+        active.record(name, start, duration)
+
+
+def profiled(method: Callable) -> Callable:
+    """ Decorator for methods that are profiled as a call. The
+        name of the call is the name of the method.
+
+        Parameters
+        ----------
+        method : Callable
+            The method to profile
+
+        Returns
+        -------
+        Callable
+            The decorated method
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = active
+        if profiler is None:
+            return method(*args, **kwargs)
+        with profiler.call(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def profile(path: Optional[str] = None,
+            profiler: Optional[UnipyProfiler] = None) -> Iterator[UnipyProfiler]:
+    """ Context manager that enables profiling
+
+        Example:
+            with profile('trace.json') as profiler:
+                network.get_devices()
+            print(profiler.report())
+
+        Parameters
+        ----------
+        path : Optional[str]
+            If given, the Chrome trace is written to this file when
+            the context exits
+
+        profiler : Optional[UnipyProfiler]
+            The profiler to use. Can be used to aggregate over
+            multiple blocks.
+
+        Returns
+        -------
+        Iterator[UnipyProfiler]
+            The profiler
+    """
+    global active
+    previous = active
+    active = profiler or UnipyProfiler()
+    try:
+        yield active
+    finally:
+        current = active
+        active = previous
+        if path:
+            current.dump(path)
+
+
+def profile_from_environment() -> None:
+    """ Function to enable profiling for the whole program when the
+        `UNIPY_PROFILE` environment variable is set """
+    global active
+    target = os.environ.get('UNIPY_PROFILE')
+    if not target or active is not None:
+        return
+
+    profiler = active = UnipyProfiler()
+
+    def write_results() -> None:
+        if target.endswith('.json'):
+            profiler.dump(target)
+        else:
+            print(profiler.report(), file=sys.stderr)
+    atexit.register(write_results)
+
+
+profile_from_environment()
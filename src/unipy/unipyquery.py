@@ -0,0 +1,268 @@
+""" Module that contains the class to filter and project the
+    results of getters before objects are created """
+
+import operator
+from typing import Any, Callable, Iterable, Optional, Union
+from unipy.unipyconverter import make_converter
+from unipy.unipyobject import ObjectField, UnipyObject
+
+# The operators that can be used in predicates
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, options: value in options,
+    'contains': lambda value, item: value is not None and item in value
+}
+
+
+def is_mac_field(name: str) -> bool:
+    """ Function to check if a field contains a MAC address. MAC
+        addresses are compared case-insensitive. """
+    return name == 'mac_address' or name.endswith('_mac')
+
+
+def comparable(name: str, field: ObjectField) -> Callable[[Any], Any]:
+    """ Function to create a function that converts a value for a
+        field the same way `UnipyObject.set_from_api` does, so raw
+        values and the values in predicates can be compared.
+        Values that can't be converted are kept; MAC addresses are
+        lowercased.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field
+
+        field : ObjectField
+            The field
+
+        Returns
+        -------
+        Callable[[Any], Any]
+            Function that converts a value
+    """
+    convert = make_converter(field.type)
+    mac = is_mac_field(name)
+
+    def converted(value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            value = convert(value)
+        except (ValueError, TypeError):
+            return value
+        if mac and type(value) is str:
+            value = value.lower()
+        return value
+
+    return converted
+
+
+class UnipyQuery:
+    """ Class that describes which items and fields a getter should
+        return. The predicates and the projection use the names of
+        the fields of the objects, but are applied to the raw
+        dicts from the API, so items that don't match are never
+        converted to objects. Only the values of the fields in the
+        predicates are converted, with the converters of the
+        fields, so `'true'` from the API matches `True`.
+
+        Example:
+            UnipyQuery(wired=True).where('blocked', '==', False).select(
+                'mac_address', 'hostname')
+    """
+
+    def __init__(self, **equals: Any) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            **equals : Any
+                Fields that should be equal to the given values
+
+            Returns
+            -------
+            None
+        """
+        self.predicates: list[tuple[str, str, Any]] = list()
+        self.fields: Optional[list[str]] = None
+        for field, value in equals.items():
+            self.where(field, '==', value)
+
+    def where(self,
+              field: str,
+              operation: Union[str, Callable[[Any], bool]],
+              value: Any = None) -> 'UnipyQuery':
+        """ Method to add a predicate to the query
+
+            Parameters
+            ----------
+            field : str
+                The name of the field
+
+            operation : Union[str, Callable[[Any], bool]]
+                The operator, for example '==' or 'in', or a
+                function that gets the value of the field and
+                returns True for items that should be returned
+
+            value : Any
+                The value to compare with
+
+            Returns
+            -------
+            UnipyQuery
+                This query, so calls can be chained
+        """
+        if not callable(operation) and operation not in OPERATORS:
+            raise ValueError(f'Unknown operator "{operation}"')
+        self.predicates.append((field, operation, value))
+        return self
+
+    def select(self, *fields: str) -> 'UnipyQuery':
+        """ Method to set the fields that should be filled in the
+            returned objects. Other fields keep their default.
+
+            Parameters
+            ----------
+            *fields : str
+                The names of the fields
+
+            Returns
+            -------
+            UnipyQuery
+                This query, so calls can be chained
+        """
+        self.fields = list(fields)
+        return self
+
+    def values_for(self, field: str) -> Optional[list]:
+        """ Method to get the values a field can have according to
+            the `==` and `in` predicates. Can be used by getters to
+            let the controller do the filtering. MAC addresses are
+            lowercased, like the controller gives them.
+
+            Parameters
+            ----------
+            field : str
+                The name of the field
+
+            Returns
+            -------
+            list
+                The values the field can have
+
+            None
+                The field is not restricted to a set of values
+        """
+        values = None
+        for predicate_field, operation, value in self.predicates:
+            if predicate_field != field:
+                continue
+            if operation == '==':
+                options = [value]
+            elif operation == 'in':
+                options = list(value)
+            else:
+                continue
+            if is_mac_field(field):
+                options = [option.lower() if type(option) is str else option
+                           for option in options]
+            values = options if values is None else [
+                option for option in values if option in options]
+        return values
+
+    def compile(self,
+                object_type: type[UnipyObject]) -> Callable[[dict], bool]:
+        """ Method to create a function that checks if a raw dict
+            from the API matches the predicates
+
+            Parameters
+            ----------
+            object_type : type[UnipyObject]
+                The object type the dicts are for
+
+            Returns
+            -------
+            Callable[[dict], bool]
+                Function that returns True for matching dicts
+        """
+        object_fields = object_type.get_fields()
+        checks = list()
+        for field, operation, value in self.predicates:
+            if field not in object_fields:
+                raise KeyError(
+                    f'Field "{field}" does not exist for "{object_type.__name__}"')
+            object_field = object_fields[field]
+            api_field = object_field.api_field
+            default = object_field.default
+            convert = comparable(field, object_field)
+            if callable(operation):
+                checks.append((api_field, default, convert, operation, None, True))
+                continue
+
+            # Convert the value of the predicate the same way as the
+            # values from the API
+            if operation == 'in':
+                value = [convert(option) for option in value]
+            elif operation != 'contains' or object_field.type is str:
+                value = convert(value)
+            checks.append(
+                (api_field, default, convert, OPERATORS[operation], value, False))
+
+        def matches(item: dict) -> bool:
+            for api_field, default, convert, function, value, unary in checks:
+                if api_field in item:
+                    field_value = convert(item[api_field])
+                else:
+                    field_value = default
+                try:
+                    if unary:
+                        result = function(field_value)
+                    else:
+                        result = function(field_value, value)
+                except TypeError:
+                    # Values that can't be compared don't match
+                    return False
+                if not result:
+                    return False
+            return True
+
+        return matches
+
+    def filter(self,
+               data: Iterable[dict],
+               object_type: type[UnipyObject],
+               keep: Iterable[str] = ()) -> list[dict]:
+        """ Method to filter and project raw dicts, without creating
+            objects
+
+            Parameters
+            ----------
+            data : Iterable[dict]
+                The raw dicts from the API
+
+            object_type : type[UnipyObject]
+                The object type the dicts are for
+
+            keep : Iterable[str]
+                API fields to keep, even if they are not selected
+
+            Returns
+            -------
+            list[dict]
+                The matching dicts, with only the selected API
+                fields
+        """
+        matches = self.compile(object_type)
+        if self.fields is None:
+            return [item for item in data if matches(item)]
+
+        object_fields = object_type.get_fields()
+        api_fields = {object_fields[field].api_field for field in self.fields}
+        api_fields.update(keep)
+        return [{key: value for key, value in item.items() if key in api_fields}
+                for item in data if matches(item)]
@@ -0,0 +1,322 @@
+""" Module that contains the scheduler to periodically execute
+    getters of the `network` application """
+
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from logging import getLogger
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Optional
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipynetwork import UnipyNetwork
+
+
+@dataclass
+class UnipySchedulerJob:
+    """ Dataclass for a job in the scheduler """
+    name: str
+    function: Callable[[], Any]
+    interval: float
+    connection: UnipyConnection
+    jitter: float = 0.1
+    callback: Optional[Callable[[Any], None]] = None
+    next_run: float = 0.0
+    running: bool = False
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    last_duration: Optional[float] = None
+    last_error: Optional[Exception] = field(default=None, repr=False)
+
+
+class UnipyScheduler:
+    """ Class that executes getters of `UnipyNetwork` objects on a
+        configured interval. When a job for a controller is due,
+        the jobs for that controller that are almost due are
+        started with it, so the controller is polled in bursts.
+        When a controller gets slower, the intervals for the jobs
+        for that controller are stretched. """
+
+    def __init__(self,
+                 max_workers: int = 8,
+                 merge_window: float = 1.0,
+                 max_backoff: float = 8.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            max_workers : int = 8
+                The maximum number of jobs that run at the same time
+
+            merge_window : float = 1.0
+                Jobs for a controller that are due within this
+                number of seconds are added to the batch for that
+                controller
+
+            max_backoff : float = 8.0
+                The maximum factor to stretch the intervals with
+                when a controller gets slower
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger('UnipyScheduler')
+        self.jobs: list[UnipySchedulerJob] = list()
+        self.max_workers = max_workers
+        self.merge_window = merge_window
+        self.max_backoff = max_backoff
+        self.lock = Lock()
+
+        # State of the background thread
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.stopped = Event()
+        self.thread: Optional[Thread] = None
+
+    def add(self,
+            function: Callable[[], Any],
+            interval: float,
+            jitter: float = 0.1,
+            callback: Optional[Callable[[Any], None]] = None,
+            network: Optional[UnipyNetwork] = None,
+            name: Optional[str] = None) -> UnipySchedulerJob:
+        """ Method to add a job to the scheduler. The first run is
+            at a random moment within the interval, to spread the
+            load of the jobs.
+
+            Parameters
+            ----------
+            function : Callable[[], Any]
+                The function to execute, for example
+                `network.get_active_clients`
+
+            interval : float
+                The seconds between executions
+
+            jitter : float = 0.1
+                The fraction of the interval that is randomly
+                added or removed for each run
+
+            callback : Optional[Callable[[Any], None]]
+                Function that is called with the result of each
+                run
+
+            network : Optional[UnipyNetwork]
+                The application the function uses. Only needed
+                when `function` is not a method of a
+                `UnipyNetwork` object.
+
+            name : Optional[str]
+                The name of the job. Defaults to the name of the
+                function.
+
+            Returns
+            -------
+            UnipySchedulerJob
+                The created job
+        """
+        if network is None:
+            network = getattr(function, '__self__', None)
+        if not isinstance(network, UnipyNetwork):
+            raise ValueError(
+                'Could not determine the UnipyNetwork object for the job')
+
+        job = UnipySchedulerJob(
+            name=name or getattr(function, '__name__', repr(function)),
+            function=function,
+            interval=interval,
+            connection=network.connection,
+            jitter=jitter,
+            callback=callback,
+            next_run=monotonic() + random.uniform(0, interval))
+
+        with self.lock:
+            self.jobs.append(job)
+        return job
+
+    def remove(self, job: UnipySchedulerJob) -> None:
+        """ Method to remove a job from the scheduler
+
+            Parameters
+            ----------
+            job : UnipySchedulerJob
+                The job to remove
+
+            Returns
+            -------
+            None
+        """
+        with self.lock:
+            if job in self.jobs:
+                self.jobs.remove(job)
+
+    def backoff(self, connection: UnipyConnection) -> float:
+        """ Method to get the factor to stretch the intervals with
+            for a controller. The factor is based on how much
+            slower the endpoints of the controller are than their
+            baselines.
+
+            Parameters
+            ----------
+            connection : UnipyConnection
+                The connection to the controller
+
+            Returns
+            -------
+            float
+                The factor, between 1 and `max_backoff`
+        """
+        return min(max(connection.slowdown(), 1.0), self.max_backoff)
+
+    def schedule_next(self, job: UnipySchedulerJob, now: float) -> None:
+        """ Method to set the next run for a job
+
+            Parameters
+            ----------
+            job : UnipySchedulerJob
+                The job to schedule
+
+            now : float
+                The current time
+
+            Returns
+            -------
+            None
+        """
+        interval = job.interval * self.backoff(job.connection)
+        interval *= 1 + random.uniform(-job.jitter, job.jitter)
+        job.next_run = now + interval
+
+    def tick(self) -> list[Future]:
+        """ Method to start all jobs that are due. Jobs that are
+            still running from the previous run are skipped
+            instead of queued.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            list[Future]
+                The futures for the started jobs
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='UnipyScheduler')
+
+        now = monotonic()
+        started: list[UnipySchedulerJob] = list()
+
+        with self.lock:
+            # Find the controllers that have due jobs
+            due_connections = {
+                id(job.connection) for job in self.jobs if job.next_run <= now}
+
+            for job in self.jobs:
+                if id(job.connection) not in due_connections:
+                    continue
+                if job.next_run > now + self.merge_window:
+                    continue
+                if job.running:
+                    if job.next_run > now:
+                        continue
+
+                    # The previous run is still busy; skip this run
+                    job.skipped += 1
+                    self.schedule_next(job, now)
+                    self.logger.debug(
+                        f'Skipping "{job.name}"; previous run is still running')
+                    continue
+                job.running = True
+                self.schedule_next(job, now)
+                started.append(job)
+
+        return [self.executor.submit(self.execute, job) for job in started]
+
+    def execute(self, job: UnipySchedulerJob) -> Any:
+        """ Method to execute a job
+
+            Parameters
+            ----------
+            job : UnipySchedulerJob
+                The job to execute
+
+            Returns
+            -------
+            Any
+                The result of the job
+        """
+        start = monotonic()
+        try:
+            result = job.function()
+            if job.callback:
+                job.callback(result)
+            job.last_error = None
+            return result
+        except Exception as error:
+            job.failures += 1
+            job.last_error = error
+            self.logger.warning(f'Job "{job.name}" failed: {error}')
+        finally:
+            job.runs += 1
+            job.last_duration = monotonic() - start
+            job.running = False
+
+    def start(self) -> None:
+        """ Method to start the scheduler in a background thread
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = Thread(
+            target=self.run, name='UnipyScheduler', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ Method to stop the scheduler. Running jobs are finished.
+
+            Parameters
+            ----------
+            timeout : Optional[float]
+                Seconds to wait for the background thread
+
+            Returns
+            -------
+            None
+        """
+        self.stopped.set()
+        if self.thread:
+            self.thread.join(timeout)
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def run(self) -> None:
+        """ Method that runs the scheduler until it is stopped. Is
+            started by `start`.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        while not self.stopped.is_set():
+            self.tick()
+            with self.lock:
+                next_run = min(
+                    (job.next_run for job in self.jobs), default=monotonic() + 1)
+            self.stopped.wait(min(max(next_run - monotonic(), 0.01), 1.0))
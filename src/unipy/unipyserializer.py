@@ -0,0 +1,406 @@
+""" Module that contains the functions to serialize UnipyObjects
+    to a compact binary format, without pickle. Only the fields of
+    the `ObjectField` schema are stored, keyed on the index of the
+    field; runtime attributes like the logger and the binding are
+    left out. UnipyObjects in fields, also in lists, are stored as
+    references to their own row, so they are rebuilt and bound too.
+    When the objects are loaded, they are bound to the given
+    application. Uses `msgpack` when it is installed, and
+    `marshal` from the standard library otherwise. `marshal` is
+    not stable between Python versions, so documents are only
+    loaded by the Python version that wrote them. """
+
+import marshal
+import os
+import tempfile
+from datetime import datetime
+from importlib import import_module
+from itertools import islice
+from logging import getLogger
+from pathlib import Path
+from sys import intern, version_info
+from time import time
+from typing import Any, Callable, Iterable, Optional, Union
+from unipy.unipyapplication import UnipyApplication
+from unipy.unipyobject import UnipyObject
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Version of the format. The first byte of a document is the
+# version, the second byte the container format, the third and
+# fourth byte the major and minor version of Python.
+FORMAT_VERSION = 3
+PYTHON_VERSION = bytes(version_info[:2])
+CONTAINER_MARSHAL = ord('m')
+CONTAINER_MSGPACK = ord('p')
+
+# Key for datetime values, which msgpack and marshal can't store
+DATETIME_KEY = '__datetime__'
+
+# Key for references to the row of a object in a field
+OBJECT_KEY = '__object__'
+
+
+def class_name(object_type: type) -> str:
+    """ Function to get the full name of a class """
+    return f'{object_type.__module__}:{object_type.__qualname__}'
+
+
+def load_class(name: str) -> type[UnipyObject]:
+    """ Function to get a class from its full name. Only subclasses
+        of UnipyObject in the `unipy` package can be loaded, so a
+        document can't import other modules.
+
+        Parameters
+        ----------
+        name : str
+            The full name from `class_name`
+
+        Returns
+        -------
+        type[UnipyObject]
+            The class
+
+        Raises
+        ------
+        ValueError
+            The class is not a UnipyObject of the `unipy` package
+    """
+    module_name, _, qualname = name.partition(':')
+    if module_name != 'unipy' and not module_name.startswith('unipy.'):
+        raise ValueError(f'"{name}" is not a class of the unipy package')
+    object_type: Any = import_module(module_name)
+    for part in qualname.split('.'):
+        object_type = getattr(object_type, part)
+    if not (isinstance(object_type, type) and issubclass(object_type, UnipyObject)):
+        raise ValueError(f'"{name}" is not a UnipyObject')
+    return object_type
+
+
+def dumps(objects: Iterable[UnipyObject], use_msgpack: Optional[bool] = None) -> bytes:
+    """ Function to serialize UnipyObjects. The document contains a
+        schema with the field names per class, and for every object
+        the index of its class and the values in the order of the
+        schema. Objects in fields get their own row and are stored
+        as a reference to it; a object that is used multiple times
+        is stored once.
+
+        Parameters
+        ----------
+        objects : Iterable[UnipyObject]
+            The objects to serialize
+
+        use_msgpack : Optional[bool]
+            If True, msgpack is used; if False, marshal is used. If
+            not given, msgpack is used when it is installed.
+
+        Returns
+        -------
+        bytes
+            The serialized objects
+    """
+    classes: dict[type, int] = dict()
+    schema: list[list] = list()
+    rows: list[list] = list()
+
+    # The fields per class that contain references, and the row
+    # per object. The objects are kept, so their id is not reused.
+    references: list[set[str]] = list()
+    added: dict[int, tuple[int, UnipyObject]] = dict()
+
+    def add(unipy_object: UnipyObject) -> int:
+        known = added.get(id(unipy_object))
+        if known is not None:
+            return known[0]
+
+        object_type = type(unipy_object)
+        index = classes.get(object_type)
+        if index is None:
+            index = classes[object_type] = len(schema)
+            schema.append([class_name(object_type), list(object_type.get_fields())])
+            references.append(set())
+
+        row = len(rows)
+        added[id(unipy_object)] = (row, unipy_object)
+        values = [index]
+        rows.append(values)
+        for name in schema[index][1]:
+            value = unipy_object.__dict__.get(name)
+            if type(value) is datetime:
+                value = {DATETIME_KEY: value.isoformat()}
+            elif isinstance(value, UnipyObject):
+                value = {OBJECT_KEY: add(value)}
+                references[index].add(name)
+            elif type(value) in (list, tuple) and any(
+                    isinstance(item, UnipyObject) for item in value):
+                value = [{OBJECT_KEY: add(item)} if isinstance(item, UnipyObject) else item
+                         for item in value]
+                references[index].add(name)
+            values.append(value)
+        return row
+
+    roots = [add(unipy_object) for unipy_object in objects]
+    for entry, fields in zip(schema, references):
+        entry.append(sorted(fields))
+
+    document = [FORMAT_VERSION, schema, rows, roots]
+    if use_msgpack is None:
+        use_msgpack = msgpack is not None
+    if use_msgpack:
+        return bytes((FORMAT_VERSION, CONTAINER_MSGPACK)) + PYTHON_VERSION + msgpack.packb(document)
+    return bytes((FORMAT_VERSION, CONTAINER_MARSHAL)) + PYTHON_VERSION + marshal.dumps(document)
+
+
+def loads(data: bytes, binding: Optional[UnipyApplication] = None) -> list[UnipyObject]:
+    """ Function to load serialized UnipyObjects. Fields that are
+        not in the stored schema get their default value, stored
+        fields that don't exist anymore are skipped. Strings of
+        fields that are interned are interned again. Objects in
+        fields are rebuilt and bound like the other objects; lists
+        of objects are loaded as lists.
+
+        Parameters
+        ----------
+        data : bytes
+            The output of `dumps`
+
+        binding : Optional[UnipyApplication]
+            The application to bind the objects to, for example
+            the UnipyNetwork of this process
+
+        Returns
+        -------
+        list[UnipyObject]
+            The loaded objects
+
+        Raises
+        ------
+        ValueError
+            The data is not a supported document, or is written
+            by another Python version
+    """
+    if len(data) < 4 or data[0] != FORMAT_VERSION:
+        raise ValueError('Unsupported serialization format')
+    if data[2:4] != PYTHON_VERSION:
+        raise ValueError(
+            f'The data is serialized by Python {data[2]}.{data[3]}, not by this version')
+    if data[1] == CONTAINER_MSGPACK:
+        if msgpack is None:
+            raise ValueError('The data is serialized with msgpack, which is not installed')
+        document = msgpack.unpackb(data[4:], strict_map_key=False)
+    elif data[1] == CONTAINER_MARSHAL:
+        document = marshal.loads(data[4:])
+    else:
+        raise ValueError('Unsupported serialization container')
+
+    _, schema, rows, roots = document
+    types = list()
+    for name, field_names, reference_names in schema:
+        object_type = load_class(name)
+        known = object_type.get_fields()
+        unknown = [field_name for field_name in field_names if field_name not in known]
+        datetimes = [field_name for field_name in field_names
+                     if field_name in known and known[field_name].type is datetime]
+        interned = [field_name for field_name in field_names
+                    if field_name in known and known[field_name].intern]
+        reference_names = [field_name for field_name in reference_names if field_name in known]
+        shared = {'logger': getLogger(object_type.__name__), 'binding': binding}
+        types.append((object_type, field_names, unknown, datetimes, interned,
+                      reference_names, object_type.get_defaults(), shared))
+
+    objects = list()
+    referencing = list()
+    for row in rows:
+        (object_type, field_names, unknown, datetimes, interned,
+         reference_names, defaults, shared) = types[row[0]]
+        unipy_object = object_type.__new__(object_type)
+        values = unipy_object.__dict__
+        values.update(shared)
+        values.update(defaults)
+        values.update(zip(field_names, islice(row, 1, None)))
+        for field_name in unknown:
+            del values[field_name]
+        for field_name in datetimes:
+            value = values[field_name]
+            if type(value) is dict and DATETIME_KEY in value:
+                values[field_name] = datetime.fromisoformat(value[DATETIME_KEY])
+        for field_name in interned:
+            value = values[field_name]
+            if type(value) is str:
+                values[field_name] = intern(value)
+        if reference_names:
+            referencing.append((values, reference_names))
+        objects.append(unipy_object)
+
+    # Replace the references by the objects, now they all exist
+    for values, reference_names in referencing:
+        for field_name in reference_names:
+            value = values[field_name]
+            if type(value) is dict and OBJECT_KEY in value:
+                values[field_name] = objects[value[OBJECT_KEY]]
+            elif type(value) in (list, tuple):
+                values[field_name] = [
+                    objects[item[OBJECT_KEY]] if type(item) is dict and OBJECT_KEY in item else item
+                    for item in value]
+    return [objects[row] for row in roots]
+
+
+class UnipyObjectCache:
+    """ Class for a cache of serialized UnipyObjects in a directory,
+        that can be shared by processes. Entries are written
+        atomically, so readers never see a partial entry. When a
+        entry is missing or expired, one process fetches the
+        objects while the others wait for it, on platforms with
+        `fcntl`. """
+
+    def __init__(self, directory: Union[str, Path], max_age: float = 60.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            directory : Union[str, Path]
+                The directory for the cache. Is created when it
+                does not exist, only accessible for the user.
+
+            max_age : float = 60.0
+                The seconds a entry can be used
+
+            Returns
+            -------
+            None
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    def path(self, key: str) -> Path:
+        """ Method to get the file for a key """
+        safe_key = ''.join(char if char.isalnum() or char in '-_.' else '_' for char in key)
+        return self.directory / f'{safe_key}.unipy'
+
+    def store(self, key: str, objects: Iterable[UnipyObject]) -> None:
+        """ Method to store objects in the cache
+
+            Parameters
+            ----------
+            key : str
+                The key for the objects, for example the name of
+                the getter
+
+            objects : Iterable[UnipyObject]
+                The objects to store
+
+            Returns
+            -------
+            None
+        """
+        data = dumps(objects)
+        path = self.path(key)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as output:
+                output.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def load(self,
+             key: str,
+             binding: Optional[UnipyApplication] = None,
+             max_age: Optional[float] = None) -> Optional[list[UnipyObject]]:
+        """ Method to load objects from the cache
+
+            Parameters
+            ----------
+            key : str
+                The key for the objects
+
+            binding : Optional[UnipyApplication]
+                The application to bind the objects to
+
+            max_age : Optional[float]
+                The seconds the entry can be used. Defaults to the
+                `max_age` of the cache.
+
+            Returns
+            -------
+            list[UnipyObject]
+                The objects
+
+            None
+                The entry does not exist, is expired or is written
+                by another Python version
+        """
+        max_age = self.max_age if max_age is None else max_age
+        path = self.path(key)
+        try:
+            if time() - path.stat().st_mtime > max_age:
+                return None
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            return loads(data, binding)
+        except ValueError:
+            # Written by another Python version or format; fetch
+            # the objects again
+            return None
+
+    def get(self,
+            key: str,
+            fetch: Callable[[], Iterable[UnipyObject]],
+            binding: Optional[UnipyApplication] = None,
+            max_age: Optional[float] = None) -> list[UnipyObject]:
+        """ Method to load objects from the cache, or to fetch and
+            store them when the entry is missing or expired
+
+            Example:
+                devices = cache.get(
+                    'devices', network.get_devices, binding=network)
+
+            Parameters
+            ----------
+            key : str
+                The key for the objects
+
+            fetch : Callable[[], Iterable[UnipyObject]]
+                Function that fetches the objects
+
+            binding : Optional[UnipyApplication]
+                The application to bind the objects to
+
+            max_age : Optional[float]
+                The seconds the entry can be used
+
+            Returns
+            -------
+            list[UnipyObject]
+                The objects
+        """
+        objects = self.load(key, binding, max_age)
+        if objects is not None:
+            return objects
+
+        with open(self.path(key).with_suffix('.lock'), 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another process could have fetched the objects
+                # while we waited for the lock
+                objects = self.load(key, binding, max_age)
+                if objects is None:
+                    objects = list(fetch())
+                    self.store(key, objects)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        return objects
@@ -0,0 +1,184 @@
+""" Module that contains the classes to coalesce identical calls
+    that are executed at the same time, and to batch calls for
+    different keys """
+
+from concurrent.futures import Future
+from threading import Event, Lock
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+
+class UnipySingleFlight:
+    """ Class that makes sure that only one call for a key is
+        executed at a time. Callers that ask for a key that is
+        already in flight wait for that call and get the same
+        result. Results can be kept for a short window, so calls
+        that arrive just after the call finished get the result
+        too. """
+
+    def __init__(self, window: float = 0.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            window : float = 0.0
+                The seconds to keep results after the call finished
+
+            Returns
+            -------
+            None
+        """
+        self.window = window
+        self.lock = Lock()
+        self.in_flight: dict[Hashable, Future] = dict()
+        self.results: dict[Hashable, tuple[float, Any]] = dict()
+
+        # The number of calls that were coalesced with another call
+        self.coalesced = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """ Method to execute a function, unless a call for the same
+            key is already in flight or finished within the window
+
+            Parameters
+            ----------
+            key : Hashable
+                The key that identifies identical calls
+
+            function : Callable[[], Any]
+                The function to execute
+
+            Returns
+            -------
+            Any
+                The result of the function
+        """
+        with self.lock:
+            if self.window:
+                result = self.results.get(key)
+                if result and monotonic() - result[0] < self.window:
+                    self.coalesced += 1
+                    return result[1]
+
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                result = function()
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            finally:
+                with self.lock:
+                    self.in_flight.pop(key, None)
+                    if self.window and future.exception() is None:
+                        self.expire()
+                        self.results[key] = (monotonic(), future.result())
+
+        return future.result()
+
+    def expire(self) -> None:
+        """ Method to remove the results that are older than the
+            window. Has to be called with the lock held.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        now = monotonic()
+        for key in [key for key, (finished, _) in self.results.items()
+                    if now - finished >= self.window]:
+            del self.results[key]
+
+
+class UnipyBatcher:
+    """ Class that collects the keys that are asked for by threads
+        within a short window, and gets the values for all of them
+        with one call. The first thread of a batch waits for the
+        window and executes the call; the other threads wait for
+        the result. """
+
+    def __init__(self,
+                 function: Callable[[list], dict],
+                 window: float = 0.01,
+                 max_batch: int = 100) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            function : Callable[[list], dict]
+                Function that gets the values for a list of keys,
+                as a dict keyed on the key. Keys without a value
+                are left out.
+
+            window : float = 0.01
+                The seconds to wait for other keys
+
+            max_batch : int = 100
+                The maximum number of keys in one call. A full
+                batch is executed without waiting for the window.
+
+            Returns
+            -------
+            None
+        """
+        self.function = function
+        self.window = window
+        self.max_batch = max_batch
+        self.lock = Lock()
+        self.pending: Optional[tuple[list, Future, Event]] = None
+
+        # The number of calls and the number of keys they got
+        self.calls = 0
+        self.keys = 0
+
+    def get(self, key: Hashable) -> Any:
+        """ Method to get the value for a key
+
+            Parameters
+            ----------
+            key : Hashable
+                The key
+
+            Returns
+            -------
+            Any
+                The value for the key, or None when the function
+                gave no value for it
+        """
+        with self.lock:
+            batch = self.pending
+            leader = batch is None
+            if leader:
+                batch = self.pending = (list(), Future(), Event())
+            keys, future, full = batch
+            if key not in keys:
+                keys.append(key)
+            if len(keys) >= self.max_batch:
+                self.pending = None
+                full.set()
+
+        if leader:
+            full.wait(self.window)
+            with self.lock:
+                if self.pending is batch:
+                    self.pending = None
+                self.calls += 1
+                self.keys += len(keys)
+            try:
+                future.set_result(self.function(list(keys)))
+            except BaseException as error:
+                future.set_exception(error)
+
+        return future.result().get(key)
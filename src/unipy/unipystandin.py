@@ -0,0 +1,798 @@
+""" Module that contains a local stand-in for a UnifiOS console.
+    The stand-in implements the endpoints that are used by the
+    library with a generated dataset, so the library can be tested
+    and load-tested without a real console. """
+
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import secrets
+import ssl
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from os import path
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic, sleep
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class UnipyStandInConfig:
+    """ Dataclass with the configuration for the stand-in """
+    username: str = 'admin'
+    password: str = 'password'
+    seed: int = 0
+
+    # The current time of the dataset; all timestamps are derived
+    # from it, so the same seed always gives the same data
+    epoch: int = 1700000000
+    switches: int = 4
+    access_points: int = 16
+    active_clients: int = 200
+    inactive_clients: int = 1000
+    configured_rules: int = 10
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    session_ttl: Optional[float] = None
+    unauthorized_status: int = 401
+    login_failed_status: int = 403
+    compression: bool = True
+
+
+@dataclass
+class UnipyStandInStats:
+    """ Dataclass with statistics of the stand-in """
+    logins: int = 0
+    failed_logins: int = 0
+    logouts: int = 0
+    requests: int = 0
+    errors: int = 0
+    unauthorized: int = 0
+    websockets: int = 0
+    paths: dict[str, int] = field(default_factory=dict)
+
+
+class UnipyStandInDataset:
+    """ Class that generates a deterministic dataset for the
+        stand-in. The same seed and sizes always give the same
+        data. """
+
+    def __init__(self, config: UnipyStandInConfig) -> None:
+        """ Generates the dataset
+
+            Parameters
+            ----------
+            config : UnipyStandInConfig
+                The configuration with the sizes and the seed
+
+            Returns
+            -------
+            None
+        """
+        self.random = random.Random(config.seed)
+        self.epoch = config.epoch
+        self.site_id = self.object_id()
+        self.cfgversion = f'{self.random.getrandbits(64):016x}'
+
+        self.devices: list[dict] = list()
+        gateway = self.device('ugw', 'UDMPRO', 'Gateway', None)
+        switches = [self.device('usw', 'US24P250', f'Switch {index}', gateway['mac'])
+                    for index in range(config.switches)]
+        for index in range(config.access_points):
+            uplink = switches[index % len(switches)]['mac'] if switches else gateway['mac']
+            self.device('uap', 'U6LR', f'Access point {index}', uplink)
+
+        access_points = [device for device in self.devices if device['type'] == 'uap']
+        self.active_clients = [self.client(index, access_points, True)
+                               for index in range(config.active_clients)]
+        self.inactive_clients = [self.client(index, access_points, False)
+                                 for index in range(config.inactive_clients)]
+
+        self.firewall_groups = [{
+            '_id': self.object_id(),
+            'name': f'Group {index}',
+            'group_type': 'address-group',
+            'group_members': [f'10.{index}.0.0/16'],
+            'site_id': self.site_id
+        } for index in range(4)]
+        self.firewall_rules = [{
+            '_id': self.object_id(),
+            'name': f'Rule {index}',
+            'enabled': True,
+            'ruleset': 'WAN_IN' if index % 2 else 'LAN_IN',
+            'rule_index': 2000 + index,
+            'action': 'accept' if index % 3 else 'drop',
+            'logging': False,
+            'src_firewallgroup_ids': list(),
+            'dst_firewallgroup_ids': list(),
+            'site_id': self.site_id
+        } for index in range(config.configured_rules)]
+        self.port_forwards = [{
+            '_id': self.object_id(),
+            'name': f'Forward {index}',
+            'enabled': True,
+            'dst_port': str(8000 + index),
+            'fwd_port': str(80 + index),
+            'fwd': f'192.168.1.{10 + index}',
+            'proto': 'tcp_udp',
+            'src': 'any',
+            'log': False,
+            'pfwd_interface': 'wan',
+            'site_id': self.site_id
+        } for index in range(3)]
+        self.ssids = [{
+            '_id': self.object_id(),
+            'name': f'Network {index}',
+            'enabled': True,
+            'security': 'wpapsk',
+            'wpa_mode': 'wpa2',
+            'wpa_enc': 'ccmp',
+            'x_passphrase': f'{self.random.getrandbits(64):016x}',
+            'site_id': self.site_id
+        } for index in range(2)]
+        self.sites = [{
+            '_id': self.site_id,
+            'anonymous_id': self.object_id(),
+            'name': 'default',
+            'desc': 'Default',
+            'role': 'admin',
+            'attr_hidden_id': 'default'
+        }]
+
+    def object_id(self) -> str:
+        """ Method to generate a ID like the IDs of the API """
+        return f'{self.random.getrandbits(96):024x}'
+
+    def mac(self) -> str:
+        """ Method to generate a MAC address """
+        return ':'.join(f'{self.random.randrange(256):02x}' for _ in range(6))
+
+    def device(self, device_type: str, model: str, name: str, uplink: Optional[str]) -> dict:
+        """ Method to generate a device and add it to the dataset
+
+            Parameters
+            ----------
+            device_type : str
+                The type of the device
+
+            model : str
+                The model of the device
+
+            name : str
+                The name of the device
+
+            uplink : Optional[str]
+                The MAC address of the uplink device
+
+            Returns
+            -------
+            dict
+                The generated device
+        """
+        uptime = self.random.randrange(3600, 10 ** 7)
+        device = {
+            '_id': self.object_id(),
+            'mac': self.mac(),
+            'ip': f'192.168.1.{len(self.devices) + 1}',
+            'type': device_type,
+            'model': model,
+            'name': name,
+            'version': '7.0.23',
+            'adopted': True,
+            'site_id': self.site_id,
+            'cfgversion': self.cfgversion,
+            'known_cfgversion': self.cfgversion,
+            'serial': f'{self.random.getrandbits(48):012X}',
+            'state': 1,
+            'upgradable': self.random.random() < 0.2,
+            'uptime': uptime,
+            'startup_timestamp': self.epoch - uptime,
+            'last_seen': self.epoch,
+            'tx_bytes': self.random.getrandbits(40),
+            'rx_bytes': self.random.getrandbits(40)
+        }
+        if uplink:
+            device['uplink'] = {'uplink_mac': uplink, 'type': 'wire'}
+        self.devices.append(device)
+        return device
+
+    def client(self, index: int, access_points: list[dict], active: bool) -> dict:
+        """ Method to generate a client
+
+            Parameters
+            ----------
+            index : int
+                The number of the client
+
+            access_points : list[dict]
+                The access points the client can connect to
+
+            active : bool
+                If True, a active client is generated
+
+            Returns
+            -------
+            dict
+                The generated client
+        """
+        wired = self.random.random() < 0.3 or not access_points
+        first_seen = self.epoch - self.random.randrange(86400, 86400 * 365)
+        client = {
+            'id': self.object_id(),
+            'mac': self.mac(),
+            'hostname': f'host-{"a" if active else "i"}{index}',
+            'display_name': f'Client {index}',
+            'blocked': self.random.random() < 0.02,
+            'first_seen': first_seen,
+            'last_seen': self.epoch - (0 if active else self.random.randrange(86400)),
+            'ip': f'10.0.{index // 250 % 250}.{index % 250 + 2}',
+            'status': 'online' if active else 'offline',
+            'type': 'WIRED' if wired else 'WIRELESS',
+            'is_wired': wired,
+            'unifi_device': False,
+            'use_fixedip': False,
+            'site_id': self.site_id
+        }
+        if active:
+            client['uptime'] = self.random.randrange(60, 86400)
+            if not wired:
+                client['ap_mac'] = self.random.choice(access_points)['mac']
+        return client
+
+    def system_cfg(self, device: dict) -> dict:
+        """ Method to generate the `system` configuration for a
+            device
+
+            Parameters
+            ----------
+            device : dict
+                The device
+
+            Returns
+            -------
+            dict
+                The configuration
+        """
+        chains = dict()
+        for chain in ('WAN_IN', 'WAN_LOCAL', 'LAN_IN'):
+            chains[chain] = {
+                'default-action': 'drop',
+                'description': f'{chain} chain',
+                'rule': {
+                    str(3000 + index): {
+                        'description': f'Predefined {index}',
+                        'action': 'accept'
+                    } for index in range(3)}
+            }
+        return {
+            'firewall': {
+                'name': chains,
+                'ipv6-name': {'WANv6_IN': {'default-action': 'drop'}},
+                'all-ping': 'enable'
+            },
+            'interfaces': {
+                'ethernet': {f'eth{index}': {'description': f'Port {index}'}
+                             for index in range(4)}
+            },
+            'system': {'host-name': device.get('name')}
+        }
+
+
+class UnipyStandInServer:
+    """ Class that runs a local HTTPS server that behaves like a
+        UnifiOS console with the `network` application. The server
+        runs in a background thread, so it can be used in-process.
+
+        Example:
+            with UnipyStandInServer(UnipyStandInConfig(latency=0.05)) as standin:
+                connection = UnipyConnection(
+                    standin.server, 'admin', 'password', verify=False)
+    """
+
+    def __init__(self,
+                 config: Optional[UnipyStandInConfig] = None,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 certfile: Optional[str] = None,
+                 keyfile: Optional[str] = None) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            config : Optional[UnipyStandInConfig]
+                The configuration for the stand-in
+
+            host : str = '127.0.0.1'
+                The address to listen on
+
+            port : int = 0
+                The port to listen on. Use 0 for a free port.
+
+            certfile : Optional[str]
+                The certificate to use. If not given, a
+                self-signed certificate is generated with the
+                `openssl` command.
+
+            keyfile : Optional[str]
+                The private key for the certificate
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger('UnipyStandInServer')
+        self.config = config or UnipyStandInConfig()
+        self.dataset = UnipyStandInDataset(self.config)
+        self.stats = UnipyStandInStats()
+        self.host = host
+        self.port = port
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.lock = Lock()
+        self.random = random.Random(self.config.seed)
+
+        # Sessions: token -> (CSRF token, time of login)
+        self.sessions: dict[str, tuple[str, float]] = dict()
+
+        # Queues with the messages for the opened websockets
+        self.websockets: list[Queue] = list()
+
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[Thread] = None
+        self.tempdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def server(self) -> str:
+        """ The server name to use for `UnipyConnection` """
+        return f'{self.host}:{self.port}'
+
+    def generate_certificate(self) -> None:
+        """ Method to generate a self-signed certificate
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.tempdir = tempfile.TemporaryDirectory(prefix='unipy-standin-')
+        self.certfile = path.join(self.tempdir.name, 'cert.pem')
+        self.keyfile = path.join(self.tempdir.name, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-keyout', self.keyfile, '-out', self.certfile, '-days', '1',
+             '-subj', '/CN=localhost'],
+            check=True, capture_output=True)
+
+    def start(self) -> None:
+        """ Method to start the server in a background thread
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.certfile is None:
+            self.generate_certificate()
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.certfile, self.keyfile)
+
+        handler = type('Handler', (UnipyStandInHandler,), {'standin': self})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.socket = context.wrap_socket(
+            self.httpd.socket, server_side=True)
+        self.port = self.httpd.server_address[1]
+
+        self.thread = Thread(
+            target=self.httpd.serve_forever, name='UnipyStandInServer', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """ Method to stop the server
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if self.tempdir:
+            self.tempdir.cleanup()
+            self.tempdir = None
+            self.certfile = None
+            self.keyfile = None
+
+    def __enter__(self) -> 'UnipyStandInServer':
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def expire_sessions(self) -> None:
+        """ Method to let all sessions expire, so the next request
+            is unauthorized
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        with self.lock:
+            self.sessions.clear()
+
+    def publish(self, message_type: str, data: list[dict]) -> None:
+        """ Method to send a event message to all opened websockets
+
+            Parameters
+            ----------
+            message_type : str
+                The type of the message, like `sta:sync`
+
+            data : list[dict]
+                The items of the message
+
+            Returns
+            -------
+            None
+        """
+        message = json.dumps({'meta': {'rc': 'ok', 'message': message_type}, 'data': data})
+        with self.lock:
+            for queue in self.websockets:
+                queue.put(message)
+
+    def close_websockets(self) -> None:
+        """ Method to close all opened websockets, like a console
+            that restarts
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        with self.lock:
+            for queue in self.websockets:
+                queue.put(None)
+
+
+class UnipyStandInHandler(BaseHTTPRequestHandler):
+    """ Class that handles the requests for the stand-in """
+
+    standin: UnipyStandInServer
+    protocol_version = 'HTTP/1.1'
+
+    # Routes for the `network` application
+    routes = [
+        ('GET', r'api/s/[^/]+/stat/device/(?P<mac>[^/?]+)', 'device'),
+        ('GET', r'api/s/[^/]+/stat/device', 'devices'),
+        ('POST', r'api/s/[^/]+/stat/device', 'devices'),
+        ('GET', r'api/s/[^/]+/stat/user/(?P<mac>[^/?]+)', 'user'),
+        ('GET', r'api/s/[^/]+/rest/portforward', 'port_forwards'),
+        ('GET', r'api/s/[^/]+/rest/wlanconf', 'ssids'),
+        ('GET', r'api/s/[^/]+/rest/firewallgroup', 'firewall_groups'),
+        ('GET', r'api/s/[^/]+/rest/firewallrule', 'firewall_rules'),
+        ('GET', r'api/self/sites', 'sites'),
+        ('GET', r'v2/api/site/[^/]+/clients/active', 'active_clients'),
+        ('GET', r'v2/api/site/[^/]+/clients/history', 'inactive_clients')
+    ]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        self.standin.logger.debug(format % args)
+
+    def do_GET(self) -> None:
+        self.handle_request('GET')
+
+    def do_POST(self) -> None:
+        self.handle_request('POST')
+
+    def send_json(self,
+                  status: int,
+                  body: Any,
+                  headers: Optional[dict[str, str]] = None) -> None:
+        """ Method to send a JSON response
+
+            Parameters
+            ----------
+            status : int
+                The HTTP status
+
+            body : Any
+                The body to send as JSON
+
+            headers : Optional[dict[str, str]]
+                Extra headers to send
+
+            Returns
+            -------
+            None
+        """
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+
+        # Compress larger bodies when the client accepts gzip, like
+        # the console does
+        accepted = self.headers.get('Accept-Encoding', '')
+        if (self.standin.config.compression and len(content) > 1024 and
+                'gzip' in [encoding.strip() for encoding in accepted.split(',')]):
+            content = gzip.compress(content, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or dict()).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def read_body(self) -> Any:
+        """ Method to read the JSON body of the request """
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def session_token(self) -> Optional[str]:
+        """ Method to get the valid session token of the request
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            str
+                The session token
+
+            None
+                The request has no valid session
+        """
+        cookies = SimpleCookie(self.headers.get('Cookie', ''))
+        if 'TOKEN' not in cookies:
+            return None
+        token = cookies['TOKEN'].value
+        standin = self.standin
+        with standin.lock:
+            session = standin.sessions.get(token)
+            if session is None:
+                return None
+            if (standin.config.session_ttl is not None and
+                    monotonic() - session[1] > standin.config.session_ttl):
+                standin.sessions.pop(token, None)
+                return None
+        return token
+
+    def handle_request(self, method: str) -> None:
+        """ Method to handle a request
+
+            Parameters
+            ----------
+            method : str
+                The HTTP method
+
+            Returns
+            -------
+            None
+        """
+        standin = self.standin
+        config = standin.config
+        url = urlsplit(self.path)
+        endpoint = url.path.lstrip('/')
+        body = self.read_body()
+
+        with standin.lock:
+            standin.stats.requests += 1
+            standin.stats.paths[endpoint] = standin.stats.paths.get(endpoint, 0) + 1
+            delay = config.latency + standin.random.uniform(0, config.latency_jitter)
+            fail = standin.random.random() < config.error_rate
+
+        if delay:
+            sleep(delay)
+
+        if endpoint == 'api/auth/login' and method == 'POST':
+            return self.login(body)
+        if endpoint == 'api/auth/logout' and method == 'POST':
+            return self.logout()
+
+        # Everything else needs a session
+        token = self.session_token()
+        if token is None:
+            with standin.lock:
+                standin.stats.unauthorized += 1
+            return self.send_json(config.unauthorized_status, {
+                'meta': {'rc': 'error', 'msg': 'api.err.LoginRequired'}, 'data': []})
+
+        if method != 'GET':
+            csrf_token = standin.sessions.get(token, ('', 0))[0]
+            if self.headers.get('X-CSRF-Token') != csrf_token:
+                return self.send_json(403, {
+                    'meta': {'rc': 'error', 'msg': 'api.err.InvalidCSRFToken'}, 'data': []})
+
+        if fail:
+            with standin.lock:
+                standin.stats.errors += 1
+            return self.send_json(config.error_status, {
+                'meta': {'rc': 'error', 'msg': 'api.err.ServerError'}, 'data': []})
+
+        if (method == 'GET' and re.fullmatch(r'proxy/network/wss/s/[^/]+/events', endpoint) and
+                self.headers.get('Upgrade', '').lower() == 'websocket'):
+            return self.websocket()
+
+        if endpoint.startswith('proxy/network/'):
+            endpoint = endpoint[len('proxy/network/'):]
+            for route_method, pattern, name in self.routes:
+                match = re.fullmatch(pattern, endpoint)
+                if match and route_method == method:
+                    status, response = getattr(self, f'route_{name}')(
+                        parse_qs(url.query), body, **match.groupdict())
+                    return self.send_json(status, response)
+
+        self.send_json(404, {'meta': {'rc': 'error', 'msg': 'api.err.NotFound'}, 'data': []})
+
+    def login(self, body: Any) -> None:
+        """ Method to handle a login """
+        standin = self.standin
+        config = standin.config
+        if (not isinstance(body, dict) or
+                body.get('username') != config.username or
+                body.get('password') != config.password):
+            with standin.lock:
+                standin.stats.failed_logins += 1
+            return self.send_json(config.login_failed_status, {
+                'code': 'AUTHENTICATION_FAILED_INVALID_CREDENTIALS'})
+
+        token = secrets.token_hex(16)
+        csrf_token = secrets.token_hex(16)
+        with standin.lock:
+            standin.stats.logins += 1
+            standin.sessions[token] = (csrf_token, monotonic())
+        self.send_json(200, {'username': config.username}, {
+            'X-CSRF-Token': csrf_token,
+            'Set-Cookie': f'TOKEN={token}; path=/; secure; httponly'})
+
+    def logout(self) -> None:
+        """ Method to handle a logout """
+        standin = self.standin
+        token = self.session_token()
+        if token is None:
+            return self.send_json(standin.config.unauthorized_status, {})
+        with standin.lock:
+            standin.stats.logouts += 1
+            standin.sessions.pop(token, None)
+        self.send_json(200, {}, {'Set-Cookie': 'TOKEN=; path=/; max-age=0'})
+
+    def websocket(self) -> None:
+        """ Method to handle the websocket with events. Sends the
+            messages that are published on the stand-in, until the
+            websocket is closed by either side. Messages from the
+            client are not read. """
+        standin = self.standin
+        key = self.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1(
+            (key + '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        queue: Queue = Queue()
+        with standin.lock:
+            standin.stats.websockets += 1
+            standin.websockets.append(queue)
+        try:
+            while standin.httpd is not None:
+                try:
+                    message = queue.get(timeout=0.1)
+                except Empty:
+                    continue
+                if message is None:
+                    # Close frame with status 1001, going away
+                    self.wfile.write(b'\x88\x02\x03\xe9')
+                    self.wfile.flush()
+                    return
+                self.wfile.write(self.websocket_frame(message.encode()))
+                self.wfile.flush()
+        except OSError:
+            return
+        finally:
+            with standin.lock:
+                standin.websockets.remove(queue)
+
+    @staticmethod
+    def websocket_frame(payload: bytes) -> bytes:
+        """ Method to create a unmasked websocket text frame """
+        if len(payload) < 126:
+            header = bytes((0x81, len(payload)))
+        elif len(payload) < 1 << 16:
+            header = bytes((0x81, 126)) + len(payload).to_bytes(2, 'big')
+        else:
+            header = bytes((0x81, 127)) + len(payload).to_bytes(8, 'big')
+        return header + payload
+
+    @staticmethod
+    def envelope(data: list) -> dict:
+        """ Method to wrap data like the `api` endpoints do """
+        return {'meta': {'rc': 'ok'}, 'data': data}
+
+    def route_device(self, query: dict, body: Any, mac: str) -> tuple[int, Any]:
+        dataset = self.standin.dataset
+        for device in dataset.devices:
+            if device['mac'] == mac:
+                if query.get('cfg') == ['system']:
+                    device = dict(device, system_cfg=dataset.system_cfg(device))
+                return 200, self.envelope([device])
+        return 400, {'meta': {'rc': 'error', 'msg': 'api.err.UnknownDevice'}, 'data': []}
+
+    def route_devices(self, query: dict, body: Any) -> tuple[int, Any]:
+        devices = self.standin.dataset.devices
+        if isinstance(body, dict) and 'macs' in body:
+            macs = set(body['macs'])
+            devices = [device for device in devices if device['mac'] in macs]
+        return 200, self.envelope(devices)
+
+    def route_user(self, query: dict, body: Any, mac: str) -> tuple[int, Any]:
+        dataset = self.standin.dataset
+        for client in dataset.active_clients + dataset.inactive_clients:
+            if client['mac'] == mac:
+                return 200, self.envelope([client])
+        return 400, {'meta': {'rc': 'error', 'msg': 'api.err.UnknownUser'}, 'data': []}
+
+    def route_port_forwards(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.envelope(self.standin.dataset.port_forwards)
+
+    def route_ssids(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.envelope(self.standin.dataset.ssids)
+
+    def route_firewall_groups(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.envelope(self.standin.dataset.firewall_groups)
+
+    def route_firewall_rules(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.envelope(self.standin.dataset.firewall_rules)
+
+    def route_sites(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.envelope(self.standin.dataset.sites)
+
+    def route_active_clients(self, query: dict, body: Any) -> tuple[int, Any]:
+        return 200, self.standin.dataset.active_clients
+
+    def route_inactive_clients(self, query: dict, body: Any) -> tuple[int, Any]:
+        clients = self.standin.dataset.inactive_clients
+        within_hours = int(query.get('withinHours', ['0'])[0])
+        if within_hours:
+            since = self.standin.dataset.epoch - within_hours * 3600
+            clients = [client for client in clients if client['last_seen'] >= since]
+        return 200, clients
@@ -0,0 +1,568 @@
+""" Module that contains the transports for UnipyConnection. A
+    transport sends a prepared request and returns the response.
+    Besides the default transport, there are transports to record
+    the traffic with a server to a archive and to replay it
+    without a server. """
+
+import gzip
+import json
+import zlib
+from datetime import timedelta
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from time import sleep
+from typing import Any, Iterator, Optional, Union
+from urllib.parse import urlsplit
+from requests import PreparedRequest, Response, Session
+from requests.exceptions import ConnectionError, ReadTimeout
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+from unipy.exceptions import ResponseTooLargeError
+
+# Endpoints that have credentials in the request body
+CREDENTIAL_ENDPOINTS = frozenset(('api/auth/login',))
+
+# Response headers that are not recorded. The session cookie is
+# a secret, and the body is recorded decompressed.
+SKIPPED_HEADERS = frozenset(('set-cookie', 'content-encoding', 'content-length'))
+
+# Response headers that are recorded with a placeholder value,
+# because they contain session secrets
+MASKED_HEADERS = frozenset(('x-csrf-token',))
+
+
+# The size of the chunks to read from the server
+CHUNK_SIZE = 64 * 1024
+
+
+class UnipyDecompressor:
+    """ Class that decompresses a body while it is read. The
+        algorithms are tried in order of preference; `zstd` and
+        `br` are only available when the `zstandard` and `brotli`
+        packages are installed. """
+
+    def __init__(self, encoding: str) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            encoding : str
+                The `Content-Encoding` of the body
+
+            Returns
+            -------
+            None
+
+            Raises
+            ------
+            ValueError
+                The encoding is not supported
+        """
+        self.encoding = encoding
+        self.flush = lambda: b''
+        if encoding == 'gzip':
+            decompressor = zlib.decompressobj(wbits=31)
+            self.decompress = decompressor.decompress
+            self.flush = decompressor.flush
+        elif encoding == 'deflate':
+            decompressor = zlib.decompressobj()
+            self.decompress = decompressor.decompress
+            self.flush = decompressor.flush
+        elif encoding == 'br':
+            brotli = import_optional('brotli', 'brotlicffi')
+            if brotli is None:
+                raise ValueError('Brotli is not installed')
+            self.decompress = brotli.Decompressor().process
+        elif encoding == 'zstd':
+            zstandard = import_optional('zstandard')
+            if zstandard is None:
+                raise ValueError('Zstandard is not installed')
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+            self.decompress = decompressor.decompress
+            self.flush = decompressor.flush
+        else:
+            raise ValueError(f'Unsupported encoding "{encoding}"')
+
+    @staticmethod
+    def supported() -> list[str]:
+        """ Method to get the supported encodings, in order of
+            preference
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            list[str]
+                The names of the encodings
+        """
+        encodings = list()
+        if import_optional('zstandard'):
+            encodings.append('zstd')
+        if import_optional('brotli', 'brotlicffi'):
+            encodings.append('br')
+        encodings.extend(('gzip', 'deflate'))
+        return encodings
+
+
+def import_optional(*names: str) -> Any:
+    """ Function to import the first installed module of the given
+        names
+
+        Parameters
+        ----------
+        *names : str
+            The names of the modules
+
+        Returns
+        -------
+        module
+            The imported module
+
+        None
+            None of the modules is installed
+    """
+    for name in names:
+        try:
+            return __import__(name)
+        except ImportError:
+            continue
+    return None
+
+
+def accept_encoding() -> str:
+    """ Function to get the value for the `Accept-Encoding` header
+        with the supported encodings """
+    return ', '.join(UnipyDecompressor.supported())
+
+
+class UnipyTransport:
+    """ Class for the default transport; sends the requests with
+        the session of the connection. The body is read in chunks
+        and decompressed while it is read, so the size on the wire
+        can be measured and large bodies can be stopped early. """
+
+    def __init__(self, max_body_size: Optional[int] = None) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            max_body_size : Optional[int]
+                The maximum size of a decompressed body in bytes. If
+                not given, the size is not limited.
+
+            Returns
+            -------
+            None
+        """
+        self.max_body_size = max_body_size
+
+    def send(self,
+             session: Session,
+             request: PreparedRequest,
+             timeout: Optional[float] = None) -> Response:
+        """ Method to send a request. The size of the body on the
+            wire is set in the `wire_bytes` attribute of the
+            response.
+
+            Parameters
+            ----------
+            session : Session
+                The session of the connection
+
+            request : PreparedRequest
+                The request to send
+
+            timeout : Optional[float]
+                The seconds to wait for the server
+
+            Returns
+            -------
+            Response
+                The response from the server
+
+            Raises
+            ------
+            ResponseTooLargeError
+                The body is larger than `max_body_size`
+        """
+        response = session.send(request, timeout=timeout, stream=True)
+        try:
+            self.read_body(response)
+        except BaseException:
+            response.close()
+            raise
+        return response
+
+    def read_body(self, response: Response) -> None:
+        """ Method to read and decompress the body of a streamed
+            response
+
+            Parameters
+            ----------
+            response : Response
+                The response to read
+
+            Returns
+            -------
+            None
+        """
+        encoding = response.headers.get('Content-Encoding', '').strip().lower()
+        try:
+            decompressor = UnipyDecompressor(encoding) if encoding else None
+        except ValueError:
+            # Not a encoding we asked for; let urllib3 handle it
+            decompressor = None
+        decode_content = bool(encoding) and decompressor is None
+
+        chunks = list()
+        wire_bytes = 0
+        size = 0
+        try:
+            for chunk in response.raw.stream(CHUNK_SIZE, decode_content=decode_content):
+                wire_bytes += len(chunk)
+                if decompressor:
+                    chunk = decompressor.decompress(chunk)
+                size += len(chunk)
+                if self.max_body_size is not None and size > self.max_body_size:
+                    raise ResponseTooLargeError(
+                        f'Body of {response.url} is larger than {self.max_body_size} bytes')
+                chunks.append(chunk)
+            if decompressor:
+                chunks.append(decompressor.flush())
+        except ReadTimeoutError as error:
+            raise ReadTimeout(error, response=response)
+        except (DecodeError, ProtocolError, SSLError, zlib.error) as error:
+            raise ConnectionError(error, response=response)
+
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        response.wire_bytes = wire_bytes
+        response.raw.release_conn()
+
+
+def request_key(method: str, url: str, body: Any) -> str:
+    """ Function to create the key that identifies a request in a
+        archive. The server is not part of the key, so a archive
+        can be replayed for any server name.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method
+
+        url : str
+            The URL of the request
+
+        body : Any
+            The body of the request
+
+        Returns
+        -------
+        str
+            The key
+    """
+    parts = urlsplit(url)
+    endpoint = parts.path.lstrip('/')
+    if parts.query:
+        endpoint += f'?{parts.query}'
+    if body is None or endpoint in CREDENTIAL_ENDPOINTS:
+        body = b''
+    if isinstance(body, str):
+        body = body.encode()
+    return f'{method} {endpoint} {body.decode(errors="replace")}'.rstrip()
+
+
+class UnipyRecordingTransport(UnipyTransport):
+    """ Class for a transport that sends the requests to the server
+        and records the requests and responses in a archive.
+
+        The archive is a file with a gzip member per entry; every
+        member has one JSON line. The archive can be read with
+        `zcat` as NDJSON. Next to the archive, a index with the
+        offset of every entry is written, so entries can be read
+        without decompressing the whole archive. Credentials and
+        session secrets are not recorded. """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 transport: Optional[UnipyTransport] = None,
+                 max_body_size: Optional[int] = None) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            path : Union[str, Path]
+                The file for the archive. Entries are appended when
+                the file exists.
+
+            transport : Optional[UnipyTransport]
+                The transport to send the requests with
+
+            max_body_size : Optional[int]
+                The maximum size of a decompressed body in bytes,
+                for the default transport. If not given, the size
+                is not limited.
+
+            Returns
+            -------
+            None
+        """
+        self.path = Path(path)
+        self.index_path = index_path(self.path)
+        self.transport = transport or UnipyTransport(max_body_size)
+        self.lock = Lock()
+        self.entries = 0
+
+    @property
+    def max_body_size(self) -> Optional[int]:
+        """ The maximum size of a body of the transport that sends
+            the requests """
+        return self.transport.max_body_size
+
+    @max_body_size.setter
+    def max_body_size(self, max_body_size: Optional[int]) -> None:
+        self.transport.max_body_size = max_body_size
+
+    def send(self,
+             session: Session,
+             request: PreparedRequest,
+             timeout: Optional[float] = None) -> Response:
+        """ Method to send a request and record it
+
+            Parameters
+            ----------
+            session : Session
+                The session of the connection
+
+            request : PreparedRequest
+                The request to send
+
+            timeout : Optional[float]
+                The seconds to wait for the server
+
+            Returns
+            -------
+            Response
+                The response from the server
+        """
+        response = self.transport.send(session, request, timeout)
+        self.record(request, response)
+        return response
+
+    def record(self, request: PreparedRequest, response: Response) -> None:
+        """ Method to add a request and its response to the archive
+
+            Parameters
+            ----------
+            request : PreparedRequest
+                The request
+
+            response : Response
+                The response for the request
+
+            Returns
+            -------
+            None
+        """
+        key = request_key(request.method, request.url, request.body)
+        headers = dict()
+        for name, value in response.headers.items():
+            if name.lower() in MASKED_HEADERS:
+                headers[name] = 'recorded'
+            elif name.lower() not in SKIPPED_HEADERS:
+                headers[name] = value
+
+        entry = {
+            'key': key,
+            'status': response.status_code,
+            'headers': headers,
+            'elapsed': response.elapsed.total_seconds(),
+            'content': response.content.decode('utf-8', errors='surrogateescape')
+        }
+        member = gzip.compress(
+            json.dumps(entry).encode('utf-8', errors='surrogateescape') + b'\n')
+
+        with self.lock:
+            with open(self.path, 'ab') as archive:
+                offset = archive.tell()
+                archive.write(member)
+            with open(self.index_path, 'a') as index:
+                index.write(json.dumps(
+                    {'key': key, 'offset': offset, 'length': len(member)}) + '\n')
+            self.entries += 1
+
+
+def index_path(path: Path) -> Path:
+    """ Function to get the path of the index for a archive """
+    return path.with_name(path.name + '.idx')
+
+
+def scan_archive(path: Path) -> Iterator[tuple[int, int, dict]]:
+    """ Function to read all entries of a archive, without using
+        the index
+
+        Parameters
+        ----------
+        path : Path
+            The archive to read
+
+        Returns
+        -------
+        Iterator[tuple[int, int, dict]]
+            The offset, length and the entry
+    """
+    data = path.read_bytes()
+    offset = 0
+    while offset < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        line = decompressor.decompress(data[offset:])
+        length = len(data) - offset - len(decompressor.unused_data)
+        yield offset, length, json.loads(line.decode('utf-8', errors='surrogateescape'))
+        offset += length
+
+
+class UnipyReplayTransport(UnipyTransport):
+    """ Class for a transport that answers the requests from a
+        archive created with `UnipyRecordingTransport`. No server
+        is needed. When a request was recorded multiple times, the
+        recorded responses are returned in order, and the last
+        one is repeated. """
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 latency: float = 0.0,
+                 latency_scale: float = 0.0) -> None:
+        """ Sets the default values
+
+            Parameters
+            ----------
+            path : Union[str, Path]
+                The archive to replay
+
+            latency : float = 0.0
+                Seconds to wait before every response
+
+            latency_scale : float = 0.0
+                Factor for the recorded duration of the requests
+                to wait before every response. Use 1.0 to replay
+                with the recorded latency.
+
+            Returns
+            -------
+            None
+        """
+        self.logger = getLogger('UnipyReplayTransport')
+        self.path = Path(path)
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.lock = Lock()
+
+        # The offsets and lengths of the entries per request key,
+        # and the number of times each key was replayed
+        self.offsets: dict[str, list[tuple[int, int]]] = dict()
+        self.replayed: dict[str, int] = dict()
+        self.load_index()
+
+    def load_index(self) -> None:
+        """ Method to load the index of the archive. When the index
+            is missing, it is created from the archive.
+
+            Parameters
+            ----------
+            None
+
+            Returns
+            -------
+            None
+        """
+        self.offsets.clear()
+        path = index_path(self.path)
+        if path.exists():
+            with open(path) as index:
+                for line in index:
+                    item = json.loads(line)
+                    self.offsets.setdefault(item['key'], list()).append(
+                        (item['offset'], item['length']))
+        else:
+            for offset, length, entry in scan_archive(self.path):
+                self.offsets.setdefault(entry['key'], list()).append(
+                    (offset, length))
+
+    def read_entry(self, offset: int, length: int) -> dict:
+        """ Method to read one entry from the archive
+
+            Parameters
+            ----------
+            offset : int
+                The offset of the entry
+
+            length : int
+                The compressed length of the entry
+
+            Returns
+            -------
+            dict
+                The entry
+        """
+        with open(self.path, 'rb') as archive:
+            archive.seek(offset)
+            member = archive.read(length)
+        return json.loads(
+            gzip.decompress(member).decode('utf-8', errors='surrogateescape'))
+
+    def send(self,
+             session: Session,
+             request: PreparedRequest,
+             timeout: Optional[float] = None) -> Response:
+        """ Method to answer a request from the archive
+
+            Parameters
+            ----------
+            session : Session
+                The session of the connection; not used
+
+            request : PreparedRequest
+                The request to answer
+
+            timeout : Optional[float]
+                Not used
+
+            Returns
+            -------
+            Response
+                The recorded response. When the request was not
+                recorded, a response with status 404 is returned.
+        """
+        key = request_key(request.method, request.url, request.body)
+        with self.lock:
+            offsets = self.offsets.get(key)
+            position = self.replayed.get(key, 0)
+            self.replayed[key] = position + 1
+
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.encoding = 'utf-8'
+
+        if not offsets:
+            self.logger.warning(f'No recorded response for "{key}"')
+            response.status_code = 404
+            response.headers = CaseInsensitiveDict()
+            response._content = b'{"meta": {"rc": "error"}, "data": []}'
+            response.elapsed = timedelta(0)
+            return response
+
+        entry = self.read_entry(*offsets[min(position, len(offsets) - 1)])
+        delay = self.latency + self.latency_scale * entry['elapsed']
+        if delay:
+            sleep(delay)
+
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['content'].encode('utf-8', errors='surrogateescape')
+        response.elapsed = timedelta(seconds=entry['elapsed'])
+        response.wire_bytes = len(response._content)
+        return response
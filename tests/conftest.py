@@ -0,0 +1,7 @@
+""" Configuration for the tests; makes the `unipy` package in `src`
+    importable without installing it """
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
@@ -0,0 +1,41 @@
+""" Tests for the session reconstruction of NetworkClientSessions """
+
+from unipy.networkclient import NetworkActiveClient, NetworkInactiveClient
+from unipy.networksessions import NetworkClientSessions
+
+MAC = 'aa:bb:cc:dd:ee:01'
+ACCESS_POINT = 'aa:bb:cc:00:00:01'
+
+
+def active(uptime: int) -> NetworkActiveClient:
+    return NetworkActiveClient({'mac': MAC, 'ap_mac': ACCESS_POINT, 'uptime': uptime})
+
+
+def history(first_seen: int, last_seen: int) -> NetworkInactiveClient:
+    return NetworkInactiveClient({'mac': MAC, 'first_seen': first_seen, 'last_seen': last_seen})
+
+
+def test_history_keeps_session_of_connected_client() -> None:
+    sessions = NetworkClientSessions()
+    sessions.observe([active(100)], timestamp=1000000)
+
+    # The history lists the client that is still connected
+    sessions.observe_history([history(999900, 1000060)], timestamp=1000060)
+    sessions.observe([active(220)], timestamp=1000120)
+
+    assert sessions.sessions(MAC) == [(999900, None)]
+    counts = sessions.event_counts(0, 2000000)
+    assert sum(bucket['connects'] for bucket in counts.values()) == 1
+    assert sum(bucket['disconnects'] for bucket in counts.values()) == 0
+
+
+def test_history_closes_session_seen_before_last_poll() -> None:
+    sessions = NetworkClientSessions()
+    sessions.observe([active(100)], timestamp=1000000)
+    sessions.observe([active(160)], timestamp=1000060)
+
+    # The controller saw the client last before the second poll,
+    # which listed it because the active list lags behind
+    sessions.observe_history([history(999900, 1000030)], timestamp=1000090)
+
+    assert sessions.sessions(MAC) == [(999900, 1000030)]
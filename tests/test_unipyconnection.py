@@ -0,0 +1,135 @@
+""" Tests for the circuit breaker and the login handling of
+    UnipyConnection """
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Barrier
+from typing import Any
+
+import pytest
+from requests.exceptions import SSLError, Timeout
+from unipy.exceptions import PermissionDeniedError, RequestTimeoutError, ServerUnreachableError
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+from unipy.unipytransport import UnipyTransport
+
+servers = count()
+
+
+class FailingTransport(UnipyTransport):
+    """ Transport that raises the given errors, one per request """
+
+    def __init__(self, *errors: BaseException) -> None:
+        super().__init__()
+        self.errors = list(errors)
+
+    def send(self, session: Any, request: Any, timeout: Any) -> Any:
+        raise self.errors.pop(0)
+
+
+def connection(*errors: BaseException) -> UnipyConnection:
+    """ Function to create a connection with its own circuit
+        breaker, that opens after one failure """
+    return UnipyConnection(
+        f'breaker-{next(servers)}', 'admin', 'password',
+        failure_threshold=1, cooldown=0.0,
+        transport=FailingTransport(*errors))
+
+
+def test_unexpected_error_in_half_open_trial_releases_trial() -> None:
+    unipy_connection = connection(Timeout(), RuntimeError('transport bug'))
+
+    # Opens the circuit; the cooldown is over at once
+    with pytest.raises(RequestTimeoutError):
+        unipy_connection.send('GET', 'proxy/network/api/self/sites')
+
+    # The trial request fails with a error that is not a failure of
+    # the server
+    with pytest.raises(RuntimeError):
+        unipy_connection.send('GET', 'proxy/network/api/self/sites')
+
+    assert unipy_connection.circuit_breaker.allow()
+
+
+def test_certificate_error_does_not_open_circuit() -> None:
+    unipy_connection = connection(SSLError('certificate verify failed'))
+
+    with pytest.raises(ServerUnreachableError):
+        unipy_connection.send('GET', 'proxy/network/api/self/sites')
+
+    assert unipy_connection.circuit_breaker.state == unipy_connection.circuit_breaker.CLOSED
+
+
+def threaded_requests(unipy_connection: UnipyConnection,
+                      device_mac: str,
+                      threads: int = 64,
+                      requests: int = 10) -> list[int]:
+    """ Function to execute GET and POST requests with one
+        connection from many threads at the same time """
+    barrier = Barrier(threads)
+
+    def worker() -> list[int]:
+        barrier.wait()
+        unipy_connection.ensure_logged_in()
+        statuses = list()
+        for index in range(requests):
+            if index % 2:
+                response = unipy_connection.request(
+                    method='POST',
+                    endpoint='proxy/network/api/s/default/stat/device',
+                    data={'macs': [device_mac]})
+            else:
+                response = unipy_connection.request(
+                    method='GET',
+                    endpoint='proxy/network/api/s/default/stat/device')
+            statuses.append(response.status_code)
+        return statuses
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(worker) for _ in range(threads)]
+        return [status for future in futures for status in future.result()]
+
+
+def test_threads_share_one_login() -> None:
+    with UnipyStandInServer(UnipyStandInConfig(latency=0.01)) as standin:
+        unipy_connection = UnipyConnection(standin.server, 'admin', 'password', verify=False)
+        device_mac = standin.dataset.devices[0]['mac']
+
+        statuses = threaded_requests(unipy_connection, device_mac)
+        assert standin.stats.logins == 1
+
+        # Every thread gets a 401 after this; only one of them
+        # logs in again
+        standin.expire_sessions()
+        statuses += threaded_requests(unipy_connection, device_mac)
+
+    assert standin.stats.logins == 2
+    assert statuses == [200] * len(statuses)
+
+
+def test_failed_login_raises() -> None:
+    with UnipyStandInServer(UnipyStandInConfig()) as standin:
+        unipy_connection = UnipyConnection(standin.server, 'admin', 'wrong', verify=False)
+        generation = unipy_connection.auth_generation
+
+        with pytest.raises(PermissionDeniedError):
+            unipy_connection.login()
+
+    assert not unipy_connection.logged_in
+    assert unipy_connection.csrf_token is None
+    assert unipy_connection.auth_generation == generation + 1
+
+
+def test_connections_with_other_limits_get_their_own() -> None:
+    strict = UnipyConnection('limits', 'admin', 'password', failure_threshold=1, rate_limit=1.0)
+    lenient = UnipyConnection('limits', 'admin', 'password', failure_threshold=10, rate_limit=100.0)
+    shared = UnipyConnection('limits', 'admin', 'password', failure_threshold=1, rate_limit=1.0)
+
+    assert lenient.circuit_breaker.threshold == 10
+    assert lenient.rate_limiter.rate == 100.0
+    assert strict.circuit_breaker.threshold == 1
+    assert strict.rate_limiter.rate == 1.0
+
+    assert shared.circuit_breaker is strict.circuit_breaker
+    assert shared.rate_limiter is strict.rate_limiter
+    assert lenient.circuit_breaker is not strict.circuit_breaker
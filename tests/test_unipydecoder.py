@@ -0,0 +1,19 @@
+""" Tests for the selection of JSON decoders """
+
+import pytest
+from unipy.unipydecoder import UnipyDecoder, get_decoder
+
+
+def test_unknown_decoder_lists_the_available_decoders() -> None:
+    with pytest.raises(ValueError, match='orjson, msgspec, ujson, json'):
+        get_decoder('simdjson')
+
+
+def test_decoder_object_is_used_as_is() -> None:
+    decoder = UnipyDecoder()
+    assert get_decoder(decoder) is decoder
+
+
+def test_default_decoder_decodes() -> None:
+    assert get_decoder().decode(b'{"data": [1]}') == {'data': [1]}
+    assert get_decoder('json').decode(b'[true]') == [True]
@@ -0,0 +1,92 @@
+""" Tests for the event stream and the inventory, against the
+    websocket of the stand-in """
+
+from time import monotonic, sleep
+from typing import Any, Callable, Iterator
+
+import pytest
+from unipy.unipy import Unipy
+from unipy.unipyevents import NetworkInventory, UnipyEventStream
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+
+
+@pytest.fixture
+def standin() -> Iterator[UnipyStandInServer]:
+    with UnipyStandInServer(UnipyStandInConfig(active_clients=5, inactive_clients=0)) as server:
+        yield server
+
+
+@pytest.fixture
+def unipy(standin: UnipyStandInServer) -> Unipy:
+    return Unipy(standin.server, 'admin', 'password', verify=False)
+
+
+def wait_for(condition: Callable[[], Any], timeout: float = 10.0) -> None:
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline, 'Timed out'
+        sleep(0.01)
+
+
+class RejectedError(Exception):
+    status_code = 401
+
+
+class RejectedStream(UnipyEventStream):
+    """ Stream of which the websocket is rejected once, like when
+        the session expired """
+
+    def connect(self) -> Any:
+        # Stop at the second attempt
+        if self.reconnects:
+            self.stopped.set()
+        raise RejectedError('Handshake status 401 Unauthorized')
+
+
+def test_new_objects_from_events_are_bound(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    inventory = NetworkInventory()
+    inventory.load(unipy.network)
+
+    inventory.apply('sta:sync', {'mac': 'aa:bb:cc:dd:ee:ff', 'hostname': 'new'})
+    inventory.apply('device:sync', {'mac': 'aa:bb:cc:dd:ee:00', 'type': 'usw'})
+
+    assert inventory.clients['aa:bb:cc:dd:ee:ff'].binding is unipy.network
+    assert inventory.devices['aa:bb:cc:dd:ee:00'].binding is unipy.network
+
+
+def test_rejected_websocket_logs_in_again(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    unipy.connection.ensure_logged_in()
+    generation = unipy.connection.auth_generation
+    logins = standin.stats.logins
+
+    RejectedStream(unipy.connection, min_backoff=0.0).run()
+
+    assert standin.stats.logins == logins + 1
+    assert unipy.connection.auth_generation > generation
+    assert unipy.connection.logged_in
+
+
+def test_events_update_the_inventory(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    pytest.importorskip('websocket')
+    inventory = NetworkInventory()
+    inventory.load(unipy.network)
+    stream = UnipyEventStream(unipy.connection, min_backoff=0.01, max_backoff=0.01)
+    stream.start()
+    try:
+        wait_for(lambda: standin.websockets)
+        standin.publish('sta:sync', [{'mac': 'aa:bb:cc:dd:ee:ff', 'hostname': 'new'}])
+        wait_for(lambda: inventory.drain(stream))
+        assert inventory.clients['aa:bb:cc:dd:ee:ff'].hostname == 'new'
+
+        # The stream reconnects when the console closes the websocket
+        standin.close_websockets()
+        wait_for(lambda: standin.stats.websockets == 2)
+
+        # And logs in again when the session expired
+        logins = standin.stats.logins
+        standin.expire_sessions()
+        standin.close_websockets()
+        wait_for(lambda: standin.stats.websockets == 3)
+        assert standin.stats.logins == logins + 1
+    finally:
+        stream.stop(timeout=5)
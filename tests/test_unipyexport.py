@@ -0,0 +1,37 @@
+""" Tests for the exports of UnipyObjects and raw API data """
+
+import io
+import json
+
+from unipy.networkdevice import NetworkDevice
+from unipy.unipyexport import export_ndjson, iter_rows
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInDataset
+
+RAW_DEVICES = [
+    {'mac': 'aa:bb:cc:00:00:01', 'adopted': 'false', 'uptime': '123', 'upgradable': 'TRUE'},
+    {'mac': 'aa:bb:cc:00:00:02', 'adopted': None, 'uptime': 'unknown'},
+    {'mac': 'aa:bb:cc:00:00:03'},
+]
+
+
+def test_raw_rows_are_converted_like_objects() -> None:
+    items = RAW_DEVICES + UnipyStandInDataset(UnipyStandInConfig()).devices
+    objects = NetworkDevice.from_api_list(items)
+
+    assert list(iter_rows(items, NetworkDevice)) == list(iter_rows(objects, NetworkDevice))
+
+
+def test_raw_rows_use_the_first_field_for_a_api_field() -> None:
+    fields = ('adopted', 'uptime', 'connect_request_ip', 'upgradable')
+    row = next(iter_rows(RAW_DEVICES, NetworkDevice, fields))
+
+    assert row == (False, 123, None, True)
+
+
+def test_ndjson_is_the_same_for_raw_data_and_objects() -> None:
+    raw, objects = io.BytesIO(), io.BytesIO()
+    export_ndjson(RAW_DEVICES, raw, NetworkDevice)
+    export_ndjson(NetworkDevice.from_api_list(RAW_DEVICES), objects, NetworkDevice)
+
+    assert raw.getvalue() == objects.getvalue()
+    assert json.loads(raw.getvalue().splitlines()[0])['adopted'] is False
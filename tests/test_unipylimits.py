@@ -0,0 +1,94 @@
+""" Tests for the rate limiter and the circuit breaker """
+
+from time import monotonic, sleep
+
+import pytest
+from unipy.exceptions import CircuitOpenError, RateLimitedError, ServerError
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipylimits import UnipyCircuitBreaker, UnipyTokenBucket
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+
+
+def test_bucket_allows_the_burst_and_then_the_rate() -> None:
+    bucket = UnipyTokenBucket(rate=10.0, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_bucket_gives_back_the_token_after_a_timeout() -> None:
+    bucket = UnipyTokenBucket(rate=1.0, burst=1)
+    assert bucket.acquire(timeout=0)
+
+    # The next token is a second away
+    assert not bucket.acquire(timeout=0.1)
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_breaker_opens_after_the_threshold() -> None:
+    breaker = UnipyCircuitBreaker(threshold=2, cooldown=60.0)
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == pytest.approx(60.0, abs=1.0)
+
+
+def test_breaker_allows_one_trial_after_the_cooldown() -> None:
+    breaker = UnipyCircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    sleep(0.06)
+
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # A failed trial opens the circuit again, a successful one
+    # closes it
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_connection_stops_requests_to_a_failing_server() -> None:
+    with UnipyStandInServer(UnipyStandInConfig(error_rate=1.0)) as standin:
+        unipy_connection = UnipyConnection(
+            standin.server, 'admin', 'password', verify=False,
+            failure_threshold=2, cooldown=60.0)
+        unipy_connection.ensure_logged_in()
+
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                unipy_connection.send('GET', 'proxy/network/api/self/sites')
+        requests = standin.stats.requests
+
+        with pytest.raises(CircuitOpenError):
+            unipy_connection.send('GET', 'proxy/network/api/self/sites')
+        assert standin.stats.requests == requests
+
+
+def test_connection_waits_for_the_rate_limit() -> None:
+    with UnipyStandInServer(UnipyStandInConfig()) as standin:
+        unipy_connection = UnipyConnection(
+            standin.server, 'admin', 'password', verify=False,
+            rate_limit=20.0, burst=1)
+        unipy_connection.ensure_logged_in()
+
+        # Empty the bucket; the next token is 50 ms away, longer
+        # than the timeout
+        unipy_connection.rate_limiter.reserve()
+        unipy_connection.timeout = 0.01
+        with pytest.raises(RateLimitedError):
+            unipy_connection.send('GET', 'proxy/network/api/self/sites')
+
+        unipy_connection.timeout = 5.0
+        start = monotonic()
+        for _ in range(3):
+            unipy_connection.send('GET', 'proxy/network/api/self/sites')
+        assert monotonic() - start >= 0.1
@@ -0,0 +1,160 @@
+""" Tests for the caches of UnipyNetwork, against the stand-in """
+
+from typing import Iterator
+
+import pytest
+from unipy.exceptions import FrozenObjectError
+from unipy.networkdeviceconfig import NetworkDeviceConfigFirewall, NetworkDeviceSystemConfig
+from unipy.unipy import Unipy
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+
+
+@pytest.fixture(scope='module')
+def standin() -> Iterator[UnipyStandInServer]:
+    with UnipyStandInServer(UnipyStandInConfig(configured_rules=20)) as server:
+        yield server
+
+
+@pytest.fixture
+def unipy(standin: UnipyStandInServer) -> Unipy:
+    return Unipy(standin.server, 'admin', 'password', verify=False)
+
+
+def requests_for(standin: UnipyStandInServer, endpoint: str) -> int:
+    return standin.stats.paths.get(f'proxy/network/api/s/default/{endpoint}', 0)
+
+
+def test_system_cfg_is_cached_per_version(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    gateway = standin.dataset.devices[0]
+    endpoint = f'stat/device/{gateway["mac"]}'
+    before = requests_for(standin, endpoint)
+
+    first = unipy.network.get_device_system_cfg(gateway['mac'])
+    second = unipy.network.get_device_system_cfg(
+        gateway['mac'], first.cfg_version, first.known_cfgversion)
+
+    assert second is first
+    assert requests_for(standin, endpoint) == before + 1
+
+    # Another version is requested again
+    third = unipy.network.get_device_system_cfg(gateway['mac'], 'other', 'other')
+    assert requests_for(standin, endpoint) == before + 2
+    assert third is first
+
+
+def test_system_cfg_sections_are_parsed_on_first_use(standin: UnipyStandInServer, unipy: Unipy,
+                                                     monkeypatch: pytest.MonkeyPatch) -> None:
+    parsed = list()
+
+    class CountingFirewall(NetworkDeviceConfigFirewall):
+        def __init__(self, *args, **kwargs) -> None:
+            parsed.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setitem(NetworkDeviceSystemConfig.section_types, 'firewall', CountingFirewall)
+    gateway = standin.dataset.devices[0]
+
+    config = unipy.network.get_device_system_cfg(gateway['mac'])
+    assert parsed == []
+    assert 'firewall' in config and 'interfaces' in config.keys()
+    assert parsed == []
+
+    firewall = config.firewall
+    assert config['firewall'] is firewall
+    assert unipy.network.get_device_system_cfg(
+        gateway['mac'], config.cfg_version, config.known_cfgversion).firewall is firewall
+    assert parsed == [firewall]
+
+    # Sections without a class are the raw data
+    assert config['system'] is config.raw['system']
+
+
+def test_system_cfg_sections_are_parsed_once_and_frozen(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    gateway = standin.dataset.devices[0]
+    config = unipy.network.get_device_system_cfg(gateway['mac'])
+
+    assert config.frozen
+    assert config.firewall is config.firewall
+    assert config.firewall.frozen
+    with pytest.raises(FrozenObjectError):
+        config.firewall.all_ping = 'disable'
+    with pytest.raises(FrozenObjectError):
+        config.raw = {}
+
+
+def test_system_cfg_copy_can_be_changed(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    gateway = standin.dataset.devices[0]
+    config = unipy.network.get_device_system_cfg(gateway['mac'])
+    copied = config.copy()
+
+    copied.firewall.all_ping = 'disable'
+    copied.raw['firewall']['name'].clear()
+
+    assert not copied.frozen
+    assert config.firewall.all_ping == 'enable'
+    assert config.raw['firewall']['name']
+
+
+def test_firewall_rules_are_shared_until_the_router_changes(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    before = requests_for(standin, 'rest/firewallrule')
+    first = unipy.network.get_firewall_rules()
+    second = unipy.network.get_firewall_rules()
+
+    assert second is first
+    assert requests_for(standin, 'rest/firewallrule') == before + 1
+
+    standin.dataset.devices[0]['cfgversion'] = 'changed'
+    try:
+        third = unipy.network.get_firewall_rules()
+    finally:
+        standin.dataset.devices[0]['cfgversion'] = standin.dataset.cfgversion
+    assert third is not first
+    assert requests_for(standin, 'rest/firewallrule') == before + 2
+
+
+def test_firewall_rules_are_frozen(unipy: Unipy) -> None:
+    chains = unipy.network.get_firewall_rules()
+    chain = chains['WAN_IN']
+    rule = chain.rules[0]
+
+    assert isinstance(chain.rules, tuple)
+    with pytest.raises(FrozenObjectError):
+        chains.remove_rule('WAN_IN', rule.chain_index, predefined=rule.is_predefined)
+    with pytest.raises(FrozenObjectError):
+        chains['WAN_IN'] = chain
+    with pytest.raises(FrozenObjectError):
+        rule.name = 'changed'
+    with pytest.raises(FrozenObjectError):
+        chain.rules = None
+
+
+def test_firewall_rules_copy_can_be_changed(unipy: Unipy) -> None:
+    chains = unipy.network.get_firewall_rules()
+    copied = chains.copy()
+    rule = copied['WAN_IN'].rules[0]
+
+    assert copied.remove_rule('WAN_IN', rule.chain_index, predefined=rule.is_predefined) is rule
+    rule.name = 'changed'
+
+    assert not copied.frozen
+    assert len(copied['WAN_IN'].rules) == len(chains['WAN_IN'].rules) - 1
+    assert chains['WAN_IN'].rules[0].name != 'changed'
+
+
+def test_lookups_share_frozen_results(standin: UnipyStandInServer, unipy: Unipy) -> None:
+    device_mac = standin.dataset.devices[1]['mac']
+    client_mac = standin.dataset.active_clients[0]['mac']
+
+    device = unipy.network.get_device(device_mac)
+    client = unipy.network.get_client(client_mac)
+
+    # Within the lookup window, the same objects are returned
+    assert unipy.network.get_device(device_mac) is device
+    assert unipy.network.get_client(client_mac) is client
+    assert device.frozen and client.frozen
+    with pytest.raises(FrozenObjectError):
+        device.name = 'changed'
+
+    copied = client.copy()
+    copied.hostname = 'changed'
+    assert client.hostname != 'changed'
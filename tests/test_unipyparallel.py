@@ -0,0 +1,50 @@
+""" Tests for the conversion of large responses in worker
+    processes """
+
+import json
+from typing import Any
+
+from unipy.networkclient import NetworkInactiveClient
+from unipy.unipydecoder import UnipyDecoder
+from unipy.unipyparallel import decode_parallel
+
+ITEMS = [{'id': f'{index:024x}', 'mac': f'aa:bb:cc:dd:{index // 256:02x}:{index % 256:02x}',
+          'hostname': f'host-{index}', 'blocked': index % 7 == 0, 'first_seen': index,
+          'type': 'WIRELESS'} for index in range(1000)]
+CONTENT = json.dumps({'data': ITEMS}).encode()
+
+
+class CountingDecoder(UnipyDecoder):
+    """ Custom decoder with a name that is not a known decoder """
+
+    name = 'counting'
+
+    def decode(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+def values(objects: list) -> list[dict]:
+    return [item.to_dict() for item in objects]
+
+
+def test_workers_give_the_same_objects() -> None:
+    serial = decode_parallel(CONTENT, NetworkInactiveClient, key='data', workers=1)
+    parallel = decode_parallel(CONTENT, NetworkInactiveClient, key='data', workers=2, min_size=0)
+
+    assert len(parallel) == len(ITEMS)
+    assert values(parallel) == values(serial)
+
+
+def test_workers_give_the_same_columns() -> None:
+    serial = decode_parallel(CONTENT, NetworkInactiveClient, key='data', workers=1, columnar=True)
+    parallel = decode_parallel(CONTENT, NetworkInactiveClient, key='data', workers=2,
+                               columnar=True, min_size=0)
+
+    assert parallel == serial
+
+
+def test_custom_decoder_object_is_used_by_workers() -> None:
+    parallel = decode_parallel(CONTENT, NetworkInactiveClient, key='data', workers=2,
+                               decoder=CountingDecoder(), min_size=0)
+
+    assert [client.hostname for client in parallel] == [item['hostname'] for item in ITEMS]
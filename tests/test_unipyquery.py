@@ -0,0 +1,48 @@
+""" Tests for filtering raw API data with UnipyQuery """
+
+from unipy.networkclient import NetworkClient
+from unipy.unipy import Unipy
+from unipy.unipyquery import UnipyQuery
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+
+CLIENTS = [
+    {'mac': 'aa:bb:cc:dd:ee:01', 'hostname': 'one', 'is_wired': 'true', 'first_seen': '100'},
+    {'mac': 'aa:bb:cc:dd:ee:02', 'hostname': 'two', 'is_wired': 'FALSE', 'first_seen': 200},
+    {'mac': 'aa:bb:cc:dd:ee:03', 'hostname': 'three', 'is_wired': False},
+]
+
+
+def hostnames(query: UnipyQuery) -> list[str]:
+    return [item['hostname'] for item in query.filter(CLIENTS, NetworkClient)]
+
+
+def test_bool_strings_match_bools() -> None:
+    assert hostnames(UnipyQuery(wired=True)) == ['one']
+    assert hostnames(UnipyQuery(wired=False)) == ['two', 'three']
+
+
+def test_values_are_converted_before_comparing() -> None:
+    assert hostnames(UnipyQuery().where('first_seen', '>=', 150)) == ['two']
+    assert hostnames(UnipyQuery().where('first_seen', '<', '150')) == ['one']
+
+
+def test_mac_addresses_are_compared_case_insensitive() -> None:
+    assert hostnames(UnipyQuery(mac_address='AA:BB:CC:DD:EE:02')) == ['two']
+    assert hostnames(UnipyQuery().where(
+        'mac_address', 'in', ['AA:BB:CC:DD:EE:01', 'aa:bb:cc:dd:ee:03'])) == ['one', 'three']
+    assert hostnames(UnipyQuery().where('mac_address', 'contains', 'EE:0')) == ['one', 'two', 'three']
+
+
+def test_missing_fields_use_the_default() -> None:
+    assert hostnames(UnipyQuery().where('first_seen', '==', None)) == ['three']
+
+
+def test_getter_finds_device_on_uppercase_mac() -> None:
+    with UnipyStandInServer(UnipyStandInConfig()) as standin:
+        unipy = Unipy(standin.server, 'admin', 'password', verify=False)
+        device_mac = standin.dataset.devices[2]['mac']
+
+        devices = unipy.network.get_devices(UnipyQuery(mac_address=device_mac.upper()))
+
+        assert [device.mac_address for device in devices] == [device_mac]
+        assert standin.stats.paths.get('proxy/network/api/s/default/stat/device', 0) == 0
@@ -0,0 +1,76 @@
+""" Tests for serializing UnipyObjects """
+
+import pytest
+from unipy.networkclient import NetworkInactiveClient
+from unipy.networkfirewall import NetworkFirewallChain, NetworkFirewallChains, NetworkFirewallRule
+from unipy.unipyserializer import dumps, loads
+
+BINDING = object()
+
+
+def chains() -> NetworkFirewallChains:
+    configured = [NetworkFirewallRule({'ruleset': 'WAN_IN', 'rule_index': 2000 + index,
+                                       'name': f'configured {index}', 'enabled': True})
+                  for index in range(3)]
+    return NetworkFirewallChains.merge({
+        'WAN_IN': {'default-action': 'drop', 'rule': {
+            '3000': {'description': 'predefined', 'action': 'accept'}}},
+        'LAN_IN': {'default-action': 'accept'}
+    }, configured)
+
+
+def round_trip(use_msgpack: bool) -> None:
+    original = chains()
+    original['WAN_IN'].description = 'updated'
+    loaded = loads(dumps(original.values(), use_msgpack=use_msgpack), BINDING)
+
+    assert len(loaded) == len(original)
+    for chain, loaded_chain in zip(original.values(), loaded):
+        assert type(loaded_chain) is NetworkFirewallChain
+        assert loaded_chain.binding is BINDING
+        assert loaded_chain.name == chain.name
+        assert loaded_chain.description == chain.description
+        if chain.rules is None:
+            assert loaded_chain.rules is None
+            continue
+        assert [rule.to_dict() for rule in loaded_chain.rules] == \
+            [rule.to_dict() for rule in chain.rules]
+        assert all(type(rule) is NetworkFirewallRule and rule.binding is BINDING
+                   for rule in loaded_chain.rules)
+
+
+def test_nested_objects_round_trip_with_marshal() -> None:
+    round_trip(use_msgpack=False)
+
+
+def test_nested_objects_round_trip_with_msgpack() -> None:
+    pytest.importorskip('msgpack')
+    round_trip(use_msgpack=True)
+
+
+def test_frozen_chains_round_trip() -> None:
+    loaded = loads(dumps(chains().freeze().values(), use_msgpack=False))
+
+    assert [rule.chain_index for rule in loaded[0].rules] == [2000, 2001, 2002, 3000]
+    assert not loaded[0].frozen
+
+
+def test_object_used_twice_is_stored_once() -> None:
+    rule = NetworkFirewallRule({'ruleset': 'WAN_IN', 'rule_index': 2000})
+    first, second = NetworkFirewallChain(), NetworkFirewallChain()
+    first.rules = [rule]
+    second.rules = [rule]
+
+    loaded = loads(dumps([first, second, rule], use_msgpack=False))
+
+    assert len(loaded) == 3
+    assert loaded[0].rules[0] is loaded[1].rules[0] is loaded[2]
+
+
+def test_plain_objects_round_trip() -> None:
+    client = NetworkInactiveClient({'mac': 'aa:bb:cc:dd:ee:ff', 'hostname': 'host',
+                                    'first_seen': 100, 'last_seen': 200})
+
+    loaded, = loads(dumps([client], use_msgpack=False))
+
+    assert loaded.to_dict() == client.to_dict()
@@ -0,0 +1,90 @@
+""" Tests for coalescing identical requests and batching lookups """
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+from time import sleep
+
+import pytest
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipysingleflight import UnipyBatcher, UnipySingleFlight
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+
+THREADS = 8
+
+
+def test_concurrent_gets_share_one_request() -> None:
+    endpoint = 'proxy/network/api/s/default/stat/device'
+    with UnipyStandInServer(UnipyStandInConfig(latency=0.2)) as standin:
+        unipy_connection = UnipyConnection(standin.server, 'admin', 'password', verify=False)
+        unipy_connection.ensure_logged_in()
+        barrier = Barrier(THREADS)
+
+        def get() -> object:
+            barrier.wait()
+            return unipy_connection.decode(unipy_connection.request('GET', endpoint))
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            bodies = list(executor.map(lambda _: get(), range(THREADS)))
+
+        assert standin.stats.paths[endpoint] == 1
+        assert unipy_connection.coalesced == THREADS - 1
+        assert all(body is bodies[0] for body in bodies)
+
+
+def test_posts_are_not_coalesced() -> None:
+    endpoint = 'proxy/network/api/s/default/stat/device'
+    with UnipyStandInServer(UnipyStandInConfig(latency=0.1)) as standin:
+        unipy_connection = UnipyConnection(standin.server, 'admin', 'password', verify=False)
+        unipy_connection.ensure_logged_in()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: unipy_connection.request('POST', endpoint, {'macs': []}),
+                              range(4)))
+
+        assert standin.stats.paths[endpoint] == 4
+
+
+def test_waiters_get_the_error_of_the_call() -> None:
+    flight = UnipySingleFlight()
+    started, release = Event(), Event()
+
+    def failing() -> None:
+        started.set()
+        release.wait()
+        raise RuntimeError('failed')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, 'key', failing)
+        started.wait()
+        waiter = executor.submit(flight.do, 'key', lambda: 'not called')
+        while flight.coalesced == 0:
+            sleep(0.001)
+        release.set()
+        for future in (leader, waiter):
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    # The error is not kept; the next call executes again
+    assert flight.do('key', lambda: 'again') == 'again'
+
+
+def test_results_are_kept_for_the_window() -> None:
+    flight = UnipySingleFlight(window=60.0)
+    assert flight.do('key', lambda: 'first') == 'first'
+    assert flight.do('key', lambda: 'second') == 'first'
+    assert flight.do('other', lambda: 'second') == 'second'
+
+
+def test_batcher_gets_different_keys_with_one_call() -> None:
+    calls = list()
+
+    def lookup(keys: list) -> dict:
+        calls.append(sorted(keys))
+        return {key: key * 2 for key in keys if key != 3}
+
+    batcher = UnipyBatcher(lookup, window=0.2)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        values = list(executor.map(batcher.get, [1, 2, 3, 4]))
+
+    assert values == [2, 4, None, 8]
+    assert calls == [[1, 2, 3, 4]]
@@ -0,0 +1,40 @@
+""" Tests for recording and replaying the traffic with a server """
+
+from pathlib import Path
+
+import pytest
+from unipy.exceptions import ResponseTooLargeError
+from unipy.unipyconnection import UnipyConnection
+from unipy.unipynetwork import UnipyNetwork
+from unipy.unipystandin import UnipyStandInConfig, UnipyStandInServer
+from unipy.unipytransport import UnipyRecordingTransport, UnipyReplayTransport
+
+
+def test_recording_uses_the_body_limit_of_the_connection(tmp_path: Path) -> None:
+    with UnipyStandInServer(UnipyStandInConfig()) as standin:
+        unipy_connection = UnipyConnection(
+            standin.server, 'admin', 'password', verify=False, max_body_size=1024,
+            transport=UnipyRecordingTransport(tmp_path / 'archive'))
+        unipy_connection.ensure_logged_in()
+
+        with pytest.raises(ResponseTooLargeError):
+            unipy_connection.request('GET', 'proxy/network/api/s/default/stat/device')
+
+
+def test_replay_gives_the_recorded_results(tmp_path: Path) -> None:
+    archive = tmp_path / 'archive'
+    with UnipyStandInServer(UnipyStandInConfig()) as standin:
+        recording = UnipyNetwork(UnipyConnection(
+            standin.server, 'admin', 'password', verify=False,
+            transport=UnipyRecordingTransport(archive)))
+        devices = recording.get_devices()
+        clients = recording.get_active_clients()
+
+    # The stand-in is stopped; the replay doesn't need a server
+    replay = UnipyNetwork(UnipyConnection(
+        'replay', 'admin', 'password', transport=UnipyReplayTransport(archive)))
+
+    assert [device.to_dict() for device in replay.get_devices()] == \
+        [device.to_dict() for device in devices]
+    assert [client.to_dict() for client in replay.get_active_clients()] == \
+        [client.to_dict() for client in clients]